@@ -30,6 +30,13 @@ target_metadata = Base.metadata
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
 
+# Migrate the database the app uses: DATABASE_URL (the environment, or the
+# .env that importing backend.app.database loads) wins over alembic.ini.
+# Both modes read sqlalchemy.url, so set it once here ("%" is configparser
+# interpolation and has to be doubled).
+DATABASE_URL = os.environ.get("DATABASE_URL") or config.get_main_option("sqlalchemy.url")
+config.set_main_option("sqlalchemy.url", DATABASE_URL.replace("%", "%%"))
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -43,7 +50,7 @@ def run_migrations_offline() -> None:
     script output.
 
     """
-    url = config.set_main_option("sqlalchemy.url", "sqlite:///./yb_task_management.db")
+    url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
         target_metadata=target_metadata,
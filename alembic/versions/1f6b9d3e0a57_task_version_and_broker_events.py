@@ -0,0 +1,39 @@
+"""Task version counter + broker_events relay table
+
+Revision ID: 1f6b9d3e0a57
+Revises: e7d25b1c8f43
+Create Date: 2026-10-19 13:58:42.671230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1f6b9d3e0a57'
+down_revision: Union[str, Sequence[str], None] = 'e7d25b1c8f43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+    op.create_table('broker_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('origin', sa.String(), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_broker_events_created_at'), 'broker_events', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_broker_events_created_at'), table_name='broker_events')
+    op.drop_table('broker_events')
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('version')
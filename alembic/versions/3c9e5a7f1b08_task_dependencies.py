@@ -0,0 +1,46 @@
+"""Task dependencies and reachability closure
+
+Revision ID: 3c9e5a7f1b08
+Revises: 6e1b8f2a9d47
+Create Date: 2026-10-19 22:48:19.774360
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e5a7f1b08'
+down_revision: Union[str, Sequence[str], None] = '6e1b8f2a9d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_dependencies',
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('depends_on_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['depends_on_id'], ['tasks.id'], ),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
+    sa.PrimaryKeyConstraint('task_id', 'depends_on_id')
+    )
+    op.create_index(op.f('ix_task_dependencies_depends_on_id'), 'task_dependencies', ['depends_on_id'], unique=False)
+    op.create_table('task_reachability',
+    sa.Column('ancestor_id', sa.Integer(), nullable=False),
+    sa.Column('descendant_id', sa.Integer(), nullable=False),
+    sa.Column('paths', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id')
+    )
+    op.create_index(op.f('ix_task_reachability_descendant_id'), 'task_reachability', ['descendant_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_task_reachability_descendant_id'), table_name='task_reachability')
+    op.drop_table('task_reachability')
+    op.drop_index(op.f('ix_task_dependencies_depends_on_id'), table_name='task_dependencies')
+    op.drop_table('task_dependencies')
@@ -0,0 +1,48 @@
+"""Change log for delta sync
+
+Revision ID: 4d8e6a2b91c3
+Revises: 1f6b9d3e0a57
+Create Date: 2026-10-19 15:07:33.284519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d8e6a2b91c3'
+down_revision: Union[str, Sequence[str], None] = '1f6b9d3e0a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('change_log',
+    sa.Column('version', sa.Integer(), nullable=False, autoincrement=True),
+    sa.Column('entity', sa.String(), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=True),
+    sa.Column('client_id', sa.Integer(), nullable=True),
+    sa.Column('op', sa.String(), nullable=False),
+    sa.Column('changed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('version'),
+    sqlite_autoincrement=True
+    )
+    op.create_index(op.f('ix_change_log_changed_at'), 'change_log', ['changed_at'], unique=False)
+    op.create_index('ix_change_log_entity', 'change_log', ['entity', 'entity_id', 'task_id'], unique=False)
+    op.create_table('sync_state',
+    sa.Column('key', sa.String(), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('sync_state')
+    op.drop_index('ix_change_log_entity', table_name='change_log')
+    op.drop_index(op.f('ix_change_log_changed_at'), table_name='change_log')
+    op.drop_table('change_log')
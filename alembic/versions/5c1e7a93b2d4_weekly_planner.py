@@ -0,0 +1,46 @@
+"""Weekly planner entries + task estimated hours
+
+Revision ID: 5c1e7a93b2d4
+Revises: 2484d704e56d
+Create Date: 2026-10-19 09:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e7a93b2d4'
+down_revision: Union[str, Sequence[str], None] = '2484d704e56d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('estimated_hours', sa.Float(), nullable=True))
+    op.create_table('planner_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('client_id', sa.Integer(), nullable=False),
+    sa.Column('weekday', sa.Integer(), nullable=False),
+    sa.Column('open_tasks', sa.Integer(), nullable=False),
+    sa.Column('hours_due', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'client_id', name='uix_planner_user_client')
+    )
+    op.create_index(op.f('ix_planner_entries_client_id'), 'planner_entries', ['client_id'], unique=False)
+    op.create_index('ix_planner_entries_user_weekday', 'planner_entries', ['user_id', 'weekday'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_planner_entries_user_weekday', table_name='planner_entries')
+    op.drop_index(op.f('ix_planner_entries_client_id'), table_name='planner_entries')
+    op.drop_table('planner_entries')
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('estimated_hours')
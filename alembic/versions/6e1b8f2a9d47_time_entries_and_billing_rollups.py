@@ -0,0 +1,60 @@
+"""Time entries and billing rollups
+
+Revision ID: 6e1b8f2a9d47
+Revises: d2f7a1c5b364
+Create Date: 2026-10-19 22:03:51.208716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e1b8f2a9d47'
+down_revision: Union[str, Sequence[str], None] = 'd2f7a1c5b364'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('time_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('client_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('work_date', sa.Date(), nullable=False),
+    sa.Column('minutes', sa.Integer(), nullable=False),
+    sa.Column('billable', sa.Boolean(), nullable=False),
+    sa.Column('note', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_time_entries_task_id'), 'time_entries', ['task_id'], unique=False)
+    op.create_index('ix_time_entries_work_date_client', 'time_entries', ['work_date', 'client_id'], unique=False)
+    op.create_index('ix_time_entries_user_work_date', 'time_entries', ['user_id', 'work_date'], unique=False)
+    op.create_table('billing_rollups',
+    sa.Column('month', sa.String(), nullable=False),
+    sa.Column('client_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('minutes', sa.Integer(), nullable=False),
+    sa.Column('billable_minutes', sa.Integer(), nullable=False),
+    sa.Column('entries', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('month', 'client_id', 'user_id')
+    )
+    op.create_index('ix_billing_rollups_month_user', 'billing_rollups', ['month', 'user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_billing_rollups_month_user', table_name='billing_rollups')
+    op.drop_table('billing_rollups')
+    op.drop_index('ix_time_entries_user_work_date', table_name='time_entries')
+    op.drop_index('ix_time_entries_work_date_client', table_name='time_entries')
+    op.drop_index(op.f('ix_time_entries_task_id'), table_name='time_entries')
+    op.drop_table('time_entries')
@@ -0,0 +1,52 @@
+"""Saved views and their precomputed membership
+
+Revision ID: 7d4a2e9c1f63
+Revises: 3c9e5a7f1b08
+Create Date: 2026-10-20 09:12:41.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d4a2e9c1f63'
+down_revision: Union[str, Sequence[str], None] = '3c9e5a7f1b08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('saved_views',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('filters', sa.Text(), nullable=False),
+    sa.Column('client_id', sa.Integer(), nullable=True),
+    sa.Column('last_opened_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'name', name='uq_saved_views_user_name')
+    )
+    op.create_index(op.f('ix_saved_views_client_id'), 'saved_views', ['client_id'], unique=False)
+    op.create_table('saved_view_members',
+    sa.Column('view_id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('changed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['view_id'], ['saved_views.id'], ),
+    sa.PrimaryKeyConstraint('view_id', 'task_id')
+    )
+    op.create_index(op.f('ix_saved_view_members_task_id'), 'saved_view_members', ['task_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_saved_view_members_task_id'), table_name='saved_view_members')
+    op.drop_table('saved_view_members')
+    op.drop_index(op.f('ix_saved_views_client_id'), table_name='saved_views')
+    op.drop_table('saved_views')
@@ -0,0 +1,39 @@
+"""Task priority score for the inbox
+
+Revision ID: 9a4f02c6d7e1
+Revises: 5c1e7a93b2d4
+Create Date: 2026-10-19 10:03:55.118420
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4f02c6d7e1'
+down_revision: Union[str, Sequence[str], None] = '5c1e7a93b2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('priority_score', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_tasks_priority_score'), 'tasks', ['priority_score'], unique=False)
+    op.add_column('task_assignments', sa.Column('priority_score', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_task_assignments_task_id'), 'task_assignments', ['task_id'], unique=False)
+    op.create_index('ix_task_assignments_user_priority', 'task_assignments', ['user_id', 'priority_score'], unique=False)
+    # Existing rows are scored by `python tools/rebuild_derived.py priority`.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_assignments_user_priority', table_name='task_assignments')
+    op.drop_index(op.f('ix_task_assignments_task_id'), table_name='task_assignments')
+    op.drop_index(op.f('ix_tasks_priority_score'), table_name='tasks')
+    with op.batch_alter_table('task_assignments') as batch_op:
+        batch_op.drop_column('priority_score')
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('priority_score')
@@ -0,0 +1,73 @@
+"""Archive tables for completed tasks
+
+Revision ID: a6c3e9d4f218
+Revises: 8b2f4c7d1e95
+Create Date: 2026-10-19 20:05:47.318024
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c3e9d4f218'
+down_revision: Union[str, Sequence[str], None] = '8b2f4c7d1e95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('archived_tasks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('client_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description_z', sa.LargeBinary(), nullable=True),
+    sa.Column('subtasks_z', sa.LargeBinary(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('due_date', sa.DateTime(), nullable=True),
+    sa.Column('billable', sa.Boolean(), nullable=True),
+    sa.Column('estimated_hours', sa.Float(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_archived_tasks_client_id'), 'archived_tasks', ['client_id'], unique=False)
+    op.create_table('archived_task_assignments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('role', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['task_id'], ['archived_tasks.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_archived_task_assignments_task_id'), 'archived_task_assignments', ['task_id'], unique=False)
+    op.create_index(op.f('ix_archived_task_assignments_user_id'), 'archived_task_assignments', ['user_id'], unique=False)
+    op.create_table('archived_task_tags',
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('tag_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ),
+    sa.ForeignKeyConstraint(['task_id'], ['archived_tasks.id'], ),
+    sa.PrimaryKeyConstraint('task_id', 'tag_id')
+    )
+    # Candidate scan for the archival job, and child lookups by task
+    op.create_index(op.f('ix_tasks_completed_at'), 'tasks', ['completed_at'], unique=False)
+    op.create_index(op.f('ix_subtasks_task_id'), 'subtasks', ['task_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_subtasks_task_id'), table_name='subtasks')
+    op.drop_index(op.f('ix_tasks_completed_at'), table_name='tasks')
+    op.drop_table('archived_task_tags')
+    op.drop_index(op.f('ix_archived_task_assignments_user_id'), table_name='archived_task_assignments')
+    op.drop_index(op.f('ix_archived_task_assignments_task_id'), table_name='archived_task_assignments')
+    op.drop_table('archived_task_assignments')
+    op.drop_index(op.f('ix_archived_tasks_client_id'), table_name='archived_tasks')
+    op.drop_table('archived_tasks')
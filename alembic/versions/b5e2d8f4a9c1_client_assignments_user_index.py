@@ -0,0 +1,28 @@
+"""Index client assignments by user for the user directory
+
+Revision ID: b5e2d8f4a9c1
+Revises: 7d4a2e9c1f63
+Create Date: 2026-10-19 14:12:07.503318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e2d8f4a9c1'
+down_revision: Union[str, Sequence[str], None] = '7d4a2e9c1f63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_client_assignments_user_id'), 'client_assignments', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_client_assignments_user_id'), table_name='client_assignments')
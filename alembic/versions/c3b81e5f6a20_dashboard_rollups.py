@@ -0,0 +1,41 @@
+"""Dashboard rollups + task completed_at
+
+Revision ID: c3b81e5f6a20
+Revises: 9a4f02c6d7e1
+Create Date: 2026-10-19 11:20:07.553901
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3b81e5f6a20'
+down_revision: Union[str, Sequence[str], None] = '9a4f02c6d7e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('completed_at', sa.DateTime(), nullable=True))
+    # Best available guess for tasks completed before the column existed
+    op.execute("UPDATE tasks SET completed_at = updated_at WHERE status = 'completed'")
+    op.create_table('dashboard_rollups',
+    sa.Column('scope', sa.String(), nullable=False),
+    sa.Column('scope_id', sa.Integer(), nullable=False),
+    sa.Column('metric', sa.String(), nullable=False),
+    sa.Column('bucket', sa.String(), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('scope', 'scope_id', 'metric', 'bucket')
+    )
+    # Populate with `python tools/rebuild_derived.py rollups`.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('dashboard_rollups')
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.drop_column('completed_at')
@@ -0,0 +1,48 @@
+"""Daily digest deliveries and assignment timestamps
+
+Revision ID: c8a3f1e6b2d7
+Revises: b5e2d8f4a9c1
+Create Date: 2026-10-19 16:40:21.884105
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8a3f1e6b2d7'
+down_revision: Union[str, Sequence[str], None] = 'b5e2d8f4a9c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing assignments keep a NULL assigned_at: they are not "new"
+    op.add_column('task_assignments', sa.Column('assigned_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_task_assignments_assigned_at'), 'task_assignments', ['assigned_at'], unique=False)
+    op.create_table(
+        'digest_deliveries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('digest_date', sa.Date(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=False),
+        sa.Column('items', sa.Integer(), nullable=False),
+        sa.Column('sender', sa.String(), nullable=False),
+        sa.Column('message_id', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'digest_date', name='uq_digest_deliveries_user_date'),
+    )
+    op.create_index(op.f('ix_digest_deliveries_digest_date'), 'digest_deliveries', ['digest_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_digest_deliveries_digest_date'), table_name='digest_deliveries')
+    op.drop_table('digest_deliveries')
+    op.drop_index(op.f('ix_task_assignments_assigned_at'), table_name='task_assignments')
+    with op.batch_alter_table('task_assignments') as batch_op:
+        batch_op.drop_column('assigned_at')
@@ -0,0 +1,28 @@
+"""Index tasks by client for row-level visibility
+
+Revision ID: d9f4b2a7c6e3
+Revises: c8a3f1e6b2d7
+Create Date: 2026-10-19 18:05:44.230917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f4b2a7c6e3'
+down_revision: Union[str, Sequence[str], None] = 'c8a3f1e6b2d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_tasks_client_id'), 'tasks', ['client_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_tasks_client_id'), table_name='tasks')
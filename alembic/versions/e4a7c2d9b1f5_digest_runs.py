@@ -0,0 +1,41 @@
+"""Daily digest run markers and failed-delivery retries
+
+Revision ID: e4a7c2d9b1f5
+Revises: d9f4b2a7c6e3
+Create Date: 2026-10-19 21:12:37.406583
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c2d9b1f5'
+down_revision: Union[str, Sequence[str], None] = 'd9f4b2a7c6e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'digest_runs',
+        sa.Column('digest_date', sa.Date(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('digest_date'),
+    )
+    # Existing rows were all successful sends
+    with op.batch_alter_table('digest_deliveries') as batch_op:
+        batch_op.add_column(sa.Column('status', sa.String(), nullable=False, server_default='sent'))
+        batch_op.add_column(sa.Column('attempts', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('digest_deliveries') as batch_op:
+        batch_op.drop_column('attempts')
+        batch_op.drop_column('status')
+    op.drop_table('digest_runs')
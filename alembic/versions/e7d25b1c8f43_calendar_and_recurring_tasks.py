@@ -0,0 +1,53 @@
+"""Due-date index + recurring task definitions
+
+Revision ID: e7d25b1c8f43
+Revises: c3b81e5f6a20
+Create Date: 2026-10-19 12:41:19.002374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7d25b1c8f43'
+down_revision: Union[str, Sequence[str], None] = 'c3b81e5f6a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_tasks_due_date'), 'tasks', ['due_date'], unique=False)
+    op.create_table('recurring_tasks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('client_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('billable', sa.Boolean(), nullable=True),
+    sa.Column('estimated_hours', sa.Float(), nullable=True),
+    sa.Column('assigned_user_id', sa.Integer(), nullable=True),
+    sa.Column('frequency', sa.String(), nullable=False),
+    sa.Column('interval', sa.Integer(), nullable=False),
+    sa.Column('start_date', sa.DateTime(), nullable=False),
+    sa.Column('until', sa.DateTime(), nullable=True),
+    sa.Column('active', sa.Boolean(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['assigned_user_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_recurring_tasks_id'), 'recurring_tasks', ['id'], unique=False)
+    op.create_index(op.f('ix_recurring_tasks_assigned_user_id'), 'recurring_tasks', ['assigned_user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_recurring_tasks_assigned_user_id'), table_name='recurring_tasks')
+    op.drop_index(op.f('ix_recurring_tasks_id'), table_name='recurring_tasks')
+    op.drop_table('recurring_tasks')
+    op.drop_index(op.f('ix_tasks_due_date'), table_name='tasks')
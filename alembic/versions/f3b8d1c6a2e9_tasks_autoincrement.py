@@ -0,0 +1,51 @@
+"""Stop SQLite from reusing deleted task ids
+
+Revision ID: f3b8d1c6a2e9
+Revises: e4a7c2d9b1f5
+Create Date: 2026-10-19 09:41:05.218847
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d1c6a2e9'
+down_revision: Union[str, Sequence[str], None] = 'e4a7c2d9b1f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables that keep a task id after the task row is gone
+TASK_ID_REFERENCES = (
+    ('archived_tasks', 'id'),
+    ('time_entries', 'task_id'),
+    ('attachments', 'task_id'),
+    ('change_log', 'task_id'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return  # Postgres sequences never go backwards
+    with op.batch_alter_table('tasks', recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+        pass
+    # The copy only advanced sqlite_sequence to the highest surviving id;
+    # ids deleted above it may still be referenced elsewhere
+    high = max(
+        bind.execute(sa.text(f'SELECT COALESCE(MAX({column}), 0) FROM {table}')).scalar()
+        for table, column in (('tasks', 'id'),) + TASK_ID_REFERENCES
+    )
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'tasks'")
+    op.execute(sa.text("INSERT INTO sqlite_sequence (name, seq) VALUES ('tasks', :seq)").bindparams(seq=high))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table('tasks', recreate='always', table_kwargs={'sqlite_autoincrement': False}):
+        pass
@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from . import models, schemas
 from backend.app.schemas.users import UserCreate
 from sqlalchemy.exc import IntegrityError
+from backend.app.crud_utils import autocomplete, visibility, workload
 
 # Get a user by email
 def get_user_by_email(db: Session, email: str):
@@ -39,6 +40,9 @@ def create_user(db: Session, user, hashed_password: str):
             db_user.role_id = admin_role.id
             db.commit()
             db.refresh(db_user)
+    autocomplete.user_changed(db_user)
+    workload.user_changed(db_user)
+    visibility.invalidate([db_user.id])
     return db_user
 
 def update_user(db: Session, user_id: int, updates):
@@ -56,6 +60,9 @@ def update_user(db: Session, user_id: int, updates):
         db_user.role_id = updates.role_id
     db.commit()
     db.refresh(db_user)
+    autocomplete.user_changed(db_user)
+    workload.user_changed(db_user)
+    visibility.invalidate([db_user.id])
     return db_user
 
 def set_user_role(db: Session, user_id: int, role_id: int):
@@ -65,6 +72,7 @@ def set_user_role(db: Session, user_id: int, role_id: int):
     u.role_id = role_id
     db.commit()
     db.refresh(u)
+    visibility.invalidate([u.id])
     return u
 
 def deactivate_user(db: Session, user_id: int):
@@ -74,6 +82,9 @@ def deactivate_user(db: Session, user_id: int):
     u.is_active = False
     db.commit()
     db.refresh(u)
+    autocomplete.user_changed(u)
+    workload.user_changed(u)
+    visibility.invalidate([u.id])
     return u
 
 def activate_user(db: Session, user_id: int):
@@ -83,4 +94,7 @@ def activate_user(db: Session, user_id: int):
     u.is_active = True
     db.commit()
     db.refresh(u)
+    autocomplete.user_changed(u)
+    workload.user_changed(u)
+    visibility.invalidate([u.id])
     return u
\ No newline at end of file
@@ -1 +1 @@
-from . import tasks
\ No newline at end of file
+from . import tasks, planner, clients, priority, rollups, recurrence, calendar, changelog, task_rows, archive, billing, dependencies, views, autocomplete, roles, directory, workload, digest, visibility
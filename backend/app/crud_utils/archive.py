@@ -0,0 +1,380 @@
+import json
+import os
+import zlib
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from sqlalchemy import asc, desc
+from sqlalchemy.orm import Session
+
+from backend.app import models
+from backend.app.models import (
+    ArchivedTask, ArchivedTaskAssignment, ArchivedTaskTag,
+    Subtask, Tag, Task, TaskAssignment, TaskTag,
+)
+from backend.app.crud_utils import changelog, dependencies, task_rows, views, visibility
+from backend.app.utils import result_cache
+
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "180"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+
+
+# ---------------------------------------------------
+# COMPRESSION
+# ---------------------------------------------------
+
+def _pack_text(value: Optional[str]) -> Optional[bytes]:
+    if value is None:
+        return None
+    return zlib.compress(value.encode("utf-8"), 6)
+
+
+def _unpack_text(blob: Optional[bytes]) -> Optional[str]:
+    if blob is None:
+        return None
+    return zlib.decompress(blob).decode("utf-8")
+
+
+def _pack_json(value) -> Optional[bytes]:
+    if not value:
+        return None
+    return zlib.compress(json.dumps(value, default=datetime.isoformat, separators=(",", ":")).encode("utf-8"), 6)
+
+
+def _unpack_json(blob: Optional[bytes]) -> list:
+    if blob is None:
+        return []
+    return json.loads(zlib.decompress(blob))
+
+
+# ---------------------------------------------------
+# ARCHIVAL (moves completed tasks out of the hot tables)
+# ---------------------------------------------------
+# Each batch is its own transaction: copy the tasks and their children
+# into the archive tables, write change-log tombstones so sync clients
+# drop them, drop their dependency edges and saved-view membership,
+# then delete the originals. Planner and priority rows don't cover
+# completed tasks; dashboard rollups keep counting archived tasks, so
+# nothing else derived needs to change.
+
+def candidate_ids(db: Session, cutoff: datetime, limit: int) -> List[int]:
+    return [
+        task_id
+        for task_id, in db.query(Task.id)
+        .filter(
+            Task.status == models.TaskStatus.completed.value,
+            Task.completed_at < cutoff,
+        )
+        .order_by(Task.id)
+        .limit(limit)
+    ]
+
+
+def _archive_batch(db: Session, task_ids: List[int], now: datetime) -> int:
+    subtasks: Dict[int, List[dict]] = defaultdict(list)
+    for title, completed, sid, task_id, created_at, updated_at in (
+        db.query(Subtask.title, Subtask.completed, Subtask.id, Subtask.task_id,
+                 Subtask.created_at, Subtask.updated_at)
+        .filter(Subtask.task_id.in_(task_ids))
+        .order_by(Subtask.id)
+    ):
+        subtasks[task_id].append({
+            "title": title,
+            "completed": bool(completed),
+            "id": sid,
+            "task_id": task_id,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        })
+
+    assignments = [
+        {"id": aid, "task_id": task_id, "user_id": user_id, "role": role}
+        for aid, task_id, user_id, role in (
+            db.query(TaskAssignment.id, TaskAssignment.task_id, TaskAssignment.user_id, TaskAssignment.role)
+            .filter(TaskAssignment.task_id.in_(task_ids))
+        )
+    ]
+    tag_links = [
+        {"task_id": task_id, "tag_id": tag_id}
+        for task_id, tag_id in db.query(TaskTag.task_id, TaskTag.tag_id).filter(TaskTag.task_id.in_(task_ids))
+    ]
+
+    tasks = []
+    for row in db.query(
+        Task.id, Task.client_id, Task.title, Task.description, Task.status, Task.due_date,
+        Task.billable, Task.estimated_hours, Task.created_by, Task.created_at, Task.updated_at,
+        Task.completed_at, Task.version,
+    ).filter(Task.id.in_(task_ids)):
+        tasks.append({
+            "id": row.id,
+            "client_id": row.client_id,
+            "title": row.title,
+            "description_z": _pack_text(row.description),
+            "subtasks_z": _pack_json(subtasks.get(row.id)),
+            "status": row.status,
+            "due_date": row.due_date,
+            "billable": bool(row.billable),
+            "estimated_hours": row.estimated_hours,
+            "created_by": row.created_by,
+            "created_at": row.created_at,
+            "updated_at": row.updated_at,
+            "completed_at": row.completed_at,
+            "version": row.version or 1,
+            "archived_at": now,
+        })
+    if not tasks:
+        return 0
+
+    db.execute(ArchivedTask.__table__.insert(), tasks)
+    if assignments:
+        db.execute(ArchivedTaskAssignment.__table__.insert(), assignments)
+    if tag_links:
+        db.execute(ArchivedTaskTag.__table__.insert(), tag_links)
+
+    # Tombstones: to a sync client an archived task is a deleted one
+    children = defaultdict(lambda: {entity: set() for entity in changelog.CHILDREN})
+    for task_id, items in subtasks.items():
+        children[task_id]["subtask"].update(s["id"] for s in items)
+    for a in assignments:
+        children[a["task_id"]]["task_assignment"].add(a["id"])
+    for link in tag_links:
+        children[link["task_id"]]["task_tag"].add(link["tag_id"])
+    for task in tasks:
+        changelog.record_task_change(db, task["id"], task["client_id"], children[task["id"]], None)
+
+    moved = [task["id"] for task in tasks]
+    # A finished task no longer holds anything up
+    for task_id in dependencies.task_ids_with_edges(db, moved):
+        dependencies.remove_task(db, task_id)
+    views.remove_tasks(db, moved)
+    result_cache.invalidate_on_commit(db, {task["client_id"] for task in tasks})
+    for model, column in (
+        (TaskTag, TaskTag.task_id),
+        (Subtask, Subtask.task_id),
+        (TaskAssignment, TaskAssignment.task_id),
+        (Task, Task.id),
+    ):
+        db.query(model).filter(column.in_(moved)).delete(synchronize_session=False)
+    return len(tasks)
+
+
+def archive_completed(
+    db: Session,
+    older_than_days: int = ARCHIVE_AFTER_DAYS,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    now: Optional[datetime] = None,
+    max_batches: Optional[int] = None,
+) -> int:
+    """Archive tasks completed more than `older_than_days` ago, committing
+    after every batch so the write lock is only ever held briefly."""
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(days=older_than_days)
+
+    archived = batches = 0
+    while max_batches is None or batches < max_batches:
+        task_ids = candidate_ids(db, cutoff, batch_size)
+        if not task_ids:
+            break
+        archived += _archive_batch(db, task_ids, now)
+        db.commit()
+        batches += 1
+    return archived
+
+
+# ---------------------------------------------------
+# READ (include_archived on list / search / export)
+# ---------------------------------------------------
+
+def _filtered_query(
+    db: Session,
+    *columns,
+    statuses: Optional[str] = None,
+    client_id: Optional[int] = None,
+    assigned_user_id: Optional[int] = None,
+    billable: Optional[bool] = None,
+    due_before: Optional[datetime] = None,
+    due_after: Optional[datetime] = None,
+    tags: Optional[str] = None,
+    sort_by: Optional[str] = "created_at",
+    sort_dir: Optional[str] = "desc",
+    visible=None,
+):
+    """Same filters as crud_utils.tasks._filtered_query, minus search:
+    descriptions are compressed, so text matching happens after decoding."""
+    query = visibility.filter_archived(db.query(*columns), visible)
+
+    if statuses:
+        status_list = [s.strip() for s in statuses.split(",") if s.strip()]
+        if status_list:
+            query = query.filter(ArchivedTask.status.in_(status_list))
+
+    if client_id:
+        query = query.filter(ArchivedTask.client_id == client_id)
+
+    if billable is not None:
+        query = query.filter(ArchivedTask.billable == billable)
+
+    if due_before:
+        query = query.filter(ArchivedTask.due_date <= due_before)
+
+    if due_after:
+        query = query.filter(ArchivedTask.due_date >= due_after)
+
+    if assigned_user_id:
+        query = query.filter(ArchivedTask.id.in_(
+            db.query(ArchivedTaskAssignment.task_id).filter(ArchivedTaskAssignment.user_id == assigned_user_id)
+        ))
+
+    if tags:
+        tag_list = [t.strip() for t in tags.split(",") if t.strip()]
+        if tag_list:
+            query = query.filter(ArchivedTask.id.in_(
+                db.query(ArchivedTaskTag.task_id)
+                .join(Tag, Tag.id == ArchivedTaskTag.tag_id)
+                .filter(Tag.name.in_(tag_list))
+            ))
+
+    sort_column = getattr(ArchivedTask, sort_by, ArchivedTask.created_at)
+    if not hasattr(sort_column, "asc"):
+        sort_column = ArchivedTask.created_at
+    query = query.order_by(desc(sort_column) if sort_dir == "desc" else asc(sort_column))
+    return query
+
+
+def _matches(term: Optional[str], *texts) -> bool:
+    if not term:
+        return True
+    return any(term in text.casefold() for text in texts if text)
+
+
+def archived_task_dicts(db: Session, search: Optional[str] = None, **filters) -> List[dict]:
+    """TaskOut-shaped dicts for archived tasks matching the filters."""
+    query = _filtered_query(
+        db,
+        ArchivedTask.id, ArchivedTask.client_id, ArchivedTask.title, ArchivedTask.description_z,
+        ArchivedTask.subtasks_z, ArchivedTask.status, ArchivedTask.due_date, ArchivedTask.billable,
+        ArchivedTask.estimated_hours, ArchivedTask.created_by, ArchivedTask.created_at,
+        ArchivedTask.updated_at, ArchivedTask.version,
+        **filters,
+    )
+    term = search.casefold() if search else None
+
+    rows = []
+    for row in query:
+        description = _unpack_text(row.description_z)
+        if _matches(term, row.title, description):
+            rows.append((row, description))
+    if not rows:
+        return []
+
+    ids = [row.id for row, _ in rows]
+    assignments: Dict[int, List[dict]] = defaultdict(list)
+    for user_id, role, aid, task_id in (
+        db.query(ArchivedTaskAssignment.user_id, ArchivedTaskAssignment.role,
+                 ArchivedTaskAssignment.id, ArchivedTaskAssignment.task_id)
+        .filter(ArchivedTaskAssignment.task_id.in_(ids))
+        .order_by(ArchivedTaskAssignment.id)
+    ):
+        assignments[task_id].append({"user_id": user_id, "role": role, "id": aid})
+
+    tags: Dict[int, List[dict]] = defaultdict(list)
+    for task_id, tag_id, name in (
+        db.query(ArchivedTaskTag.task_id, Tag.id, Tag.name)
+        .join(Tag, Tag.id == ArchivedTaskTag.tag_id)
+        .filter(ArchivedTaskTag.task_id.in_(ids))
+        .order_by(Tag.id)
+    ):
+        tags[task_id].append({"id": tag_id, "name": name})
+
+    attachments = task_rows.attachment_dicts(db, ids)
+
+    return [
+        {
+            "title": row.title,
+            "description": description,
+            "due_date": row.due_date,
+            "billable": bool(row.billable),
+            "estimated_hours": row.estimated_hours,
+            "status": row.status,
+            "id": row.id,
+            "client_id": row.client_id,
+            "created_by": row.created_by,
+            "created_at": row.created_at,
+            "updated_at": row.updated_at,
+            "priority_score": None,
+            "version": row.version or 1,
+            "archived": True,
+            "subtasks": _unpack_json(row.subtasks_z),
+            "assignments": assignments.get(row.id, []),
+            "tags": tags.get(row.id, []),
+            "attachments": attachments.get(row.id, []),
+        }
+        for row, description in rows
+    ]
+
+
+def export_rows(db: Session, search: Optional[str] = None, batch_size: int = 1000, **filters):
+    """Archived tasks in task_rows.export_rows' tuple shape, by id."""
+    filters.update(sort_by="id", sort_dir="asc")
+    query = _filtered_query(
+        db,
+        ArchivedTask.id, ArchivedTask.client_id, ArchivedTask.title, ArchivedTask.status,
+        ArchivedTask.due_date, ArchivedTask.billable, ArchivedTask.estimated_hours,
+        ArchivedTask.created_by, ArchivedTask.created_at, ArchivedTask.updated_at,
+        ArchivedTask.completed_at, ArchivedTask.description_z,
+        **filters,
+    )
+    id_subquery = query.with_entities(ArchivedTask.id).order_by(None).scalar_subquery()
+
+    assignees: Dict[int, List[str]] = defaultdict(list)
+    for task_id, user_id in (
+        db.query(ArchivedTaskAssignment.task_id, ArchivedTaskAssignment.user_id)
+        .filter(ArchivedTaskAssignment.task_id.in_(id_subquery))
+        .order_by(ArchivedTaskAssignment.id)
+    ):
+        assignees[task_id].append(str(user_id))
+
+    tag_names: Dict[int, List[str]] = defaultdict(list)
+    for task_id, name in (
+        db.query(ArchivedTaskTag.task_id, Tag.name)
+        .join(Tag, Tag.id == ArchivedTaskTag.tag_id)
+        .filter(ArchivedTaskTag.task_id.in_(id_subquery))
+        .order_by(Tag.id)
+    ):
+        tag_names[task_id].append(name)
+
+    term = search.casefold() if search else None
+    for row in query.yield_per(batch_size):
+        if term and not _matches(term, row.title, _unpack_text(row.description_z)):
+            continue
+        yield tuple(row[:-1]) + (";".join(assignees.get(row.id, ())), ";".join(tag_names.get(row.id, ())))
+
+
+# ---------------------------------------------------
+# ROLLUP REBUILD SUPPORT
+# ---------------------------------------------------
+
+def rollup_keys(db: Session, batch_size: int = 1000) -> Counter:
+    """Dashboard counters contributed by archived tasks (see rollups.task_keys)."""
+    from backend.app.crud_utils.rollups import task_keys
+
+    user_ids: Dict[int, List[int]] = defaultdict(list)
+    for task_id, user_id in db.query(ArchivedTaskAssignment.task_id, ArchivedTaskAssignment.user_id):
+        user_ids[task_id].append(user_id)
+
+    totals = Counter()
+    for row in db.query(
+        ArchivedTask.id, ArchivedTask.client_id, ArchivedTask.status, ArchivedTask.due_date,
+        ArchivedTask.completed_at, ArchivedTask.subtasks_z,
+    ).yield_per(batch_size):
+        totals.update(task_keys(SimpleNamespace(
+            client_id=row.client_id,
+            status=row.status,
+            due_date=row.due_date,
+            completed_at=row.completed_at,
+            subtasks=[SimpleNamespace(completed=s["completed"]) for s in _unpack_json(row.subtasks_z)],
+            assignments=[SimpleNamespace(user_id=u) for u in user_ids.get(row.id, ())],
+        )))
+    return totals
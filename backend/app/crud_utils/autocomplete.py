@@ -0,0 +1,148 @@
+import threading
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from typing import Dict, Optional
+
+from backend.app.models import Client, Tag, Task, TaskAssignment, TaskTag, User
+from backend.app.utils.txn import on_commit
+from backend.app.utils.typeahead import TypeaheadIndex
+
+KINDS = ("tags", "clients", "users")
+
+# ---------------------------------------------------
+# INDEXES (one per kind, per worker process)
+# ---------------------------------------------------
+# Built from the database on first use and by the per-worker refresh job
+# (startup.py), then kept current by the write paths below. The refresh
+# picks up what other workers wrote and resets the usage counts; a
+# rebuilt index replaces the old one in a single assignment, so searches
+# never see a half-built index.
+
+_indexes: Dict[str, TypeaheadIndex] = {}
+_build_lock = threading.Lock()
+
+
+def _load_tags(db: Session, index: TypeaheadIndex):
+    for tag_id, name, usage in (
+        db.query(Tag.id, Tag.name, func.count(TaskTag.task_id))
+        .outerjoin(TaskTag, TaskTag.tag_id == Tag.id)
+        .group_by(Tag.id, Tag.name)
+    ):
+        index.put(tag_id, name, usage=usage)
+
+
+def _load_clients(db: Session, index: TypeaheadIndex):
+    for client_id, name, usage in (
+        db.query(Client.id, Client.name, func.count(Task.id))
+        .outerjoin(Task, Task.client_id == Client.id)
+        .group_by(Client.id, Client.name)
+    ):
+        index.put(client_id, name, usage=usage)
+
+
+def _load_users(db: Session, index: TypeaheadIndex):
+    for user_id, full_name, email, usage in (
+        db.query(User.id, User.full_name, User.email, func.count(func.distinct(TaskAssignment.task_id)))
+        .outerjoin(TaskAssignment, TaskAssignment.user_id == User.id)
+        .filter(User.is_active.is_(True))
+        .group_by(User.id, User.full_name, User.email)
+    ):
+        _put_user(index, user_id, full_name, email, usage)
+
+
+def _put_user(index: TypeaheadIndex, user_id: int, full_name: Optional[str], email: str, usage=None):
+    index.put(user_id, full_name or email, detail=email,
+              extra_terms=(email, email.split("@")[0]), usage=usage)
+
+
+LOADERS = {
+    "tags": _load_tags,
+    "clients": _load_clients,
+    "users": _load_users,
+}
+
+
+def rebuild(db: Session, kinds=KINDS) -> Dict[str, int]:
+    sizes = {}
+    for kind in kinds:
+        index = TypeaheadIndex()
+        LOADERS[kind](db, index)
+        _indexes[kind] = index
+        sizes[kind] = len(index)
+    return sizes
+
+
+def get_index(db: Session, kind: str) -> TypeaheadIndex:
+    index = _indexes.get(kind)
+    if index is None:
+        with _build_lock:
+            if kind not in _indexes:
+                rebuild(db, [kind])
+            index = _indexes[kind]
+    return index
+
+
+def search(db: Session, kind: str, q: str, limit: int = 10, visible=None):
+    """visible (crud_utils.visibility) limits clients to the user's own;
+    their usage counts are task counts. Tags and users aren't per client."""
+    only = None
+    if kind == "clients" and visible is not None and not visible.everything:
+        only = visible.client_ids
+    return get_index(db, kind).search(q, limit, only=only)
+
+
+# ---------------------------------------------------
+# WRITE PATHS
+# ---------------------------------------------------
+# Task writes hand over before/after usage snapshots like the other
+# derived tables (see crud_utils.tasks._sync_derived); the deltas are
+# applied once the transaction commits. Client and user writes call in
+# after their own commit.
+
+def task_usage(task: Optional[Task]):
+    if task is None:
+        return None
+    return {
+        "tags": {tag.id: tag.name for tag in task.tags},
+        "users": {a.user_id: None for a in task.assignments},
+        "clients": {task.client_id: None},
+    }
+
+
+def apply_task_change(db: Session, before, after):
+    before = before or {kind: {} for kind in KINDS}
+    after = after or {kind: {} for kind in KINDS}
+    changes = []
+    for kind in KINDS:
+        for entry_id in after[kind].keys() - before[kind].keys():
+            changes.append((kind, entry_id, after[kind][entry_id], 1))
+        for entry_id in before[kind].keys() - after[kind].keys():
+            changes.append((kind, entry_id, None, -1))
+    if changes:
+        on_commit(db, lambda: _apply_usage(changes))
+
+
+def _apply_usage(changes):
+    for kind, entry_id, label, delta in changes:
+        index = _indexes.get(kind)
+        if index is None:
+            continue   # built from the database, counts included, on first use
+        if kind == "tags" and delta > 0 and entry_id not in index:
+            index.put(entry_id, label)   # a tag created by this write
+        index.add_usage(entry_id, delta)
+
+
+def client_changed(client: Client):
+    index = _indexes.get("clients")
+    if index is not None:
+        index.put(client.id, client.name)
+
+
+def user_changed(user: User):
+    index = _indexes.get("users")
+    if index is None:
+        return
+    if user.is_active:
+        _put_user(index, user.id, user.full_name, user.email)
+    else:
+        index.remove(user.id)
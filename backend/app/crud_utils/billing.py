@@ -0,0 +1,257 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import case, func
+from typing import Dict, Optional, Tuple
+from datetime import date, datetime
+
+from backend.app.models import (
+    ArchivedTask, BillingRollup, Client, Task, TimeEntry, User,
+)
+from backend.app.schemas.billing import TimeEntryCreate, TimeEntryUpdate
+from backend.app.crud_utils import visibility
+from backend.app.crud_utils.rollups import add_counts
+
+BILLING_KEY = ("month", "client_id", "user_id")
+BILLING_VALUES = ("minutes", "billable_minutes", "entries")
+
+
+# ---------------------------------------------------
+# ROLLUP CONTRIBUTIONS
+# ---------------------------------------------------
+# Like crud_utils.rollups: each write computes what the entry contributed
+# before and after, and adds the difference onto billing_rollups in the
+# same transaction.
+
+def month_of(day: date) -> str:
+    return day.strftime("%Y-%m")
+
+
+def entry_contribution(entry: Optional[TimeEntry]) -> Dict[Tuple, Tuple[int, int, int]]:
+    if entry is None:
+        return {}
+    key = (month_of(entry.work_date), entry.client_id, entry.user_id)
+    return {key: (entry.minutes, entry.minutes if entry.billable else 0, 1)}
+
+
+def apply_entry_change(db: Session, before, after):
+    deltas: Dict[Tuple, list] = {}
+    for sign, contribution in ((-1, before or {}), (1, after or {})):
+        for key, values in contribution.items():
+            delta = deltas.setdefault(key, [0, 0, 0])
+            for i, value in enumerate(values):
+                delta[i] += sign * value
+
+    rows = [
+        dict(zip(BILLING_KEY, key), **dict(zip(BILLING_VALUES, values)))
+        for key, values in deltas.items()
+        if any(values)
+    ]
+    add_counts(db, BillingRollup, BILLING_KEY, BILLING_VALUES, rows)
+
+    # A (month, client, user) with no entries left has nothing to report
+    emptied = [r for r in rows if r["entries"] < 0]
+    for r in emptied:
+        db.query(BillingRollup).filter(
+            BillingRollup.month == r["month"],
+            BillingRollup.client_id == r["client_id"],
+            BillingRollup.user_id == r["user_id"],
+            BillingRollup.entries <= 0,
+        ).delete(synchronize_session=False)
+
+
+# ---------------------------------------------------
+# TIME ENTRIES
+# ---------------------------------------------------
+
+def get_entry(db: Session, entry_id: int):
+    return db.query(TimeEntry).filter(TimeEntry.id == entry_id).first()
+
+
+def list_entries(
+    db: Session,
+    task_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    client_id: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    limit: int = 500,
+):
+    query = db.query(TimeEntry)
+    if task_id:
+        query = query.filter(TimeEntry.task_id == task_id)
+    if user_id:
+        query = query.filter(TimeEntry.user_id == user_id)
+    if client_id:
+        query = query.filter(TimeEntry.client_id == client_id)
+    if start:
+        query = query.filter(TimeEntry.work_date >= start)
+    if end:
+        query = query.filter(TimeEntry.work_date <= end)
+    return query.order_by(TimeEntry.work_date.desc(), TimeEntry.id.desc()).limit(limit).all()
+
+
+def create_entry(db: Session, data: TimeEntryCreate, user_id: int, visible=None):
+    task = db.query(Task).filter(Task.id == data.task_id).first()
+    if not task or not visibility.can_see(visible, task):
+        return None
+
+    entry = TimeEntry(
+        task_id=task.id,
+        client_id=task.client_id,
+        user_id=user_id,
+        work_date=data.work_date or datetime.utcnow().date(),
+        minutes=data.minutes,
+        billable=task.billable if data.billable is None else data.billable,
+        note=data.note,
+    )
+    db.add(entry)
+    db.flush()
+    apply_entry_change(db, None, entry_contribution(entry))
+
+    db.commit()
+    db.refresh(entry)
+    return entry
+
+
+def update_entry(db: Session, entry_id: int, data: TimeEntryUpdate):
+    entry = get_entry(db, entry_id)
+    if not entry:
+        return None
+
+    before = entry_contribution(entry)
+    for field, value in data.dict(exclude_unset=True).items():
+        if value is not None or field == "note":
+            setattr(entry, field, value)
+    apply_entry_change(db, before, entry_contribution(entry))
+
+    db.commit()
+    db.refresh(entry)
+    return entry
+
+
+def delete_entry(db: Session, entry_id: int):
+    entry = get_entry(db, entry_id)
+    if not entry:
+        return False
+
+    apply_entry_change(db, entry_contribution(entry), None)
+    db.delete(entry)
+    db.commit()
+    return True
+
+
+# ---------------------------------------------------
+# REPORTS (read billing_rollups only)
+# ---------------------------------------------------
+
+def summary(db: Session, month: str, group_by: str = "client", client_id: Optional[int] = None,
+            user_id: Optional[int] = None):
+    """Totals for one month per client or per user. A handful of counter
+    rows per (client, user) pair, however many entries were logged."""
+    group_column = BillingRollup.client_id if group_by == "client" else BillingRollup.user_id
+    name_column = Client.name if group_by == "client" else func.coalesce(User.full_name, User.email)
+    name_model = Client if group_by == "client" else User
+
+    query = (
+        db.query(
+            group_column,
+            name_column,
+            func.sum(BillingRollup.minutes),
+            func.sum(BillingRollup.billable_minutes),
+            func.sum(BillingRollup.entries),
+        )
+        .outerjoin(name_model, name_model.id == group_column)
+        .filter(BillingRollup.month == month)
+    )
+    if client_id:
+        query = query.filter(BillingRollup.client_id == client_id)
+    if user_id:
+        query = query.filter(BillingRollup.user_id == user_id)
+
+    lines = [
+        {
+            "id": group_id,
+            "name": name,
+            "minutes": minutes or 0,
+            "billable_minutes": billable or 0,
+            "entries": entries or 0,
+            "hours": round((minutes or 0) / 60, 2),
+            "billable_hours": round((billable or 0) / 60, 2),
+        }
+        for group_id, name, minutes, billable, entries in (
+            query.group_by(group_column, name_column).order_by(group_column)
+        )
+    ]
+    return {
+        "month": month,
+        "group_by": group_by,
+        "lines": lines,
+        "total_minutes": sum(line["minutes"] for line in lines),
+        "total_billable_minutes": sum(line["billable_minutes"] for line in lines),
+    }
+
+
+# ---------------------------------------------------
+# CSV EXPORT (raw entries for a period, streamed)
+# ---------------------------------------------------
+
+EXPORT_HEADER = (
+    "entry_id", "work_date", "client_id", "client", "task_id", "task", "user_id", "user",
+    "minutes", "hours", "billable", "note",
+)
+
+
+def export_rows(db: Session, start: date, end: date, client_id: Optional[int] = None,
+                billable_only: bool = False, batch_size: int = 1000):
+    """Walks ix_time_entries_work_date_client; task titles come from the
+    hot table or, for archived tasks, from the archive."""
+    query = (
+        db.query(
+            TimeEntry.id, TimeEntry.work_date, TimeEntry.client_id, Client.name,
+            TimeEntry.task_id, func.coalesce(Task.title, ArchivedTask.title),
+            TimeEntry.user_id, User.email, TimeEntry.minutes, TimeEntry.billable, TimeEntry.note,
+        )
+        .outerjoin(Client, Client.id == TimeEntry.client_id)
+        .outerjoin(Task, Task.id == TimeEntry.task_id)
+        .outerjoin(ArchivedTask, ArchivedTask.id == TimeEntry.task_id)
+        .outerjoin(User, User.id == TimeEntry.user_id)
+        .filter(TimeEntry.work_date >= start, TimeEntry.work_date <= end)
+    )
+    if client_id:
+        query = query.filter(TimeEntry.client_id == client_id)
+    if billable_only:
+        query = query.filter(TimeEntry.billable.is_(True))
+
+    for (entry_id, work_date, entry_client_id, client_name, task_id, title,
+         entry_user_id, email, minutes, billable, note) in (
+        query.order_by(TimeEntry.work_date, TimeEntry.client_id, TimeEntry.id).yield_per(batch_size)
+    ):
+        yield (entry_id, work_date, entry_client_id, client_name, task_id, title,
+               entry_user_id, email, minutes, round(minutes / 60, 2), bool(billable), note or "")
+
+
+# ---------------------------------------------------
+# REBUILD (repairs drift)
+# ---------------------------------------------------
+
+def rebuild_billing(db: Session) -> int:
+    # Grouped per day in SQL (portable), folded into months here
+    billable = func.sum(case((TimeEntry.billable.is_(True), TimeEntry.minutes), else_=0))
+    totals: Dict[Tuple, list] = {}
+    for work_date, client_id, user_id, minutes, billable_minutes, entries in db.query(
+        TimeEntry.work_date, TimeEntry.client_id, TimeEntry.user_id,
+        func.sum(TimeEntry.minutes), billable, func.count(TimeEntry.id),
+    ).group_by(TimeEntry.work_date, TimeEntry.client_id, TimeEntry.user_id):
+        total = totals.setdefault((month_of(work_date), client_id, user_id), [0, 0, 0])
+        total[0] += minutes or 0
+        total[1] += billable_minutes or 0
+        total[2] += entries
+
+    db.query(BillingRollup).delete(synchronize_session=False)
+    rows = [
+        dict(zip(BILLING_KEY, key), **dict(zip(BILLING_VALUES, values)))
+        for key, values in totals.items()
+    ]
+    if rows:
+        db.bulk_insert_mappings(BillingRollup, rows)
+    db.commit()
+    return len(rows)
@@ -0,0 +1,102 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, exists
+from typing import Optional
+from datetime import date, datetime, time, timedelta
+
+from backend.app.models import Task, TaskAssignment
+from backend.app.crud_utils import recurrence, visibility
+from backend.app.utils.recurrence_engine import occurrences
+
+DEFAULT_CARDS_PER_DAY = 5
+
+
+def calendar_range(
+    db: Session,
+    start: date,
+    end: date,
+    user_id: Optional[int] = None,
+    per_day: int = DEFAULT_CARDS_PER_DAY,
+    visible=None,
+):
+    """Tasks due in [start, end] grouped by day.
+
+    A single range scan on ix_tasks_due_date; window functions number and
+    count each day's rows so only the first `per_day` cards leave SQLite.
+    Recurring definitions are expanded into the same buckets. Both only
+    include what `visible` (crud_utils.visibility) lets the caller see.
+    """
+    window_start = datetime.combine(start, time.min)
+    window_end = datetime.combine(end + timedelta(days=1), time.min)
+
+    day = func.date(Task.due_date)
+    ranked = select(
+        Task.id,
+        Task.title,
+        Task.status,
+        Task.client_id,
+        Task.billable,
+        Task.due_date,
+        day.label("day"),
+        func.row_number().over(partition_by=day, order_by=(Task.due_date, Task.id)).label("rn"),
+        func.count().over(partition_by=day).label("day_count"),
+    ).where(
+        Task.due_date >= window_start,
+        Task.due_date < window_end,
+    )
+    if user_id:
+        ranked = ranked.where(
+            exists().where(
+                TaskAssignment.task_id == Task.id,
+                TaskAssignment.user_id == user_id,
+            )
+        )
+    clause = visibility.task_clause(visible)
+    if clause is not None:
+        ranked = ranked.where(clause)
+    ranked = ranked.subquery()
+
+    days = {}
+    rows = db.execute(
+        select(ranked).where(ranked.c.rn <= per_day).order_by(ranked.c.day, ranked.c.rn)
+    )
+    for row in rows:
+        bucket = days.setdefault(row.due_date.date(), {"count": row.day_count, "tasks": []})
+        bucket["tasks"].append({
+            "id": row.id,
+            "recurring_id": None,
+            "title": row.title,
+            "status": row.status,
+            "client_id": row.client_id,
+            "billable": bool(row.billable),
+            "due_date": row.due_date,
+        })
+
+    definitions = recurrence.definitions_in_window(db, window_start, window_end, user_id=user_id, visible=visible)
+    for definition in definitions:
+        for due in occurrences(definition, window_start, window_end - timedelta(microseconds=1)):
+            bucket = days.setdefault(due.date(), {"count": 0, "tasks": []})
+            bucket["count"] += 1
+            if len(bucket["tasks"]) < per_day:
+                bucket["tasks"].append({
+                    "id": None,
+                    "recurring_id": definition.id,
+                    "title": definition.title,
+                    "status": None,
+                    "client_id": definition.client_id,
+                    "billable": bool(definition.billable),
+                    "due_date": due,
+                })
+
+    return {
+        "start": start,
+        "end": end,
+        "days": [
+            {
+                "date": d,
+                "count": bucket["count"],
+                "truncated": bucket["count"] > len(bucket["tasks"]),
+                "tasks": bucket["tasks"],
+            }
+            for d, bucket in sorted(days.items())
+        ],
+    }
@@ -0,0 +1,221 @@
+import os
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func
+from typing import Optional
+from datetime import datetime, timedelta
+
+from backend.app.models import ChangeLogEntry, SyncState, Task, Tag
+from backend.app.crud_utils import visibility
+from backend.app.utils.txn import advisory_lock
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+PRUNED_THROUGH = "change_log_pruned_through"
+WRITE_LOCK_KEY = 7331001   # txn.advisory_lock key for change-log writers
+RETENTION_DAYS = int(os.getenv("CHANGE_LOG_RETENTION_DAYS", "30"))
+
+# Child collections tracked per task: change-log entity -> how to read ids
+CHILDREN = {
+    "subtask": lambda task: {s.id for s in task.subtasks},
+    "task_assignment": lambda task: {a.id for a in task.assignments},
+    "task_tag": lambda task: {t.id for t in task.tags},
+}
+
+
+# ---------------------------------------------------
+# RECORDING (inside the caller's transaction)
+# ---------------------------------------------------
+# changes_since() treats the version as a cursor, which only holds if
+# versions become visible in order. SQLite has one writer at a time, so
+# they do. On Postgres two transactions can draw versions 10 and 11 and
+# commit 11 first; a client syncing in between would skip 10 for good.
+# There the first entry of a transaction takes a transaction-scoped
+# advisory lock, so change-log writers commit one after the other.
+
+def record(db: Session, entity: str, entity_id: int, op: str,
+           task_id: Optional[int] = None, client_id: Optional[int] = None):
+    advisory_lock(db, WRITE_LOCK_KEY)
+    db.add(ChangeLogEntry(
+        entity=entity,
+        entity_id=entity_id,
+        op=op,
+        task_id=task_id,
+        client_id=client_id,
+    ))
+
+
+def child_ids(task: Optional[Task]):
+    if task is None:
+        return None
+    return {entity: read(task) for entity, read in CHILDREN.items()}
+
+
+def record_task_change(db: Session, task_id: int, client_id: int, before, after, touched=()):
+    """Log a task write from child_ids() snapshots taken before and after.
+
+    The task itself always gets an entry so a sync client refetches it;
+    children get upserts/tombstones for what appeared or disappeared.
+    `touched` lists (entity, id) pairs changed in place (e.g. a subtask
+    rename) that the id diff can't see.
+    """
+    before = before or {entity: set() for entity in CHILDREN}
+    after_ids = after or {entity: set() for entity in CHILDREN}
+
+    record(db, "task", task_id, UPSERT if after is not None else DELETE, task_id, client_id)
+    for entity in CHILDREN:
+        for entity_id in sorted(before[entity] - after_ids[entity]):
+            record(db, entity, entity_id, DELETE, task_id, client_id)
+        for entity_id in sorted(after_ids[entity] - before[entity]):
+            record(db, entity, entity_id, UPSERT, task_id, client_id)
+    for entity, entity_id in touched:
+        record(db, entity, entity_id, UPSERT, task_id, client_id)
+
+
+def current_version(db: Session) -> int:
+    return db.query(func.max(ChangeLogEntry.version)).scalar() or 0
+
+
+def _pruned_through(db: Session) -> int:
+    state = db.query(SyncState).filter(SyncState.key == PRUNED_THROUGH).first()
+    return state.value if state else 0
+
+
+# ---------------------------------------------------
+# DELTA SYNC
+# ---------------------------------------------------
+
+def changes_since(db: Session, since: Optional[int], limit: int = 1000, visible=None):
+    """Compacted changes after `since`.
+
+    Reads at most `limit` log rows in version order, keeps the last op per
+    entity and returns live rows for upserts and ids for tombstones. With
+    no cursor, or one older than what retention kept, the client is told
+    to reset (full reload, then sync from the returned version).
+
+    Changed tasks the caller can't see (`visible`, crud_utils.visibility),
+    deleted ones included, are sent as task tombstones only, so a client
+    that could see one before drops it and learns nothing else.
+    """
+    if since is None or since < _pruned_through(db):
+        return {"version": current_version(db), "reset": True, "has_more": False,
+                "tasks": [], "tags": [], "deleted": _empty_tombstones()}
+
+    entries = (
+        db.query(ChangeLogEntry)
+        .filter(ChangeLogEntry.version > since)
+        .order_by(ChangeLogEntry.version)
+        .limit(limit + 1)
+        .all()
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    latest = {}
+    for entry in entries:
+        latest[(entry.entity, entry.entity_id, entry.task_id if entry.entity == "task_tag" else None)] = entry
+
+    # Tasks the caller can't see: one id query over every task touched
+    hidden = set()
+    if visible is not None and not visible.everything:
+        touched = {entry.task_id for entry in latest.values() if entry.task_id is not None}
+        if touched:
+            seen = visibility.filter_tasks(db.query(Task.id).filter(Task.id.in_(touched)), visible)
+            hidden = touched - {task_id for task_id, in seen}
+
+    task_ids, tag_ids = set(), set()
+    deleted = _empty_tombstones()
+    for (entity, entity_id, _), entry in latest.items():
+        if entity == "task" and entity_id in hidden:
+            deleted["tasks"].append(entity_id)
+        elif entry.task_id in hidden:
+            continue
+        elif entry.op == DELETE:
+            if entity == "task_tag":
+                deleted["task_tags"].append({"task_id": entry.task_id, "tag_id": entity_id})
+            elif entity == "task":
+                deleted["tasks"].append(entity_id)
+            elif entity == "subtask":
+                deleted["subtasks"].append(entity_id)
+            elif entity == "task_assignment":
+                deleted["task_assignments"].append(entity_id)
+        elif entity == "task":
+            task_ids.add(entity_id)
+        elif entity == "tag":
+            tag_ids.add(entity_id)
+
+    task_ids -= set(deleted["tasks"])
+    tasks = []
+    if task_ids:
+        tasks = (
+            db.query(Task)
+            .options(
+                selectinload(Task.subtasks),
+                selectinload(Task.assignments),
+                selectinload(Task.tags),
+                selectinload(Task.attachments),
+            )
+            .filter(Task.id.in_(task_ids))
+            .order_by(Task.id)
+            .all()
+        )
+    tags = db.query(Tag).filter(Tag.id.in_(tag_ids)).all() if tag_ids else []
+
+    return {
+        "version": entries[-1].version if entries else since,
+        "reset": False,
+        "has_more": has_more,
+        "tasks": tasks,
+        "tags": tags,
+        "deleted": deleted,
+    }
+
+
+def _empty_tombstones():
+    return {"tasks": [], "subtasks": [], "task_assignments": [], "task_tags": []}
+
+
+# ---------------------------------------------------
+# RETENTION / COMPACTION
+# ---------------------------------------------------
+
+def compact(db: Session, retention_days: int = RETENTION_DAYS, now: Optional[datetime] = None):
+    """Drop superseded rows, then anything older than the retention window.
+
+    Removing a row that a newer row for the same entity supersedes never
+    changes what changes_since() returns. Retention does, so the highest
+    pruned version is remembered and older cursors are sent to reset.
+    """
+    now = now or datetime.utcnow()
+
+    latest = (
+        db.query(func.max(ChangeLogEntry.version))
+        .group_by(ChangeLogEntry.entity, ChangeLogEntry.entity_id, ChangeLogEntry.task_id)
+    )
+    superseded = (
+        db.query(ChangeLogEntry)
+        .filter(ChangeLogEntry.version.notin_(latest))
+        .delete(synchronize_session=False)
+    )
+
+    cutoff = now - timedelta(days=retention_days)
+    expired_through = (
+        db.query(func.max(ChangeLogEntry.version))
+        .filter(ChangeLogEntry.changed_at < cutoff)
+        .scalar()
+    )
+    expired = 0
+    if expired_through:
+        expired = (
+            db.query(ChangeLogEntry)
+            .filter(ChangeLogEntry.version <= expired_through)
+            .delete(synchronize_session=False)
+        )
+        state = db.query(SyncState).filter(SyncState.key == PRUNED_THROUGH).first()
+        if state:
+            state.value = max(state.value, expired_through)
+        else:
+            db.add(SyncState(key=PRUNED_THROUGH, value=expired_through))
+
+    db.commit()
+    return {"superseded": superseded, "expired": expired}
@@ -0,0 +1,86 @@
+from sqlalchemy.orm import Session
+
+from backend.app import models
+from backend.app.crud_utils import autocomplete, planner, visibility, workload
+from backend.app.schemas.clients import ClientCreate, ClientUpdate
+
+# ---------------------------------------------------
+# CLIENTS
+# ---------------------------------------------------
+
+def list_clients(db: Session):
+    return db.query(models.Client).order_by(models.Client.name).all()
+
+
+def get_client(db: Session, client_id: int):
+    return db.query(models.Client).filter(models.Client.id == client_id).first()
+
+
+def create_client(db: Session, data: ClientCreate):
+    client = models.Client(name=data.name, assigned_weekday=data.assigned_weekday)
+    db.add(client)
+    db.commit()
+    db.refresh(client)
+    autocomplete.client_changed(client)
+    return client
+
+
+def update_client(db: Session, client_id: int, data: ClientUpdate):
+    client = get_client(db, client_id)
+    if not client:
+        return None
+
+    update_data = data.dict(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(client, field, value)
+
+    if "assigned_weekday" in update_data:
+        planner.set_client_weekday(db, client.id, client.assigned_weekday)
+
+    db.commit()
+    db.refresh(client)
+    if "name" in update_data:
+        autocomplete.client_changed(client)
+    return client
+
+
+# ---------------------------------------------------
+# CLIENT ASSIGNMENTS
+# ---------------------------------------------------
+
+def assign_user_to_client(db: Session, client_id: int, user_id: int):
+    assignment = models.ClientAssignment(client_id=client_id, user_id=user_id)
+    db.add(assignment)
+    db.flush()
+
+    planner.add_assignment(db, user_id, client_id)
+    workload.member_added(db, client_id, user_id)
+    visibility.invalidate_on_commit(db, [user_id])
+
+    db.commit()
+    db.refresh(assignment)
+    return assignment
+
+
+def unassign_user_from_client(db: Session, client_id: int, user_id: int):
+    assignments = (
+        db.query(models.ClientAssignment)
+        .filter(
+            models.ClientAssignment.client_id == client_id,
+            models.ClientAssignment.user_id == user_id,
+        )
+        .all()
+    )
+    if not assignments:
+        return False
+
+    for assignment in assignments:
+        db.delete(assignment)
+    db.flush()
+
+    planner.remove_assignment(db, user_id, client_id)
+    workload.member_removed(db, client_id, user_id)
+    visibility.invalidate_on_commit(db, [user_id])
+
+    db.commit()
+    return True
@@ -0,0 +1,280 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import or_
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, Optional
+
+from backend.app import models
+from backend.app.models import Task, TaskDependency, TaskReachability
+from backend.app.crud_utils import changelog, rollups, visibility
+from backend.app.utils.txn import advisory_lock
+
+REACH_KEY = ("ancestor_id", "descendant_id")
+
+
+class DependencyCycle(Exception):
+    """Adding the edge would make a task (transitively) block itself."""
+
+
+# ---------------------------------------------------
+# CLOSURE MAINTENANCE
+# ---------------------------------------------------
+# task_reachability holds one row per (ancestor, descendant) pair with the
+# number of distinct paths between them. Adding edge u -> v adds, for every
+# a that reaches u and every d that v reaches, paths(a, u) * paths(v, d)
+# to (a, d); removing the edge subtracts the same amounts. Both are two
+# indexed reads and one batched upsert, whatever the size of the graph.
+#
+# The cycle check and the path counts read the closure before writing it,
+# so concurrent edge writes must not interleave: u -> v and v -> u would
+# both pass the check, and two upserts computed from the same stale
+# closure would miscount paths. Locking the two task rows isn't enough
+# (two new edges can close a cycle through existing paths without sharing
+# a task), so every edge writer takes an advisory lock for the rest of
+# its transaction. It is the change-log writer lock: edge writes are
+# logged anyway, and one lock can't be taken in two orders. SQLite's
+# single writer already serializes them.
+
+def _upstream(db: Session, task_id: int) -> Dict[int, int]:
+    """Everything that reaches task_id (itself included), with path counts."""
+    found = {task_id: 1}
+    for ancestor_id, paths in db.query(TaskReachability.ancestor_id, TaskReachability.paths).filter(
+        TaskReachability.descendant_id == task_id
+    ):
+        found[ancestor_id] = paths
+    return found
+
+
+def _downstream(db: Session, task_id: int) -> Dict[int, int]:
+    found = {task_id: 1}
+    for descendant_id, paths in db.query(TaskReachability.descendant_id, TaskReachability.paths).filter(
+        TaskReachability.ancestor_id == task_id
+    ):
+        found[descendant_id] = paths
+    return found
+
+
+def _apply_edge(db: Session, blocker_id: int, blocked_id: int, sign: int):
+    ancestors = _upstream(db, blocker_id)
+    descendants = _downstream(db, blocked_id)
+    rows = [
+        {"ancestor_id": a, "descendant_id": d, "paths": sign * a_paths * d_paths}
+        for a, a_paths in ancestors.items()
+        for d, d_paths in descendants.items()
+    ]
+    rollups.add_counts(db, TaskReachability, REACH_KEY, ("paths",), rows)
+    if sign < 0:
+        db.query(TaskReachability).filter(
+            TaskReachability.ancestor_id.in_(ancestors),
+            TaskReachability.descendant_id.in_(descendants),
+            TaskReachability.paths <= 0,
+        ).delete(synchronize_session=False)
+
+
+def reaches(db: Session, ancestor_id: int, descendant_id: int) -> bool:
+    return db.query(
+        db.query(TaskReachability)
+        .filter(TaskReachability.ancestor_id == ancestor_id, TaskReachability.descendant_id == descendant_id)
+        .exists()
+    ).scalar()
+
+
+def link(db: Session, task_id: int, depends_on_id: int) -> bool:
+    """Record that task_id is blocked by depends_on_id, inside the caller's
+    transaction. False if the edge already exists; raises DependencyCycle
+    if depends_on_id is task_id or already (transitively) blocked by it."""
+    advisory_lock(db, changelog.WRITE_LOCK_KEY)
+    if task_id == depends_on_id or reaches(db, task_id, depends_on_id):
+        raise DependencyCycle(f"Task {depends_on_id} already depends on task {task_id}")
+
+    exists = db.query(TaskDependency).filter(
+        TaskDependency.task_id == task_id, TaskDependency.depends_on_id == depends_on_id
+    ).first()
+    if exists:
+        return False
+
+    db.add(TaskDependency(task_id=task_id, depends_on_id=depends_on_id))
+    db.flush()
+    _apply_edge(db, depends_on_id, task_id, 1)
+    return True
+
+
+def unlink(db: Session, task_id: int, depends_on_id: int) -> bool:
+    advisory_lock(db, changelog.WRITE_LOCK_KEY)
+    removed = db.query(TaskDependency).filter(
+        TaskDependency.task_id == task_id, TaskDependency.depends_on_id == depends_on_id
+    ).delete(synchronize_session=False)
+    if not removed:
+        return False
+    _apply_edge(db, depends_on_id, task_id, -1)
+    return True
+
+
+def remove_task(db: Session, task_id: int) -> List[int]:
+    """Drop every edge touching task_id (before it is deleted or archived).
+    Returns the ids of the tasks on the other end of those edges."""
+    edges = db.query(TaskDependency.task_id, TaskDependency.depends_on_id).filter(
+        or_(TaskDependency.task_id == task_id, TaskDependency.depends_on_id == task_id)
+    ).all()
+    for blocked_id, blocker_id in edges:
+        unlink(db, blocked_id, blocker_id)
+    return sorted({b for edge in edges for b in edge} - {task_id})
+
+
+def rebuild_closure(db: Session) -> int:
+    """Recompute task_reachability from the edges (repairs drift)."""
+    advisory_lock(db, changelog.WRITE_LOCK_KEY)
+    children: Dict[int, List[int]] = defaultdict(list)
+    for blocked_id, blocker_id in db.query(TaskDependency.task_id, TaskDependency.depends_on_id):
+        children[blocker_id].append(blocked_id)
+
+    def count_paths(start: int) -> Dict[int, int]:
+        # Paths from `start` in a DAG, in topological order of its subgraph
+        order, seen, stack = [], set(), [(start, False)]
+        while stack:
+            node, done = stack.pop()
+            if done:
+                order.append(node)
+                continue
+            if node in seen:
+                continue
+            seen.add(node)
+            stack.append((node, True))
+            stack.extend((child, False) for child in children.get(node, ()))
+        paths = defaultdict(int, {start: 1})
+        for node in reversed(order):
+            for child in children.get(node, ()):
+                paths[child] += paths[node]
+        paths.pop(start)
+        return paths
+
+    rows = [
+        {"ancestor_id": node, "descendant_id": d, "paths": n}
+        for node in list(children)
+        for d, n in count_paths(node).items()
+    ]
+    db.query(TaskReachability).delete(synchronize_session=False)
+    if rows:
+        db.bulk_insert_mappings(TaskReachability, rows)
+    db.commit()
+    return len(rows)
+
+
+# ---------------------------------------------------
+# READ
+# ---------------------------------------------------
+
+def blocked_by(db: Session, task_id: int, visible=None) -> List[Task]:
+    query = (
+        db.query(Task)
+        .join(TaskDependency, TaskDependency.depends_on_id == Task.id)
+        .filter(TaskDependency.task_id == task_id)
+    )
+    return visibility.filter_tasks(query, visible).order_by(Task.id).all()
+
+
+def blocks(db: Session, task_id: int, visible=None) -> List[Task]:
+    query = (
+        db.query(Task)
+        .join(TaskDependency, TaskDependency.task_id == Task.id)
+        .filter(TaskDependency.depends_on_id == task_id)
+    )
+    return visibility.filter_tasks(query, visible).order_by(Task.id).all()
+
+
+def downstream(db: Session, task_id: int, include_completed: bool = True, visible=None) -> List[Task]:
+    """Everything transitively blocked by task_id: one indexed join."""
+    query = (
+        db.query(Task)
+        .join(TaskReachability, TaskReachability.descendant_id == Task.id)
+        .filter(TaskReachability.ancestor_id == task_id)
+    )
+    if not include_completed:
+        query = query.filter(Task.status != models.TaskStatus.completed.value)
+    return visibility.filter_tasks(query, visible).order_by(Task.id).all()
+
+
+def upstream(db: Session, task_id: int) -> List[Task]:
+    return (
+        db.query(Task)
+        .join(TaskReachability, TaskReachability.ancestor_id == Task.id)
+        .filter(TaskReachability.descendant_id == task_id)
+        .order_by(Task.id)
+        .all()
+    )
+
+
+# ---------------------------------------------------
+# CRITICAL PATH (per client, remaining work)
+# ---------------------------------------------------
+
+def critical_path(db: Session, client_id: int):
+    """Longest chain of open tasks by estimated_hours within one client.
+
+    Two queries (the client's open tasks, the edges between them) and a
+    linear pass in topological order, so it is cheap enough to compute on
+    every board load. Completed tasks are left out: they no longer hold
+    anything up.
+    """
+    open_filter = or_(Task.status.is_(None), Task.status != models.TaskStatus.completed.value)
+    tasks = {
+        row.id: row
+        for row in db.query(
+            Task.id, Task.title, Task.status, Task.due_date, Task.estimated_hours,
+        ).filter(Task.client_id == client_id, open_filter)
+    }
+    if not tasks:
+        return {"client_id": client_id, "total_hours": 0.0, "tasks": []}
+
+    children: Dict[int, List[int]] = defaultdict(list)
+    indegree = dict.fromkeys(tasks, 0)
+    for blocked_id, blocker_id in db.query(TaskDependency.task_id, TaskDependency.depends_on_id).filter(
+        TaskDependency.task_id.in_(list(tasks)),
+        TaskDependency.depends_on_id.in_(list(tasks)),
+    ):
+        children[blocker_id].append(blocked_id)
+        indegree[blocked_id] += 1
+
+    weight = {task_id: float(row.estimated_hours or 0) for task_id, row in tasks.items()}
+    finish = dict(weight)               # longest chain ending at each task
+    previous: Dict[int, Optional[int]] = dict.fromkeys(tasks)
+    ready = deque(sorted(t for t, n in indegree.items() if n == 0))
+    while ready:
+        node = ready.popleft()
+        for child in children.get(node, ()):
+            if finish[node] + weight[child] > finish[child]:
+                finish[child] = finish[node] + weight[child]
+                previous[child] = node
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                ready.append(child)
+
+    end = max(finish, key=lambda t: (finish[t], -t))
+    chain = []
+    while end is not None:
+        chain.append(end)
+        end = previous[end]
+    chain.reverse()
+
+    return {
+        "client_id": client_id,
+        "total_hours": round(finish[chain[-1]], 2),
+        "tasks": [
+            {
+                "id": task_id,
+                "title": tasks[task_id].title,
+                "status": tasks[task_id].status,
+                "due_date": tasks[task_id].due_date,
+                "estimated_hours": tasks[task_id].estimated_hours,
+                "finish_hours": round(finish[task_id], 2),
+            }
+            for task_id in chain
+        ],
+    }
+
+
+def task_ids_with_edges(db: Session, task_ids: Iterable[int]) -> List[int]:
+    task_ids = list(task_ids)
+    return [
+        task_id for task_id, in db.query(TaskDependency.task_id).filter(TaskDependency.task_id.in_(task_ids))
+        .union(db.query(TaskDependency.depends_on_id).filter(TaskDependency.depends_on_id.in_(task_ids)))
+    ]
@@ -0,0 +1,270 @@
+import html
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import groupby
+from string import Template
+from sqlalchemy.orm import Session
+from sqlalchemy import or_, select
+from sqlalchemy.exc import IntegrityError
+from typing import Iterator, List, Optional
+from datetime import date, datetime, time, timedelta
+
+from backend.app import models
+from backend.app.models import Client, DigestDelivery, DigestRun, Task, TaskAssignment, User
+from backend.app.utils import mailer, metrics
+
+logger = logging.getLogger(__name__)
+
+COMPLETED = models.TaskStatus.completed.value
+DIGEST_WORKERS = int(os.getenv("DIGEST_WORKERS", "8"))
+DIGEST_MAX_ITEMS = int(os.getenv("DIGEST_MAX_ITEMS", "25"))   # per section
+NEW_ASSIGNMENT_HOURS = int(os.getenv("DIGEST_NEW_ASSIGNMENT_HOURS", "24"))
+MAX_ATTEMPTS = int(os.getenv("DIGEST_MAX_ATTEMPTS", "3"))
+RECORD_BATCH = 200
+
+SENT = "sent"
+FAILED = "failed"
+
+SECTIONS = (
+    ("overdue", "Overdue"),
+    ("due_today", "Due today"),
+    ("new", "Newly assigned to you"),
+)
+
+DIGESTS_SENT = metrics.register(metrics.Counter(
+    "digests_total", "Daily digests by result (sent/failed).", ("result",)))
+
+
+# ---------------------------------------------------
+# COLLECT (one query for every user)
+# ---------------------------------------------------
+# Every open assignment that is overdue, due today or new in the window
+# before `as_of`, ordered by user, streamed and grouped as it comes.
+# Assignments made after `as_of` (the run's start) are left out, so a
+# resumed or retried run sends what the morning run would have sent.
+# The first run skips users who already have a delivery row for the day;
+# a retry only looks at users whose send failed.
+
+def collect(db: Session, day: date, as_of: datetime, retry: bool = False) -> Iterator[dict]:
+    day_start = datetime.combine(day, time.min)
+    day_end = day_start + timedelta(days=1)
+    since = as_of - timedelta(hours=NEW_ASSIGNMENT_HOURS)
+    delivered = select(DigestDelivery.user_id).where(DigestDelivery.digest_date == day)
+    if retry:
+        to_retry = delivered.where(DigestDelivery.status == FAILED, DigestDelivery.attempts < MAX_ATTEMPTS)
+        recipients = TaskAssignment.user_id.in_(to_retry)
+    else:
+        recipients = TaskAssignment.user_id.notin_(delivered)
+
+    rows = (
+        db.query(
+            User.id, User.email, User.full_name,
+            Task.id, Task.title, Task.due_date, Task.status, Client.name,
+            TaskAssignment.assigned_at,
+        )
+        .select_from(TaskAssignment)
+        .join(Task, Task.id == TaskAssignment.task_id)
+        .join(User, User.id == TaskAssignment.user_id)
+        .outerjoin(Client, Client.id == Task.client_id)
+        .filter(
+            User.is_active.is_(True),
+            or_(Task.status.is_(None), Task.status != COMPLETED),
+            or_(Task.due_date < day_end, TaskAssignment.assigned_at >= since),
+            or_(TaskAssignment.assigned_at.is_(None), TaskAssignment.assigned_at <= as_of),
+            recipients,
+        )
+        .order_by(User.id, Task.due_date, Task.id)
+        .yield_per(1000)
+    )
+
+    for user_id, user_rows in groupby(rows, key=lambda r: r[0]):
+        digest = None
+        seen = set()
+        for _, email, full_name, task_id, title, due_date, status, client_name, assigned_at in user_rows:
+            if digest is None:
+                digest = {"user_id": user_id, "email": email, "name": full_name or email,
+                          **{key: [] for key, _ in SECTIONS}}
+            if task_id in seen:   # assigned twice (assignee + reviewer)
+                continue
+            seen.add(task_id)
+            # One section per task, the most pressing
+            if due_date is not None and due_date < day_start:
+                section = "overdue"
+            elif due_date is not None and due_date < day_end:
+                section = "due_today"
+            else:
+                section = "new"
+            digest[section].append({
+                "id": task_id, "title": title, "due_date": due_date,
+                "status": status, "client": client_name,
+            })
+        yield digest
+
+
+# ---------------------------------------------------
+# RENDER
+# ---------------------------------------------------
+
+TEXT = Template("""Good morning $name,
+
+Your tasks for $day:
+
+$sections
+""")
+
+HTML = Template("""<html><body>
+<p>Good morning $name,</p>
+<p>Your tasks for $day:</p>
+$sections
+</body></html>
+""")
+
+
+def _line(item: dict) -> str:
+    due = f" (due {item['due_date']:%Y-%m-%d})" if item["due_date"] else ""
+    client = f"[{item['client']}] " if item["client"] else ""
+    return f"{client}{item['title']}{due}"
+
+
+def render(digest: dict, day: date):
+    """(subject, text, html) for one user's digest."""
+    text_parts, html_parts = [], []
+    for key, heading in SECTIONS:
+        items = digest[key]
+        if not items:
+            continue
+        shown, hidden = items[:DIGEST_MAX_ITEMS], len(items) - DIGEST_MAX_ITEMS
+        lines = [f"  - {_line(item)}" for item in shown]
+        entries = [f"<li>{html.escape(_line(item))}</li>" for item in shown]
+        if hidden > 0:
+            lines.append(f"  ... and {hidden} more")
+            entries.append(f"<li>... and {hidden} more</li>")
+        text_parts.append(f"{heading} ({len(items)}):\n" + "\n".join(lines))
+        html_parts.append(f"<h3>{html.escape(heading)} ({len(items)})</h3><ul>{''.join(entries)}</ul>")
+
+    counts = ", ".join(f"{len(digest[key])} {heading.lower()}" for key, heading in SECTIONS if digest[key])
+    subject = f"Your tasks for {day:%a %d %b}: {counts}"
+    text = TEXT.substitute(name=digest["name"], day=f"{day:%A %d %B}", sections="\n\n".join(text_parts))
+    markup = HTML.substitute(name=html.escape(digest["name"]), day=f"{day:%A %d %B}", sections="\n".join(html_parts))
+    return subject, text, markup
+
+
+def item_count(digest: dict) -> int:
+    return sum(len(digest[key]) for key, _ in SECTIONS)
+
+
+# ---------------------------------------------------
+# SEND
+# ---------------------------------------------------
+# A day's first run writes its digest_runs row, sends, then marks the row
+# finished; runs after that only retry failed sends (up to MAX_ATTEMPTS).
+# Digests are fed from the collect() stream to a thread pool (the time
+# goes to SMTP round trips) with a bounded number in flight. Outcomes are
+# recorded, a batch per commit, on a second session so the commits don't
+# disturb the stream being read.
+
+def _render_and_send(sender, digest: dict, day: date) -> str:
+    subject, text, markup = render(digest, day)
+    return sender.send(mailer.build_message(digest["email"], subject, text, markup))
+
+
+def _start_run(db: Session, day: date, now: datetime) -> DigestRun:
+    run = db.get(DigestRun, day)
+    if run is None:
+        try:
+            run = DigestRun(digest_date=day, started_at=now)
+            db.add(run)
+            db.commit()
+        except IntegrityError:
+            # Started elsewhere a moment ago
+            db.rollback()
+            run = db.get(DigestRun, day)
+    return run
+
+
+def _write(db: Session, day: date, rows: List[dict]):
+    retried = [row["user_id"] for row in rows if row["attempts"] > 1]
+    if retried:
+        db.query(DigestDelivery).filter(
+            DigestDelivery.digest_date == day,
+            DigestDelivery.user_id.in_(retried),
+            DigestDelivery.status == FAILED,
+        ).delete(synchronize_session=False)
+    db.bulk_insert_mappings(DigestDelivery, rows)
+    db.commit()
+
+
+def _record(db: Session, day: date, rows: List[dict]):
+    if not rows:
+        return
+    try:
+        _write(db, day, rows)
+    except IntegrityError:
+        # Another run got some of these users first: keep ours one by one
+        db.rollback()
+        for row in rows:
+            try:
+                _write(db, day, [row])
+            except IntegrityError:
+                db.rollback()
+    rows.clear()
+
+
+def send_digests(db: Session, day: Optional[date] = None, now: Optional[datetime] = None,
+                 sender=None, workers: Optional[int] = None) -> dict:
+    now = now or datetime.utcnow()
+    day = day or now.date()
+    sender = sender or mailer.get_sender()
+    if sender is None:
+        return {"day": day.isoformat(), "retry": False, "users": 0, "sent": 0, "failed": 0}
+
+    run = _start_run(db, day, now)
+    retry = run.finished_at is not None
+    attempts = {}
+    if retry:
+        attempts = dict(db.query(DigestDelivery.user_id, DigestDelivery.attempts).filter(
+            DigestDelivery.digest_date == day, DigestDelivery.status == FAILED))
+    result = {"day": day.isoformat(), "retry": retry, "users": 0, "sent": 0, "failed": 0}
+    recorder = Session(bind=db.get_bind())
+    pending_rows: List[dict] = []
+
+    def finished(future, digest):
+        message_id, status = None, SENT
+        try:
+            message_id = future.result()
+        except Exception:
+            logger.exception("Digest for user %s failed", digest["user_id"])
+            status = FAILED
+        result[status] += 1
+        DIGESTS_SENT.inc(status)
+        pending_rows.append({
+            "user_id": digest["user_id"], "digest_date": day, "sent_at": datetime.utcnow(),
+            "items": item_count(digest), "sender": sender.name, "message_id": message_id,
+            "status": status, "attempts": attempts.get(digest["user_id"], 0) + 1,
+        })
+        if len(pending_rows) >= RECORD_BATCH:
+            _record(recorder, day, pending_rows)
+
+    workers = workers or DIGEST_WORKERS
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="digest") as pool:
+            in_flight = {}
+            for digest in collect(db, day, run.started_at, retry=retry):
+                result["users"] += 1
+                in_flight[pool.submit(_render_and_send, sender, digest, day)] = digest
+                if len(in_flight) >= workers * 4:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        finished(future, in_flight.pop(future))
+            for future in list(in_flight):
+                finished(future, in_flight.pop(future))
+        _record(recorder, day, pending_rows)
+    finally:
+        sender.close()
+        recorder.close()
+
+    if not retry:
+        run.finished_at = datetime.utcnow()
+        db.commit()
+    return result
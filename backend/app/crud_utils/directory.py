@@ -0,0 +1,124 @@
+import base64
+import json
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, or_, select
+from typing import Optional, Tuple
+from datetime import date, datetime, timedelta
+
+from backend.app import models
+from backend.app.models import ClientAssignment, DashboardRollup, Role, User
+
+COMPLETED = models.TaskStatus.completed.value
+
+
+# ---------------------------------------------------
+# CURSORS
+# ---------------------------------------------------
+# Keyset pagination on (lower(name), id): a page starts strictly after
+# the last row of the previous one, so it is an index-backed seek however
+# deep the page, and concurrent inserts don't shift rows between pages.
+
+class BadCursor(ValueError):
+    pass
+
+
+def encode_cursor(name_key: str, user_id: int) -> str:
+    raw = json.dumps([name_key, user_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        name_key, user_id = json.loads(raw)
+        return str(name_key), int(user_id)
+    except (ValueError, TypeError):
+        raise BadCursor("Invalid cursor")
+
+
+# ---------------------------------------------------
+# DIRECTORY
+# ---------------------------------------------------
+# One statement per page. Task counts come from the per-user counters in
+# dashboard_rollups (scope "user", kept current by every task write) as
+# correlated sums, so each row costs a few primary-key range seeks
+# instead of a scan of the user's tasks.
+
+def _user_rollup(metric: str, *conditions):
+    return (
+        select(func.coalesce(func.sum(DashboardRollup.value), 0))
+        .where(
+            DashboardRollup.scope == "user",
+            DashboardRollup.scope_id == User.id,
+            DashboardRollup.metric == metric,
+            *conditions,
+        )
+        .correlate(User)
+        .scalar_subquery()
+    )
+
+
+def list_directory(
+    db: Session,
+    role_id: Optional[int] = None,
+    is_active: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    today: Optional[date] = None,
+):
+    today = today or datetime.utcnow().date()
+    week_end = today + timedelta(days=6 - today.weekday())  # through Sunday, like the dashboard
+
+    name_key = func.lower(func.coalesce(User.full_name, User.email))
+    open_tasks = _user_rollup("status", DashboardRollup.bucket != COMPLETED)
+    overdue = _user_rollup("due", DashboardRollup.bucket < today.isoformat())
+    due_this_week = _user_rollup(
+        "due",
+        DashboardRollup.bucket >= today.isoformat(),
+        DashboardRollup.bucket <= week_end.isoformat(),
+    )
+    clients = (
+        select(func.count(func.distinct(ClientAssignment.client_id)))
+        .where(ClientAssignment.user_id == User.id)
+        .correlate(User)
+        .scalar_subquery()
+    )
+
+    query = (
+        db.query(
+            User.id, User.email, User.full_name, User.is_active, User.is_admin,
+            Role.id, Role.name, name_key,
+            open_tasks, overdue, due_this_week, clients,
+        )
+        .outerjoin(Role, Role.id == User.role_id)
+    )
+    if role_id is not None:
+        query = query.filter(User.role_id == role_id)
+    if is_active is not None:
+        query = query.filter(User.is_active.is_(is_active))
+    if cursor:
+        after_name, after_id = decode_cursor(cursor)
+        query = query.filter(or_(name_key > after_name, and_(name_key == after_name, User.id > after_id)))
+
+    rows = query.order_by(name_key, User.id).limit(limit + 1).all()
+
+    items = []
+    for (user_id, email, full_name, active, admin, r_id, r_name, _key,
+         open_count, overdue_count, week_count, client_count) in rows[:limit]:
+        items.append({
+            "id": user_id,
+            "email": email,
+            "full_name": full_name,
+            "is_active": bool(active),
+            "is_admin": bool(admin),
+            "role": {"id": r_id, "name": r_name} if r_id is not None else None,
+            "open_tasks": open_count,
+            "overdue_tasks": overdue_count,
+            "due_this_week": week_count,
+            "clients": client_count,
+        })
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(last[7], last[0])
+    return {"items": items, "next_cursor": next_cursor}
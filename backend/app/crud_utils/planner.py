@@ -0,0 +1,236 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, or_
+from typing import Optional, Tuple
+
+from backend.app import models
+from backend.app.models import PlannerEntry, Task, Client, ClientAssignment, User
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+def open_task_filter():
+    return or_(Task.status.is_(None), Task.status != models.TaskStatus.completed.value)
+
+
+def weekday_index(value: Optional[str]) -> int:
+    """Map Client.assigned_weekday ("monday", "Mon", "Monday ") to 0..6.
+    Unknown values fall back to Monday so the client still shows up."""
+    key = (value or "").strip().lower()[:3]
+    for i, name in enumerate(WEEKDAYS):
+        if name.lower().startswith(key) and key:
+            return i
+    return 0
+
+
+# ---------------------------------------------------
+# TASK CONTRIBUTIONS
+# ---------------------------------------------------
+
+def task_contribution(task: Optional[Task]) -> Optional[Tuple[int, int, float]]:
+    """(client_id, open_tasks, hours_due) that a task adds to the planner."""
+    if task is None:
+        return None
+    if (task.status or "new") == models.TaskStatus.completed.value:
+        return (task.client_id, 0, 0.0)
+    return (task.client_id, 1, float(task.estimated_hours or 0.0))
+
+
+def _bump_client(db: Session, client_id: int, d_open: int, d_hours: float):
+    if not d_open and not d_hours:
+        return
+    (
+        db.query(PlannerEntry)
+        .filter(PlannerEntry.client_id == client_id)
+        .update(
+            {
+                PlannerEntry.open_tasks: PlannerEntry.open_tasks + d_open,
+                PlannerEntry.hours_due: PlannerEntry.hours_due + d_hours,
+            },
+            synchronize_session=False,
+        )
+    )
+
+
+def apply_task_change(db: Session, before, after):
+    """Apply the difference between two task_contribution() results.
+    Runs inside the caller's transaction."""
+    if before == after:
+        return
+    if before and after and before[0] == after[0]:
+        _bump_client(db, after[0], after[1] - before[1], after[2] - before[2])
+        return
+    if before:
+        _bump_client(db, before[0], -before[1], -before[2])
+    if after:
+        _bump_client(db, after[0], after[1], after[2])
+
+
+# ---------------------------------------------------
+# ASSIGNMENTS / CLIENTS
+# ---------------------------------------------------
+
+def _client_totals(db: Session, client_id: int):
+    open_tasks, hours_due = (
+        db.query(func.count(Task.id), func.coalesce(func.sum(Task.estimated_hours), 0.0))
+        .filter(
+            Task.client_id == client_id,
+            open_task_filter(),
+        )
+        .one()
+    )
+    return open_tasks or 0, float(hours_due or 0.0)
+
+
+def add_assignment(db: Session, user_id: int, client_id: int):
+    exists = (
+        db.query(PlannerEntry.id)
+        .filter(PlannerEntry.user_id == user_id, PlannerEntry.client_id == client_id)
+        .first()
+    )
+    if exists:
+        return
+
+    client = db.query(Client).filter(Client.id == client_id).first()
+    if not client:
+        return
+
+    # Copy totals from a sibling row when one exists, otherwise aggregate
+    # this single client's open tasks once.
+    sibling = db.query(PlannerEntry).filter(PlannerEntry.client_id == client_id).first()
+    if sibling:
+        open_tasks, hours_due = sibling.open_tasks, sibling.hours_due
+    else:
+        open_tasks, hours_due = _client_totals(db, client_id)
+
+    db.add(PlannerEntry(
+        user_id=user_id,
+        client_id=client_id,
+        weekday=weekday_index(client.assigned_weekday),
+        open_tasks=open_tasks,
+        hours_due=hours_due,
+    ))
+    db.flush()
+
+
+def remove_assignment(db: Session, user_id: int, client_id: int):
+    # ClientAssignment has no unique constraint; keep the row while any
+    # duplicate assignment for the pair remains.
+    remaining = (
+        db.query(ClientAssignment.id)
+        .filter(ClientAssignment.user_id == user_id, ClientAssignment.client_id == client_id)
+        .first()
+    )
+    if remaining:
+        return
+    db.query(PlannerEntry).filter(
+        PlannerEntry.user_id == user_id,
+        PlannerEntry.client_id == client_id,
+    ).delete(synchronize_session=False)
+
+
+def set_client_weekday(db: Session, client_id: int, assigned_weekday: str):
+    db.query(PlannerEntry).filter(PlannerEntry.client_id == client_id).update(
+        {PlannerEntry.weekday: weekday_index(assigned_weekday)},
+        synchronize_session=False,
+    )
+
+
+# ---------------------------------------------------
+# REBUILD (repairs drift / initial population)
+# ---------------------------------------------------
+
+def rebuild_planner(db: Session) -> int:
+    totals = {
+        client_id: (count, float(hours or 0.0))
+        for client_id, count, hours in (
+            db.query(
+                Task.client_id,
+                func.count(Task.id),
+                func.coalesce(func.sum(Task.estimated_hours), 0.0),
+            )
+            .filter(open_task_filter())
+            .group_by(Task.client_id)
+        )
+    }
+
+    pairs = (
+        db.query(ClientAssignment.user_id, ClientAssignment.client_id, Client.assigned_weekday)
+        .join(Client, Client.id == ClientAssignment.client_id)
+        .filter(ClientAssignment.user_id.isnot(None))
+        .distinct()
+        .all()
+    )
+
+    rows = []
+    for user_id, client_id, assigned_weekday in pairs:
+        open_tasks, hours_due = totals.get(client_id, (0, 0.0))
+        rows.append({
+            "user_id": user_id,
+            "client_id": client_id,
+            "weekday": weekday_index(assigned_weekday),
+            "open_tasks": open_tasks,
+            "hours_due": hours_due,
+        })
+
+    db.query(PlannerEntry).delete(synchronize_session=False)
+    if rows:
+        db.bulk_insert_mappings(PlannerEntry, rows)
+    db.commit()
+    return len(rows)
+
+
+# ---------------------------------------------------
+# READ
+# ---------------------------------------------------
+
+def get_week(db: Session, user_id: Optional[int] = None, visible=None):
+    """visible (crud_utils.visibility) drops rows for clients the user
+    can't see: open_tasks/hours_due are counts of those clients' tasks."""
+    query = (
+        db.query(
+            PlannerEntry.user_id,
+            User.full_name,
+            User.email,
+            PlannerEntry.weekday,
+            PlannerEntry.client_id,
+            Client.name,
+            PlannerEntry.open_tasks,
+            PlannerEntry.hours_due,
+        )
+        .join(User, User.id == PlannerEntry.user_id)
+        .join(Client, Client.id == PlannerEntry.client_id)
+    )
+    if user_id:
+        query = query.filter(PlannerEntry.user_id == user_id)
+    if visible is not None and not visible.everything:
+        query = query.filter(PlannerEntry.client_id.in_(sorted(visible.client_ids)))
+
+    query = query.order_by(PlannerEntry.user_id, PlannerEntry.weekday, Client.name)
+
+    users = []
+    current_user = None
+    current_day = None
+    for uid, full_name, email, weekday, client_id, client_name, open_tasks, hours_due in query:
+        if current_user is None or current_user["user_id"] != uid:
+            current_user = {"user_id": uid, "full_name": full_name, "email": email, "days": []}
+            users.append(current_user)
+            current_day = None
+        if current_day is None or current_day["weekday_index"] != weekday:
+            current_day = {
+                "weekday": WEEKDAYS[weekday],
+                "weekday_index": weekday,
+                "open_tasks": 0,
+                "hours_due": 0.0,
+                "clients": [],
+            }
+            current_user["days"].append(current_day)
+        current_day["clients"].append({
+            "client_id": client_id,
+            "client_name": client_name,
+            "open_tasks": open_tasks,
+            "hours_due": hours_due,
+        })
+        current_day["open_tasks"] += open_tasks
+        current_day["hours_due"] += hours_due
+
+    return users
@@ -0,0 +1,145 @@
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import bindparam, exists, update
+from typing import Optional
+from datetime import datetime
+
+from backend.app import models
+from backend.app.models import Task, TaskAssignment
+from backend.app.utils import result_cache
+
+# Score bands (higher = work on it sooner). Overdue always outranks due,
+# due always outranks undated; billable work gets a nudge within a band.
+NO_DUE_DATE_SCORE = 100
+DUE_TODAY_SCORE = 900
+DUE_FLOOR_SCORE = 200
+DUE_STEP_PER_DAY = 20
+OVERDUE_BASE_SCORE = 1000
+OVERDUE_STEP_PER_DAY = 10
+OVERDUE_MAX_DAYS = 30
+BILLABLE_BONUS = 50
+
+
+def compute_score(status: Optional[str], due_date: Optional[datetime], billable: bool, now: Optional[datetime] = None):
+    if (status or "new") == models.TaskStatus.completed.value:
+        return None
+
+    now = now or datetime.utcnow()
+    if due_date is None:
+        score = NO_DUE_DATE_SCORE
+    else:
+        days = (due_date.date() - now.date()).days
+        if days < 0:
+            score = OVERDUE_BASE_SCORE + min(-days, OVERDUE_MAX_DAYS) * OVERDUE_STEP_PER_DAY
+        else:
+            score = max(DUE_TODAY_SCORE - days * DUE_STEP_PER_DAY, DUE_FLOOR_SCORE)
+
+    if billable:
+        score += BILLABLE_BONUS
+    return score
+
+
+# ---------------------------------------------------
+# WRITE PATH
+# ---------------------------------------------------
+
+def refresh_task(db: Session, task: Task, now: Optional[datetime] = None):
+    """Recompute one task's score and push it to its assignment rows.
+    Runs inside the caller's transaction."""
+    score = compute_score(task.status, task.due_date, task.billable, now)
+    if score == task.priority_score:
+        return
+    task.priority_score = score
+    db.query(TaskAssignment).filter(TaskAssignment.task_id == task.id).update(
+        {TaskAssignment.priority_score: score},
+        synchronize_session=False,
+    )
+
+
+# ---------------------------------------------------
+# PERIODIC SWEEP
+# ---------------------------------------------------
+
+def _write_scores(db: Session, rows):
+    """Executemany UPDATE of tasks and their assignment copies."""
+    if not rows:
+        return
+    tasks = Task.__table__
+    assignments = TaskAssignment.__table__
+    db.execute(
+        update(tasks)
+        .where(tasks.c.id == bindparam("b_id"))
+        .values(priority_score=bindparam("b_score")),
+        rows,
+    )
+    db.execute(
+        update(assignments)
+        .where(assignments.c.task_id == bindparam("b_id"))
+        .values(priority_score=bindparam("b_score")),
+        rows,
+    )
+
+
+def sweep(db: Session, now: Optional[datetime] = None) -> int:
+    """Re-score open tasks whose score drifted because the date moved on.
+    Only rows whose score actually changes are written."""
+    now = now or datetime.utcnow()
+
+    changed = []
+    rows = (
+        db.query(Task.id, Task.status, Task.due_date, Task.billable, Task.priority_score)
+        .filter(Task.priority_score.isnot(None))
+    )
+    for task_id, status, due_date, billable, current in rows:
+        score = compute_score(status, due_date, billable, now)
+        if score != current:
+            changed.append({"b_id": task_id, "b_score": score})
+
+    _write_scores(db, changed)
+    if changed:
+        result_cache.invalidate_on_commit(db, everything=True)
+    db.commit()
+    return len(changed)
+
+
+def rebuild_scores(db: Session) -> int:
+    """Score every task from scratch (new column, imported data, drift)."""
+    now = datetime.utcnow()
+    rows = [
+        {"b_id": task_id, "b_score": compute_score(status, due_date, billable, now)}
+        for task_id, status, due_date, billable in db.query(
+            Task.id, Task.status, Task.due_date, Task.billable
+        )
+    ]
+    _write_scores(db, rows)
+    result_cache.invalidate_on_commit(db, everything=True)
+    db.commit()
+    return len(rows)
+
+
+# ---------------------------------------------------
+# INBOX
+# ---------------------------------------------------
+
+def inbox(db: Session, user_id: int, limit: int = 20):
+    # Walks ix_task_assignments_user_priority backwards; the trailing
+    # TaskAssignment.id keeps the order stable without leaving the index.
+    # A user holding two roles on the same task gets it once: only their
+    # newest assignment row for a task counts, decided in SQL so a page
+    # still holds `limit` distinct tasks.
+    newer = aliased(TaskAssignment)
+    return (
+        db.query(Task)
+        .join(TaskAssignment, TaskAssignment.task_id == Task.id)
+        .filter(
+            TaskAssignment.user_id == user_id,
+            TaskAssignment.priority_score.isnot(None),
+            ~exists().where(
+                newer.task_id == TaskAssignment.task_id,
+                newer.user_id == TaskAssignment.user_id,
+                newer.id > TaskAssignment.id,
+            ),
+        )
+        .order_by(TaskAssignment.priority_score.desc(), TaskAssignment.id.desc())
+        .limit(limit)
+        .all()
+    )
@@ -0,0 +1,68 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import or_
+from typing import Optional
+from datetime import datetime
+
+from backend.app.models import RecurringTask
+from backend.app.crud_utils import visibility
+from backend.app.schemas.recurrence import RecurringTaskCreate, RecurringTaskUpdate
+
+# ---------------------------------------------------
+# RECURRING TASK DEFINITIONS
+# ---------------------------------------------------
+
+def create_recurring_task(db: Session, data: RecurringTaskCreate, creator_id: int):
+    definition = RecurringTask(**data.dict(), created_by=creator_id)
+    db.add(definition)
+    db.commit()
+    db.refresh(definition)
+    return definition
+
+
+def get_recurring_task(db: Session, recurring_id: int):
+    return db.query(RecurringTask).filter(RecurringTask.id == recurring_id).first()
+
+
+def list_recurring_tasks(db: Session, client_id: Optional[int] = None, visible=None):
+    query = db.query(RecurringTask)
+    if client_id:
+        query = query.filter(RecurringTask.client_id == client_id)
+    return visibility.filter_recurring(query, visible).order_by(RecurringTask.id).all()
+
+
+def update_recurring_task(db: Session, recurring_id: int, data: RecurringTaskUpdate):
+    definition = get_recurring_task(db, recurring_id)
+    if not definition:
+        return None
+    for field, value in data.dict(exclude_unset=True).items():
+        setattr(definition, field, value)
+    db.commit()
+    db.refresh(definition)
+    return definition
+
+
+def delete_recurring_task(db: Session, recurring_id: int):
+    definition = get_recurring_task(db, recurring_id)
+    if not definition:
+        return False
+    db.delete(definition)
+    db.commit()
+    return True
+
+
+def definitions_in_window(
+    db: Session,
+    start: datetime,
+    end: datetime,
+    user_id: Optional[int] = None,
+    visible=None,
+):
+    """Active definitions whose schedule can overlap [start, end]."""
+    query = db.query(RecurringTask).filter(
+        RecurringTask.active.is_(True),
+        RecurringTask.start_date <= end,
+        or_(RecurringTask.until.is_(None), RecurringTask.until >= start),
+    )
+    if user_id:
+        query = query.filter(RecurringTask.assigned_user_id == user_id)
+    return visibility.filter_recurring(query, visible).all()
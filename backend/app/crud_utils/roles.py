@@ -0,0 +1,123 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, tuple_
+from typing import Dict, Iterable, List, Set, Tuple
+
+from backend.app.models import Permission, Role, RolePermission
+from backend.app.crud_utils import visibility
+
+
+class UnknownIds(Exception):
+    """A matrix change names roles or permissions that don't exist."""
+
+    def __init__(self, roles: Iterable[int] = (), permissions: Iterable[int] = ()):
+        self.roles = sorted(roles)
+        self.permissions = sorted(permissions)
+        parts = []
+        if self.roles:
+            parts.append(f"unknown role ids {self.roles}")
+        if self.permissions:
+            parts.append(f"unknown permission ids {self.permissions}")
+        super().__init__("; ".join(parts))
+
+
+# ---------------------------------------------------
+# READS
+# ---------------------------------------------------
+# Roles, permissions and grants are three flat queries joined in Python,
+# whatever the number of roles (the ORM relationships load lazily, one
+# role and one grant at a time).
+
+def granted(db: Session, role_ids: Iterable[int] = None) -> Dict[int, Set[int]]:
+    """role id -> granted permission ids."""
+    query = db.query(RolePermission.role_id, RolePermission.permission_id)
+    if role_ids is not None:
+        query = query.filter(RolePermission.role_id.in_(list(role_ids)))
+    grants: Dict[int, Set[int]] = {}
+    for role_id, permission_id in query:
+        grants.setdefault(role_id, set()).add(permission_id)
+    return grants
+
+
+def roles_with_permissions(db: Session, role_ids: Iterable[int] = None) -> List[dict]:
+    """Roles with their permission objects, shaped like RoleOut."""
+    roles = db.query(Role.id, Role.name).order_by(Role.id)
+    if role_ids is not None:
+        role_ids = list(role_ids)
+        roles = roles.filter(Role.id.in_(role_ids))
+    permissions = {
+        p.id: {"id": p.id, "name": p.name, "description": p.description}
+        for p in db.query(Permission.id, Permission.name, Permission.description)
+    }
+    grants = granted(db, role_ids)
+    return [
+        {
+            "id": role_id,
+            "name": name,
+            "permissions": [permissions[p] for p in sorted(grants.get(role_id, ())) if p in permissions],
+        }
+        for role_id, name in roles
+    ]
+
+
+def permission_matrix(db: Session) -> dict:
+    """Every permission once, and each role as the ids it is granted."""
+    permissions = [
+        {"id": p.id, "name": p.name, "description": p.description}
+        for p in db.query(Permission.id, Permission.name, Permission.description).order_by(Permission.id)
+    ]
+    grants = granted(db)
+    roles = [
+        {"id": role_id, "name": name, "permission_ids": sorted(grants.get(role_id, ()))}
+        for role_id, name in db.query(Role.id, Role.name).order_by(Role.id)
+    ]
+    return {"permissions": permissions, "roles": roles}
+
+
+# ---------------------------------------------------
+# WRITES
+# ---------------------------------------------------
+
+def _check_ids(db: Session, role_ids: Set[int], permission_ids: Set[int]):
+    known_roles = {r for (r,) in db.query(Role.id).filter(Role.id.in_(role_ids))} if role_ids else set()
+    known_permissions = (
+        {p for (p,) in db.query(Permission.id).filter(Permission.id.in_(permission_ids))}
+        if permission_ids else set()
+    )
+    if role_ids - known_roles or permission_ids - known_permissions:
+        raise UnknownIds(role_ids - known_roles, permission_ids - known_permissions)
+
+
+def apply_grants(db: Session, grant: Iterable[Tuple[int, int]], revoke: Iterable[Tuple[int, int]]) -> dict:
+    """Grant and revoke (role_id, permission_id) pairs with one INSERT and
+    one DELETE. Pairs already in the wanted state are skipped, so applying
+    the same diff twice is a no-op. The caller commits."""
+    grant, revoke = set(grant), set(revoke)
+    pairs = grant | revoke
+    if not pairs:
+        return {"granted": 0, "revoked": 0}
+    _check_ids(db, {r for r, _ in pairs}, {p for _, p in pairs})
+
+    existing = {
+        (role_id, permission_id)
+        for role_id, permissions in granted(db, {r for r, _ in pairs}).items()
+        for permission_id in permissions
+    }
+    to_insert = sorted(grant - existing)
+    to_delete = sorted(revoke & existing)
+
+    if to_insert:
+        db.execute(
+            insert(RolePermission),
+            [{"role_id": r, "permission_id": p} for r, p in to_insert],
+        )
+    if to_delete:
+        db.query(RolePermission).filter(
+            tuple_(RolePermission.role_id, RolePermission.permission_id).in_(to_delete)
+        ).delete(synchronize_session=False)
+    if to_insert or to_delete:
+        # Loaded Role.permissions collections are now stale (flush first so
+        # pending changes on other objects aren't discarded by the expire)
+        db.flush()
+        db.expire_all()
+        visibility.invalidate_on_commit(db)   # who sees every task may have changed
+    return {"granted": len(to_insert), "revoked": len(to_delete)}
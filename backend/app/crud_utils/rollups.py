@@ -0,0 +1,192 @@
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, func, or_
+from typing import Iterable, Optional, Sequence
+from datetime import date, datetime, timedelta
+from collections import Counter
+
+from backend.app import models
+from backend.app.models import DashboardRollup, Task
+from backend.app.crud_utils import archive
+
+ROLLUP_KEY = ("scope", "scope_id", "metric", "bucket")
+
+
+# ---------------------------------------------------
+# COUNTER UPSERTS (shared by every rollup table)
+# ---------------------------------------------------
+
+def add_counts(db: Session, model, key_columns: Sequence[str], value_columns: Sequence[str], rows):
+    """Add each row's value columns onto the row with the same key,
+    inserting it when missing. One executemany round trip on SQLite and
+    Postgres; other dialects fall back to UPDATE-then-INSERT."""
+    if not rows:
+        return
+    table = model.__table__
+    dialect = db.get_bind().dialect.name
+
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={col: table.c[col] + stmt.excluded[col] for col in value_columns},
+        )
+        db.execute(stmt, rows)
+        return
+
+    for row in rows:
+        where = and_(*(table.c[col] == row[col] for col in key_columns))
+        result = db.execute(
+            table.update()
+            .where(where)
+            .values({col: table.c[col] + row[col] for col in value_columns})
+        )
+        if result.rowcount == 0:
+            db.execute(table.insert().values(**row))
+
+
+# ---------------------------------------------------
+# TASK CONTRIBUTIONS
+# ---------------------------------------------------
+
+def task_keys(task: Optional[Task]) -> Counter:
+    """Every rollup counter a task contributes to, with its amount."""
+    keys = Counter()
+    if task is None:
+        return keys
+
+    status = task.status or models.TaskStatus.new.value
+    is_completed = status == models.TaskStatus.completed.value
+
+    metrics = Counter()
+    metrics[("status", status)] += 1
+    if not is_completed and task.due_date:
+        metrics[("due", task.due_date.date().isoformat())] += 1
+    if is_completed and task.completed_at:
+        metrics[("completed", task.completed_at.strftime("%Y-%m"))] += 1
+    for subtask in task.subtasks:
+        metrics[("subtasks", "completed" if subtask.completed else "open")] += 1
+
+    scopes = [("all", 0), ("client", task.client_id)]
+    scopes += [("user", user_id) for user_id in sorted({a.user_id for a in task.assignments})]
+
+    for scope, scope_id in scopes:
+        for (metric, bucket), amount in metrics.items():
+            keys[(scope, scope_id, metric, bucket)] += amount
+    return keys
+
+
+def apply_task_change(db: Session, before: Optional[Counter], after: Optional[Counter]):
+    """Write the difference between two task_keys() results.
+    Runs inside the caller's transaction."""
+    delta = Counter(after or {})
+    delta.subtract(before or {})
+
+    rows = [
+        {"scope": k[0], "scope_id": k[1], "metric": k[2], "bucket": k[3], "value": v}
+        for k, v in delta.items()
+        if v
+    ]
+    add_counts(db, DashboardRollup, ROLLUP_KEY, ("value",), rows)
+
+    # Drop counters that fell to zero so date buckets don't pile up.
+    emptied = [r for r in rows if r["value"] < 0]
+    if emptied:
+        db.query(DashboardRollup).filter(
+            DashboardRollup.value <= 0,
+            or_(*(
+                and_(
+                    DashboardRollup.scope == r["scope"],
+                    DashboardRollup.scope_id == r["scope_id"],
+                    DashboardRollup.metric == r["metric"],
+                    DashboardRollup.bucket == r["bucket"],
+                )
+                for r in emptied
+            )),
+        ).delete(synchronize_session=False)
+
+
+# ---------------------------------------------------
+# REBUILD (repairs drift)
+# ---------------------------------------------------
+
+def rebuild_rollups(db: Session, batch_size: int = 1000) -> int:
+    totals = Counter()
+    tasks = (
+        db.query(Task)
+        .options(selectinload(Task.subtasks), selectinload(Task.assignments))
+        .order_by(Task.id)
+        .yield_per(batch_size)
+    )
+    for task in tasks:
+        totals.update(task_keys(task))
+    totals.update(archive.rollup_keys(db, batch_size))  # archived tasks still count
+
+    db.query(DashboardRollup).delete(synchronize_session=False)
+    rows = [
+        {"scope": k[0], "scope_id": k[1], "metric": k[2], "bucket": k[3], "value": v}
+        for k, v in totals.items()
+        if v
+    ]
+    if rows:
+        db.bulk_insert_mappings(DashboardRollup, rows)
+    db.commit()
+    return len(rows)
+
+
+# ---------------------------------------------------
+# READ
+# ---------------------------------------------------
+
+def summary(db: Session, scope: str = "all", scope_id: int = 0, today: Optional[date] = None,
+            scope_ids: Optional[Iterable[int]] = None):
+    """Counts for one scope row set. scope_ids adds up several scopes of
+    the same kind instead (a user's visible clients); scope_id is then 0."""
+    today = today or datetime.utcnow().date()
+    week_end = today + timedelta(days=6 - today.weekday())  # through Sunday
+    month = today.strftime("%Y-%m")
+
+    ids = [scope_id] if scope_ids is None else sorted(scope_ids)
+    base = db.query(DashboardRollup).filter(
+        DashboardRollup.scope == scope,
+        DashboardRollup.scope_id.in_(ids),
+    )
+
+    by_status = {}
+    subtasks = {"open": 0, "completed": 0}
+    completed_this_month = 0
+    for row in base.filter(DashboardRollup.metric.in_(("status", "subtasks", "completed"))).filter(
+        or_(DashboardRollup.metric != "completed", DashboardRollup.bucket == month)
+    ):
+        if row.metric == "status":
+            by_status[row.bucket] = by_status.get(row.bucket, 0) + row.value
+        elif row.metric == "subtasks":
+            subtasks[row.bucket] = subtasks.get(row.bucket, 0) + row.value
+        else:
+            completed_this_month += row.value
+
+    due_sum = func.coalesce(func.sum(DashboardRollup.value), 0)
+    due = base.filter(DashboardRollup.metric == "due")
+    overdue = due.filter(DashboardRollup.bucket < today.isoformat()).with_entities(due_sum).scalar()
+    due_this_week = (
+        due.filter(
+            DashboardRollup.bucket >= today.isoformat(),
+            DashboardRollup.bucket <= week_end.isoformat(),
+        )
+        .with_entities(due_sum)
+        .scalar()
+    )
+
+    return {
+        "scope": scope if scope_ids is None else scope + "s",
+        "scope_id": scope_id if scope_ids is None else 0,
+        "by_status": by_status,
+        "total": sum(by_status.values()),
+        "overdue": overdue or 0,
+        "due_this_week": due_this_week or 0,
+        "completed_this_month": completed_this_month,
+        "subtasks": subtasks,
+    }
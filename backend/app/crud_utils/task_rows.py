@@ -0,0 +1,165 @@
+from sqlalchemy.orm import Session, Query
+from collections import defaultdict
+from typing import Dict, List
+
+from backend.app.models import Task, Subtask, TaskAssignment, Tag, TaskTag, Attachment
+
+# ---------------------------------------------------
+# FAST ROW -> DICT PATH
+# ---------------------------------------------------
+# Builds TaskOut-shaped dicts straight from column tuples. Children are
+# fetched with one query per collection, reusing the task query as an
+# IN (subquery), so the cost is 5 queries no matter how many tasks match.
+# The rows come from our own tables, so there is no per-object pydantic
+# validation; keep the keys here in step with schemas.tasks.TaskOut.
+
+TASK_COLUMNS = (
+    Task.title,
+    Task.description,
+    Task.due_date,
+    Task.billable,
+    Task.estimated_hours,
+    Task.status,
+    Task.id,
+    Task.client_id,
+    Task.created_by,
+    Task.created_at,
+    Task.updated_at,
+    Task.priority_score,
+    Task.version,
+)
+
+
+def _children(db: Session, id_subquery):
+    subtasks: Dict[int, List[dict]] = defaultdict(list)
+    assignments: Dict[int, List[dict]] = defaultdict(list)
+    tags: Dict[int, List[dict]] = defaultdict(list)
+
+    for title, completed, sid, task_id, created_at, updated_at in (
+        db.query(Subtask.title, Subtask.completed, Subtask.id, Subtask.task_id,
+                 Subtask.created_at, Subtask.updated_at)
+        .filter(Subtask.task_id.in_(id_subquery))
+        .order_by(Subtask.id)
+    ):
+        subtasks[task_id].append({
+            "title": title,
+            "completed": bool(completed),
+            "id": sid,
+            "task_id": task_id,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        })
+
+    for user_id, role, aid, task_id in (
+        db.query(TaskAssignment.user_id, TaskAssignment.role, TaskAssignment.id, TaskAssignment.task_id)
+        .filter(TaskAssignment.task_id.in_(id_subquery))
+        .order_by(TaskAssignment.id)
+    ):
+        assignments[task_id].append({"user_id": user_id, "role": role, "id": aid})
+
+    for task_id, tag_id, name in (
+        db.query(TaskTag.task_id, Tag.id, Tag.name)
+        .join(Tag, Tag.id == TaskTag.tag_id)
+        .filter(TaskTag.task_id.in_(id_subquery))
+        .order_by(Tag.id)
+    ):
+        tags[task_id].append({"id": tag_id, "name": name})
+
+    attachments = attachment_dicts(db, id_subquery)
+    return subtasks, assignments, tags, attachments
+
+
+def attachment_dicts(db: Session, task_ids) -> Dict[int, List[dict]]:
+    """AttachmentOut-shaped dicts per task id (task_ids: list or subquery)."""
+    attachments: Dict[int, List[dict]] = defaultdict(list)
+    for aid, task_id, filename, content_type, size, sha256, uploaded_by, created_at in (
+        db.query(Attachment.id, Attachment.task_id, Attachment.filename, Attachment.content_type,
+                 Attachment.size, Attachment.sha256, Attachment.uploaded_by, Attachment.created_at)
+        .filter(Attachment.task_id.in_(task_ids))
+        .order_by(Attachment.id)
+    ):
+        attachments[task_id].append({
+            "id": aid,
+            "task_id": task_id,
+            "filename": filename,
+            "content_type": content_type,
+            "size": size,
+            "sha256": sha256,
+            "uploaded_by": uploaded_by,
+            "created_at": created_at,
+        })
+    return attachments
+
+
+def task_dicts(db: Session, query: Query) -> List[dict]:
+    """TaskOut-shaped dicts for every task the (filtered, sorted) query returns."""
+    rows = query.with_entities(*TASK_COLUMNS).all()
+    if not rows:
+        return []
+
+    id_subquery = query.with_entities(Task.id).order_by(None).scalar_subquery()
+    subtasks, assignments, tags, attachments = _children(db, id_subquery)
+
+    return [
+        {
+            "title": title,
+            "description": description,
+            "due_date": due_date,
+            "billable": bool(billable),
+            "estimated_hours": estimated_hours,
+            "status": status,
+            "id": task_id,
+            "client_id": client_id,
+            "created_by": created_by,
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "priority_score": priority_score,
+            "version": version or 1,
+            "archived": False,
+            "subtasks": subtasks.get(task_id, []),
+            "assignments": assignments.get(task_id, []),
+            "tags": tags.get(task_id, []),
+            "attachments": attachments.get(task_id, []),
+        }
+        for (title, description, due_date, billable, estimated_hours, status, task_id,
+             client_id, created_by, created_at, updated_at, priority_score, version) in rows
+    ]
+
+
+# ---------------------------------------------------
+# CSV EXPORT
+# ---------------------------------------------------
+
+EXPORT_HEADER = (
+    "id", "client_id", "title", "status", "due_date", "billable", "estimated_hours",
+    "created_by", "created_at", "updated_at", "completed_at", "assignees", "tags",
+)
+
+
+def export_rows(db: Session, query: Query, batch_size: int = 1000):
+    """Yield export tuples in batches without materialising ORM objects."""
+    id_subquery = query.with_entities(Task.id).order_by(None).scalar_subquery()
+
+    assignees: Dict[int, List[str]] = defaultdict(list)
+    for task_id, user_id in (
+        db.query(TaskAssignment.task_id, TaskAssignment.user_id)
+        .filter(TaskAssignment.task_id.in_(id_subquery))
+        .order_by(TaskAssignment.id)
+    ):
+        assignees[task_id].append(str(user_id))
+
+    tag_names: Dict[int, List[str]] = defaultdict(list)
+    for task_id, name in (
+        db.query(TaskTag.task_id, Tag.name)
+        .join(Tag, Tag.id == TaskTag.tag_id)
+        .filter(TaskTag.task_id.in_(id_subquery))
+        .order_by(Tag.id)
+    ):
+        tag_names[task_id].append(name)
+
+    rows = query.with_entities(
+        Task.id, Task.client_id, Task.title, Task.status, Task.due_date, Task.billable,
+        Task.estimated_hours, Task.created_by, Task.created_at, Task.updated_at, Task.completed_at,
+    ).yield_per(batch_size)
+    for row in rows:
+        yield tuple(row) + (";".join(assignees.get(row.id, ())), ";".join(tag_names.get(row.id, ())))
@@ -1,3 +1,5 @@
+import heapq
+from collections import Counter
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from datetime import datetime
@@ -9,12 +11,123 @@ from backend.app.schemas.tasks import (
     TaskCreate, TaskUpdate, SubtaskCreate
 )
 from backend.app.models import TaskTag
+from backend.app.crud_utils import planner, priority, rollups, changelog, task_rows, archive, dependencies, views, autocomplete, workload, visibility
+from backend.app.utils import events, fastjson, result_cache
+
+# ---------------------------------------------------
+# DERIVED TABLES
+# ---------------------------------------------------
+# Every write path snapshots the task before mutating it and hands the
+# before/after pair to _sync_derived, which applies the deltas (and the
+# change-log entries) inside the same transaction.
+
+def _snapshot(task):
+    if task is None:
+        return None
+    return {
+        "id": task.id,
+        "client_id": task.client_id,
+        "planner": planner.task_contribution(task),
+        "rollups": rollups.task_keys(task),
+        "children": changelog.child_ids(task),
+        "usage": autocomplete.task_usage(task),
+        "load": workload.task_load(task),
+    }
+
+
+def _sync_derived(db: Session, before, task, touched=()):
+    after = _snapshot(task)
+    ref = after or before
+    changelog.record_task_change(
+        db,
+        ref["id"],
+        ref["client_id"],
+        before["children"] if before else None,
+        after["children"] if after else None,
+        touched=touched,
+    )
+    planner.apply_task_change(
+        db,
+        before["planner"] if before else None,
+        after["planner"] if after else None,
+    )
+    rollups.apply_task_change(
+        db,
+        before["rollups"] if before else None,
+        after["rollups"] if after else None,
+    )
+    views.apply_task_change(db, ref["id"], task)
+    autocomplete.apply_task_change(
+        db,
+        before["usage"] if before else None,
+        after["usage"] if after else None,
+    )
+    workload.apply_task_change(
+        db,
+        before["load"] if before else None,
+        after["load"] if after else None,
+    )
+    if before and after and before["client_id"] != after["client_id"]:
+        # _emit invalidates the new client's cached lists; this is the old one's
+        result_cache.invalidate_on_commit(db, [before["client_id"]])
+    if task is not None:
+        priority.refresh_task(db, task)
+
+
+def _emit(db: Session, event_type: str, task, fields, also_notify=()):
+    """Bump the task version, queue a push event and invalidate the
+    client's cached list results for after commit. also_notify adds users
+    who should hear about it even though they are no longer assigned (e.g.
+    the one just removed)."""
+    if event_type == "task.deleted":
+        version = (task.version or 1) + 1
+    elif event_type == "task.created":
+        version = task.version or 1
+    else:
+        task.version = version = (task.version or 1) + 1
+
+    assignees = [a.user_id for a in task.assignments] + list(also_notify)
+    events.publish_on_commit(
+        db,
+        events.task_event(event_type, task.id, task.client_id, assignees, fields, version),
+    )
+    result_cache.invalidate_on_commit(db, [task.client_id])
+
+
+def _track_completion(task):
+    """Stamp/clear completed_at as the status crosses "completed"."""
+    if task.status == models.TaskStatus.completed.value:
+        if task.completed_at is None:
+            task.completed_at = datetime.utcnow()
+    else:
+        task.completed_at = None
+
 
 # ---------------------------------------------------
 # CREATE TASK
 # ---------------------------------------------------
 
 def create_task(db: Session, data: TaskCreate, creator_id: int):
+    new_task = _insert_task(db, data, creator_id)
+    db.commit()
+    db.refresh(new_task)
+    return new_task
+
+
+def create_tasks(db: Session, items: List[TaskCreate], creator_id: int):
+    """Bulk create in one transaction. Auto-assigned tasks are spread
+    across users as they go: load handed out earlier in the batch counts
+    (the load index only sees it on commit)."""
+    pending = Counter()
+    tag_cache = {}
+    created = [_insert_task(db, data, creator_id, pending, tag_cache) for data in items]
+    db.commit()
+    for task in created:
+        db.refresh(task)
+    return created
+
+
+def _insert_task(db: Session, data: TaskCreate, creator_id: int, pending: Counter = None, tag_cache: dict = None):
     # 1. Create the base task and persist to get an ID
     new_task = models.Task(
         title=data.title,
@@ -22,26 +135,37 @@ def create_task(db: Session, data: TaskCreate, creator_id: int):
         client_id=data.client_id,
         due_date=data.due_date,
         billable=data.billable,
+        estimated_hours=data.estimated_hours,
         status=data.status or "new",
         created_by=creator_id
     )
+    _track_completion(new_task)
 
     db.add(new_task)
-    db.commit()
-    db.refresh(new_task)
+    db.flush()  # assigns new_task.id without ending the transaction
 
     # 2. Attach tags (create tags if they don't exist)
+    tag_cache = {} if tag_cache is None else tag_cache
     if getattr(data, "tags", None):
         for tag_name in data.tags:
-            tag = db.query(models.Tag).filter(models.Tag.name == tag_name).first()
+            tag = tag_cache.get(tag_name) or db.query(models.Tag).filter(models.Tag.name == tag_name).first()
             if not tag:
                 tag = models.Tag(name=tag_name)
                 db.add(tag)
                 db.flush()  # ensure tag.id exists
+                changelog.record(db, "tag", tag.id, changelog.UPSERT)
+            tag_cache[tag_name] = tag
             new_task.tags.append(tag)
 
-    # 3. Assign Users
-    for user_id in data.assigned_users or []:
+    # 3. Assign Users (auto_assign: the least-loaded member of the client)
+    assigned_users = list(data.assigned_users or [])
+    if not assigned_users and data.auto_assign:
+        pending = Counter() if pending is None else pending
+        user_id = workload.pick_assignee(db, data.client_id, pending)
+        if user_id is not None:
+            assigned_users = [user_id]
+            pending[user_id] += workload.task_weight(new_task.due_date)
+    for user_id in assigned_users:
         assignment = models.TaskAssignment(
             task_id=new_task.id,
             user_id=user_id,
@@ -58,9 +182,9 @@ def create_task(db: Session, data: TaskCreate, creator_id: int):
         )
         db.add(subtask)
 
-    db.commit()
-    db.refresh(new_task)
-
+    db.flush()
+    _sync_derived(db, None, new_task)
+    _emit(db, "task.created", new_task, data.dict(exclude_unset=True).keys())
     return new_task
 
 
@@ -72,7 +196,11 @@ def get_task(db: Session, task_id: int):
     return db.query(models.Task).filter(models.Task.id == task_id).first()
 
 
-def list_tasks(
+def get_subtask(db: Session, subtask_id: int):
+    return db.query(models.Subtask).filter(models.Subtask.id == subtask_id).first()
+
+
+def _filtered_query(
     db: Session,
     statuses: Optional[str] = None,
     client_id: Optional[int] = None,
@@ -84,8 +212,9 @@ def list_tasks(
     search: Optional[str] = None,
     sort_by: Optional[str] = "created_at",
     sort_dir: Optional[str] = "desc",
+    visible: Optional[visibility.Visibility] = None,
 ):
-    query = db.query(Task)
+    query = visibility.filter_tasks(db.query(Task), visible)
 
     # ---- FILTERING ----
     if statuses:
@@ -105,14 +234,22 @@ def list_tasks(
     if due_after:
         query = query.filter(Task.due_date >= due_after)
 
+    # Semi-joins, not joins: a task assigned twice to the user or carrying
+    # several of the tags must still come back once (task_rows reads
+    # plain columns, with no ORM identity to collapse duplicates)
     if assigned_user_id:
-        # join against TaskAssignment relationship
-        query = query.join(Task.assignments).filter(TaskAssignment.user_id == assigned_user_id)
+        query = query.filter(Task.id.in_(
+            db.query(TaskAssignment.task_id).filter(TaskAssignment.user_id == assigned_user_id)
+        ))
 
     if tags:
         tag_list = [t.strip() for t in tags.split(",") if t.strip()]
         if tag_list:
-            query = query.join(Task.tags).filter(models.Tag.name.in_(tag_list))
+            query = query.filter(Task.id.in_(
+                db.query(models.TaskTag.task_id)
+                .join(models.Tag, models.Tag.id == models.TaskTag.tag_id)
+                .filter(models.Tag.name.in_(tag_list))
+            ))
 
     # ---- SEARCH ----
     if search:
@@ -133,7 +270,71 @@ def list_tasks(
     else:
         query = query.order_by(asc(sort_column))
 
-    return query.all()
+    return query
+
+
+def list_tasks(db: Session, **filters):
+    return _filtered_query(db, **filters).all()
+
+
+def _sort_key(sort_by: Optional[str], sample: dict):
+    column = sort_by if sort_by in sample and not isinstance(sample[sort_by], list) else "created_at"
+
+    # NULLs first ascending / last descending, as SQLite orders them
+    def key(row):
+        value = row[column]
+        return (value is not None, value)
+    return key
+
+
+def list_task_dicts(db: Session, include_archived: bool = False, visible=None, **filters):
+    """Same filters as list_tasks, returned as TaskOut-shaped dicts.
+    include_archived merges in matching tasks from the archive tables.
+    visible (crud_utils.visibility) limits both to what a user may read."""
+    rows = task_rows.task_dicts(db, _filtered_query(db, visible=visible, **filters))
+    if not include_archived:
+        return rows
+
+    archived = archive.archived_task_dicts(db, visible=visible, **filters)
+    if not archived:
+        return rows
+    rows += archived
+    rows.sort(key=_sort_key(filters.get("sort_by"), rows[0]), reverse=filters.get("sort_dir", "desc") == "desc")
+    return rows
+
+
+def _list_cache_params(include_archived: bool, filters: dict, visible=None) -> dict:
+    """Equivalent requests map to one cache entry: defaults and blanks
+    dropped, status lists de-duplicated and sorted. Users who see
+    different tasks never share an entry."""
+    params = {name: value for name, value in filters.items() if value is not None and value != ""}
+    if params.get("statuses"):
+        params["statuses"] = ",".join(sorted({s.strip() for s in params["statuses"].split(",") if s.strip()}))
+    params.setdefault("sort_by", "created_at")
+    params.setdefault("sort_dir", "desc")
+    params["include_archived"] = bool(include_archived)
+    params["visible"] = visible.cache_key() if visible is not None else "all"
+    return params
+
+
+def list_tasks_json(db: Session, include_archived: bool = False, visible=None, **filters) -> bytes:
+    """list_task_dicts serialized, served from the result cache when the
+    same filters were asked for since the last relevant write."""
+    key, body = result_cache.lookup(
+        "tasks", _list_cache_params(include_archived, filters, visible), filters.get("client_id")
+    )
+    if body is None:
+        body = fastjson.dumps(list_task_dicts(db, include_archived=include_archived, visible=visible, **filters))
+        result_cache.store(key, body)
+    return body
+
+
+def export_task_rows(db: Session, include_archived: bool = False, visible=None, **filters):
+    rows = task_rows.export_rows(db, _filtered_query(db, visible=visible, **filters))
+    if not include_archived:
+        return rows
+    # Both sides come out ordered by id and never share one
+    return heapq.merge(rows, archive.export_rows(db, visible=visible, **filters), key=lambda row: row[0])
 
 
 # ---------------------------------------------------
@@ -145,7 +346,11 @@ def update_task(db: Session, task_id: int, data: TaskUpdate):
     if not task:
         return None
 
+    before = _snapshot(task)
+
     update_data = data.dict(exclude_unset=True)
+    changed = [f for f, v in update_data.items() if f == "tags" or getattr(task, f, None) != v]
+
     # handle tags specially if present in update_data (optional)
     if "tags" in update_data:
         # replace tags relationship with provided list
@@ -156,11 +361,17 @@ def update_task(db: Session, task_id: int, data: TaskUpdate):
                 tag = models.Tag(name=tag_name)
                 db.add(tag)
                 db.flush()
+                changelog.record(db, "tag", tag.id, changelog.UPSERT)
             new_tags.append(tag)
         task.tags = new_tags
 
     for field, value in update_data.items():
         setattr(task, field, value)
+    _track_completion(task)
+
+    _sync_derived(db, before, task)
+    if changed:
+        _emit(db, "task.updated", task, changed)
 
     db.commit()
     db.refresh(task)
@@ -176,6 +387,12 @@ def delete_task(db: Session, task_id: int):
     if not task:
         return False
 
+    _sync_derived(db, _snapshot(task), None)
+    _emit(db, "task.deleted", task, [])
+    dependencies.remove_task(db, task_id)
+
+    # No FK/cascade (see models.Attachment); the blobs are left to the GC
+    db.query(models.Attachment).filter(models.Attachment.task_id == task_id).delete(synchronize_session=False)
     db.delete(task)
     db.commit()
     return True
@@ -186,12 +403,25 @@ def delete_task(db: Session, task_id: int):
 # ---------------------------------------------------
 
 def add_user_to_task(db: Session, task_id: int, user_id: int, role: str = "assignee"):
+    task = get_task(db, task_id)
+    before = _snapshot(task)
+
     assignment = models.TaskAssignment(
         task_id=task_id,
         user_id=user_id,
-        role=role
+        role=role,
+        priority_score=task.priority_score if task else None,
     )
-    db.add(assignment)
+    if task:
+        task.assignments.append(assignment)
+    else:
+        db.add(assignment)
+    db.flush()
+
+    if task:
+        _sync_derived(db, before, task)
+        _emit(db, "task.updated", task, ["assignments"])
+
     db.commit()
     return assignment
 
@@ -209,7 +439,15 @@ def remove_user_from_task(db: Session, task_id: int, user_id: int):
     if not assignment:
         return False
 
-    db.delete(assignment)
+    task = assignment.task
+    before = _snapshot(task)
+
+    task.assignments.remove(assignment)  # delete-orphan removes the row
+    db.flush()
+
+    _sync_derived(db, before, task)
+    _emit(db, "task.updated", task, ["assignments"], also_notify=[user_id])
+
     db.commit()
     return True
 
@@ -219,12 +457,24 @@ def remove_user_from_task(db: Session, task_id: int, user_id: int):
 # ---------------------------------------------------
 
 def add_subtask(db: Session, task_id: int, data: SubtaskCreate):
+    task = get_task(db, task_id)
+    before = _snapshot(task)
+
     subtask = models.Subtask(
         task_id=task_id,
         title=data.title,
         completed=data.completed
     )
-    db.add(subtask)
+    if task:
+        task.subtasks.append(subtask)
+    else:
+        db.add(subtask)
+    db.flush()
+
+    if task:
+        _sync_derived(db, before, task)
+        _emit(db, "task.updated", task, ["subtasks"])
+
     db.commit()
     db.refresh(subtask)
     return subtask
@@ -239,11 +489,17 @@ def update_subtask(db: Session, subtask_id: int, title=None, completed=None):
     if not subtask:
         return None
 
+    task = subtask.task
+    before = _snapshot(task)
+
     if title is not None:
         subtask.title = title
     if completed is not None:
         subtask.completed = completed
 
+    _sync_derived(db, before, task, touched=[("subtask", subtask.id)])
+    _emit(db, "task.updated", task, ["subtasks"])
+
     db.commit()
     db.refresh(subtask)
     return subtask
@@ -258,14 +514,117 @@ def delete_subtask(db: Session, subtask_id: int):
     if not subtask:
         return False
 
-    db.delete(subtask)
+    task = subtask.task
+    before = _snapshot(task)
+
+    task.subtasks.remove(subtask)  # delete-orphan removes the row
+    db.flush()
+
+    _sync_derived(db, before, task)
+    _emit(db, "task.updated", task, ["subtasks"])
+
     db.commit()
     return True
 
-def kanban_board(db: Session):
-    # Fetch all tasks
-    tasks = db.query(Task).all()
 
+# ---------------------------------------------------
+# MANAGE DEPENDENCIES
+# ---------------------------------------------------
+# dependencies.link raises DependencyCycle; the closure is updated in the
+# same transaction as the edge.
+
+def add_dependency(db: Session, task_id: int, depends_on_id: int):
+    task = get_task(db, task_id)
+    if not task or not get_task(db, depends_on_id):
+        return None
+
+    if dependencies.link(db, task_id, depends_on_id):
+        changelog.record(db, "task", task.id, changelog.UPSERT, task.id, task.client_id)
+        _emit(db, "task.updated", task, ["dependencies"])
+    db.commit()
+    return task
+
+
+def remove_dependency(db: Session, task_id: int, depends_on_id: int):
+    task = get_task(db, task_id)
+    if not task or not dependencies.unlink(db, task_id, depends_on_id):
+        return False
+
+    changelog.record(db, "task", task.id, changelog.UPSERT, task.id, task.client_id)
+    _emit(db, "task.updated", task, ["dependencies"])
+    db.commit()
+    return True
+
+
+# ---------------------------------------------------
+# MANAGE ATTACHMENTS
+# ---------------------------------------------------
+# The bytes are written by utils.blobstore before these run; a row that
+# never gets committed just leaves an unreferenced blob for the GC.
+
+def list_attachments(db: Session, task_id: int):
+    return (
+        db.query(models.Attachment)
+        .filter(models.Attachment.task_id == task_id)
+        .order_by(models.Attachment.id)
+        .all()
+    )
+
+
+def get_attachment(db: Session, attachment_id: int):
+    return db.query(models.Attachment).filter(models.Attachment.id == attachment_id).first()
+
+
+def add_attachment(db: Session, task_id: int, sha256: str, size: int, filename: str,
+                   content_type: str, uploaded_by: int):
+    task = get_task(db, task_id)
+    if not task:
+        return None
+
+    attachment = models.Attachment(
+        task_id=task_id,
+        sha256=sha256,
+        size=size,
+        filename=filename,
+        content_type=content_type,
+        uploaded_by=uploaded_by,
+    )
+    db.add(attachment)
+    db.flush()
+
+    # Attachments aren't a synced child collection; refetching the task is enough
+    changelog.record(db, "task", task.id, changelog.UPSERT, task.id, task.client_id)
+    _emit(db, "task.updated", task, ["attachments"])
+
+    db.commit()
+    db.refresh(attachment)
+    return attachment
+
+
+def delete_attachment(db: Session, attachment_id: int):
+    attachment = get_attachment(db, attachment_id)
+    if not attachment:
+        return False
+
+    task = get_task(db, attachment.task_id)
+    db.delete(attachment)
+    if task:
+        changelog.record(db, "task", task.id, changelog.UPSERT, task.id, task.client_id)
+        _emit(db, "task.updated", task, ["attachments"])
+
+    db.commit()
+    return True
+
+
+def referenced_blobs(db: Session):
+    return {sha256 for sha256, in db.query(models.Attachment.sha256).distinct()}
+
+
+def inbox(db: Session, user_id: int, limit: int = 20):
+    return priority.inbox(db, user_id, limit=limit)
+
+
+def kanban_board_dicts(db: Session, visible=None):
     board = {
         "new": [],
         "in_progress": [],
@@ -273,13 +632,12 @@ def kanban_board(db: Session):
         "completed": []
     }
 
-    for task in tasks:
-        status = task.status or "new"
-
+    query = visibility.filter_tasks(db.query(Task), visible)
+    for task in task_rows.task_dicts(db, query.order_by(Task.id)):
+        status = task["status"] or "new"
         # If unexpected status, drop into "new"
         if status not in board:
             status = "new"
-
         board[status].append(task)
 
     return board
\ No newline at end of file
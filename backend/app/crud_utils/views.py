@@ -0,0 +1,359 @@
+import json
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, asc, case, desc, func, literal, or_
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+
+from backend.app import models
+from backend.app.models import SavedView, SavedViewMember, Tag, Task, TaskAssignment
+from backend.app.schemas.views import SavedViewCreate, SavedViewUpdate, ViewFilters
+from backend.app.crud_utils import task_rows, visibility
+
+COMPLETED = models.TaskStatus.completed.value
+
+
+# ---------------------------------------------------
+# FILTER DEFINITIONS
+# ---------------------------------------------------
+# Filters are stored in one canonical form (sorted lists, trimmed and
+# lower-cased search, ISO datetimes) so equal views compare equal and the
+# write path can evaluate them without touching pydantic.
+
+def normalize(filters: ViewFilters) -> str:
+    data = filters.dict()
+    data["statuses"] = sorted({s.strip() for s in data["statuses"] if s.strip()})
+    data["tags"] = sorted({t.strip() for t in data["tags"] if t.strip()})
+    data["search"] = (data["search"] or "").strip().lower() or None
+    return json.dumps(data, sort_keys=True, default=datetime.isoformat, separators=(",", ":"))
+
+
+def _parse(filters: str) -> dict:
+    data = json.loads(filters)
+    for key in ("due_before", "due_after"):
+        if data.get(key):
+            data[key] = datetime.fromisoformat(data[key])
+    data["statuses"] = set(data.get("statuses") or ())
+    data["tags"] = set(data.get("tags") or ())
+    return data
+
+
+# Parsed predicates per view id, valid while the view's updated_at matches
+_PREDICATES: Dict[int, Tuple[Optional[datetime], dict]] = {}
+
+
+def _predicate(view: SavedView) -> dict:
+    cached = _PREDICATES.get(view.id)
+    if cached and cached[0] == view.updated_at:
+        return cached[1]
+    predicate = _parse(view.filters)
+    _PREDICATES[view.id] = (view.updated_at, predicate)
+    return predicate
+
+
+# ---------------------------------------------------
+# WRITE-TIME PREDICATES (Python and SQL, same semantics)
+# ---------------------------------------------------
+# "overdue" and "due_within_days" move with the clock, so only their
+# static half (open / has a due date) decides membership; the time
+# comparison is applied in SQL when the view is read.
+
+def _has_time_filters(predicate: dict) -> bool:
+    return bool(predicate.get("overdue")) or predicate.get("due_within_days") is not None
+
+
+def _needs_due_date(predicate: dict) -> bool:
+    return bool(predicate.get("due_before") or predicate.get("due_after")) or _has_time_filters(predicate)
+
+
+def task_facts(task: Task) -> dict:
+    return {
+        "status": task.status,
+        "client_id": task.client_id,
+        "billable": bool(task.billable),
+        "due_date": task.due_date,
+        "user_ids": {a.user_id for a in task.assignments},
+        "tags": {t.name for t in task.tags},
+        "text": f"{task.title or ''}\n{task.description or ''}".lower(),
+    }
+
+
+def matches(predicate: dict, facts: dict) -> bool:
+    if predicate["statuses"] and facts["status"] not in predicate["statuses"]:
+        return False
+    if predicate.get("client_id") and facts["client_id"] != predicate["client_id"]:
+        return False
+    if predicate.get("billable") is not None and facts["billable"] != predicate["billable"]:
+        return False
+    if predicate.get("assigned_user_id") and predicate["assigned_user_id"] not in facts["user_ids"]:
+        return False
+    if predicate["tags"] and not predicate["tags"] & facts["tags"]:
+        return False
+    if predicate.get("search") and predicate["search"] not in facts["text"]:
+        return False
+
+    due_date = facts["due_date"]
+    if _needs_due_date(predicate) and due_date is None:
+        return False
+    if predicate.get("due_before") and due_date > predicate["due_before"]:
+        return False
+    if predicate.get("due_after") and due_date < predicate["due_after"]:
+        return False
+    if predicate.get("overdue") and facts["status"] == COMPLETED:
+        return False
+    return True
+
+
+def _member_query(db: Session, predicate: dict):
+    """Ids of the tasks matching the write-time predicates (view rebuilds)."""
+    query = db.query(Task.id)
+    if predicate["statuses"]:
+        query = query.filter(Task.status.in_(predicate["statuses"]))
+    if predicate.get("client_id"):
+        query = query.filter(Task.client_id == predicate["client_id"])
+    if predicate.get("billable") is not None:
+        query = query.filter(Task.billable == predicate["billable"])
+    if predicate.get("assigned_user_id"):
+        query = query.filter(Task.id.in_(
+            db.query(TaskAssignment.task_id).filter(TaskAssignment.user_id == predicate["assigned_user_id"])
+        ))
+    if predicate["tags"]:
+        query = query.filter(Task.tags.any(Tag.name.in_(predicate["tags"])))
+    if predicate.get("search"):
+        term = f"%{predicate['search']}%"
+        query = query.filter(or_(Task.title.ilike(term), Task.description.ilike(term)))
+    if _needs_due_date(predicate):
+        query = query.filter(Task.due_date.isnot(None))
+    if predicate.get("due_before"):
+        query = query.filter(Task.due_date <= predicate["due_before"])
+    if predicate.get("due_after"):
+        query = query.filter(Task.due_date >= predicate["due_after"])
+    if predicate.get("overdue"):
+        query = query.filter(or_(Task.status.is_(None), Task.status != COMPLETED))
+    return query
+
+
+def _time_filters(query, predicate: dict, now: datetime):
+    if predicate.get("overdue"):
+        query = query.filter(Task.due_date < now)
+    if predicate.get("due_within_days") is not None:
+        query = query.filter(Task.due_date <= now + timedelta(days=predicate["due_within_days"]))
+    return query
+
+
+# ---------------------------------------------------
+# MEMBERSHIP MAINTENANCE (inside the task write transaction)
+# ---------------------------------------------------
+
+def apply_task_change(db: Session, task_id: int, task: Optional[Task]):
+    """Re-evaluate one written task against the views it could be in.
+
+    Candidate views are the ones without a client filter plus the ones
+    for the task's client (an indexed read); the task's current rows come
+    from ix_saved_view_members_task_id. At most one insert, one update and
+    one delete follow.
+    """
+    members = db.query(SavedViewMember).filter(SavedViewMember.task_id == task_id)
+    if task is None:
+        members.delete(synchronize_session=False)
+        return
+
+    candidates = db.query(SavedView.id, SavedView.updated_at, SavedView.filters).filter(
+        or_(SavedView.client_id.is_(None), SavedView.client_id == task.client_id)
+    ).all()
+    facts = task_facts(task)
+    matched = {view.id for view in candidates if matches(_predicate(view), facts)}
+    current = {view_id for view_id, in members.with_entities(SavedViewMember.view_id)}
+
+    now = datetime.utcnow()
+    left = current - matched
+    if left:
+        members.filter(SavedViewMember.view_id.in_(left)).delete(synchronize_session=False)
+    stayed = current & matched
+    if stayed:
+        members.filter(SavedViewMember.view_id.in_(stayed)).update(
+            {SavedViewMember.changed_at: now}, synchronize_session=False
+        )
+    joined = matched - current
+    if joined:
+        db.bulk_insert_mappings(SavedViewMember, [
+            {"view_id": view_id, "task_id": task_id, "changed_at": now} for view_id in sorted(joined)
+        ])
+
+
+def remove_tasks(db: Session, task_ids: List[int]):
+    """Drop membership for tasks leaving the hot table (archival)."""
+    if task_ids:
+        db.query(SavedViewMember).filter(SavedViewMember.task_id.in_(task_ids)).delete(synchronize_session=False)
+
+
+def _populate(db: Session, view: SavedView):
+    db.query(SavedViewMember).filter(SavedViewMember.view_id == view.id).delete(synchronize_session=False)
+    matching = _member_query(db, _parse(view.filters)).with_entities(
+        literal(view.id, SavedViewMember.view_id.type),
+        Task.id,
+        literal(datetime.utcnow(), SavedViewMember.changed_at.type),
+    )
+    db.execute(
+        SavedViewMember.__table__.insert().from_select(["view_id", "task_id", "changed_at"], matching.statement)
+    )
+
+
+def rebuild_views(db: Session) -> int:
+    """Recompute every view's membership from the tasks (repairs drift)."""
+    views = db.query(SavedView).all()
+    for view in views:
+        _populate(db, view)
+    db.commit()
+    return len(views)
+
+
+# ---------------------------------------------------
+# SAVED VIEW CRUD
+# ---------------------------------------------------
+
+def get_view(db: Session, view_id: int, user_id: int):
+    return db.query(SavedView).filter(SavedView.id == view_id, SavedView.user_id == user_id).first()
+
+
+def create_view(db: Session, data: SavedViewCreate, user_id: int):
+    view = SavedView(
+        user_id=user_id,
+        name=data.name,
+        filters=normalize(data.filters),
+        client_id=data.filters.client_id,
+    )
+    db.add(view)
+    db.flush()
+    _populate(db, view)
+    db.commit()
+    db.refresh(view)
+    return view
+
+
+def update_view(db: Session, view_id: int, user_id: int, data: SavedViewUpdate):
+    view = get_view(db, view_id, user_id)
+    if not view:
+        return None
+
+    if data.name is not None:
+        view.name = data.name
+    if data.filters is not None:
+        filters = normalize(data.filters)
+        if filters != view.filters:
+            view.filters = filters
+            view.client_id = data.filters.client_id
+            view.updated_at = datetime.utcnow()
+            db.flush()
+            _populate(db, view)
+    db.commit()
+    db.refresh(view)
+    return view
+
+
+def delete_view(db: Session, view_id: int, user_id: int):
+    view = get_view(db, view_id, user_id)
+    if not view:
+        return False
+    db.query(SavedViewMember).filter(SavedViewMember.view_id == view.id).delete(synchronize_session=False)
+    db.delete(view)
+    _PREDICATES.pop(view_id, None)
+    db.commit()
+    return True
+
+
+# ---------------------------------------------------
+# READ
+# ---------------------------------------------------
+# Membership is the same for everyone, like the filters themselves; what
+# the owner may see (crud_utils.visibility) is applied when the view is
+# read, so client reassignments never leave a view's rows out of date.
+
+def _members(db: Session, view: SavedView, predicate: dict, now: datetime, visible=None):
+    query = db.query(Task).join(
+        SavedViewMember, and_(SavedViewMember.task_id == Task.id, SavedViewMember.view_id == view.id)
+    )
+    return visibility.filter_tasks(_time_filters(query, predicate, now), visible)
+
+
+def _out(view: SavedView, task_count: int, unread_count: int) -> dict:
+    return {
+        "id": view.id,
+        "name": view.name,
+        "filters": json.loads(view.filters),
+        "task_count": task_count,
+        "unread_count": unread_count,
+        "last_opened_at": view.last_opened_at,
+        "created_at": view.created_at,
+        "updated_at": view.updated_at,
+    }
+
+
+def list_views(db: Session, user_id: int, now: Optional[datetime] = None, visible=None):
+    """The user's views with task and unread counts.
+
+    Views without time filters are counted in one grouped query over the
+    member table; the few with time filters get one joined count each.
+    """
+    now = now or datetime.utcnow()
+    views = db.query(SavedView).filter(SavedView.user_id == user_id).order_by(SavedView.name).all()
+    if not views:
+        return []
+
+    static_ids = [view.id for view in views if not _has_time_filters(_predicate(view))]
+    counts = {}
+    if static_ids:
+        unread = func.sum(case((_unread_condition(), 1), else_=0))
+        query = (
+            db.query(SavedViewMember.view_id, func.count(SavedViewMember.task_id), unread)
+            .join(SavedView, SavedView.id == SavedViewMember.view_id)
+            .filter(SavedViewMember.view_id.in_(static_ids))
+        )
+        clause = visibility.task_clause(visible)
+        if clause is not None:
+            query = query.join(Task, Task.id == SavedViewMember.task_id).filter(clause)
+        for view_id, total, unread_total in query.group_by(SavedViewMember.view_id):
+            counts[view_id] = (total, unread_total or 0)
+
+    out = []
+    for view in views:
+        if view.id not in static_ids:
+            query = _members(db, view, _predicate(view), now, visible)
+            total = query.count()
+            unread_total = _unread_filter(query, view).count()
+            counts[view.id] = (total, unread_total)
+        out.append(_out(view, *counts.get(view.id, (0, 0))))
+    return out
+
+
+def _unread_condition():
+    return or_(SavedView.last_opened_at.is_(None), SavedViewMember.changed_at > SavedView.last_opened_at)
+
+
+def _unread_filter(query, view: SavedView):
+    if view.last_opened_at is None:
+        return query
+    return query.filter(SavedViewMember.changed_at > view.last_opened_at)
+
+
+def view_summary(db: Session, view: SavedView, now: Optional[datetime] = None, visible=None) -> dict:
+    now = now or datetime.utcnow()
+    query = _members(db, view, _predicate(view), now, visible)
+    return _out(view, query.count(), _unread_filter(query, view).count())
+
+
+def open_view(db: Session, view: SavedView, now: Optional[datetime] = None, visible=None) -> List[dict]:
+    """TaskOut-shaped dicts for the view's tasks, and mark it read."""
+    now = now or datetime.utcnow()
+    predicate = _predicate(view)
+    query = _members(db, view, predicate, now, visible)
+
+    sort_column = getattr(Task, predicate.get("sort_by") or "created_at", Task.created_at)
+    query = query.order_by(desc(sort_column) if predicate.get("sort_dir", "desc") == "desc" else asc(sort_column))
+    rows = task_rows.task_dicts(db, query)
+
+    # Don't bump updated_at (it keys the predicate cache)
+    db.query(SavedView).filter(SavedView.id == view.id).update(
+        {SavedView.last_opened_at: now, SavedView.updated_at: view.updated_at}, synchronize_session=False
+    )
+    db.commit()
+    return rows
@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+from sqlalchemy.orm import Session
+from sqlalchemy import or_, select
+from typing import Dict, FrozenSet, Iterable, NamedTuple, Optional, Tuple
+
+from backend.app.models import (
+    ArchivedTask, ArchivedTaskAssignment, ClientAssignment, Permission, RecurringTask,
+    RolePermission, Task, TaskAssignment, User,
+)
+from backend.app.utils.txn import on_commit
+
+# Holders of this permission (and is_admin users) see every task
+SEE_ALL_PERMISSION = "manage_tasks"
+VISIBILITY_CACHE_SECONDS = int(os.getenv("VISIBILITY_CACHE_SECONDS", "30"))
+
+
+class Visibility(NamedTuple):
+    """What one user may read: every task, or tasks of the clients they
+    are assigned to plus tasks they are assigned to themselves."""
+    user_id: int
+    everything: bool
+    client_ids: FrozenSet[int] = frozenset()
+
+    def cache_key(self):
+        """Part of result-cache keys: users with the same rights share
+        nothing but "all" (own assignments differ per user)."""
+        if self.everything:
+            return "all"
+        return {"user": self.user_id, "clients": sorted(self.client_ids)}
+
+
+# ---------------------------------------------------
+# PER-USER CACHE
+# ---------------------------------------------------
+# The visible client set is read once per user and kept for
+# VISIBILITY_CACHE_SECONDS. Client assignment, user and role-permission
+# writes drop the affected entries on commit in this worker; other
+# workers pick the change up when their entry expires.
+
+_cache: Dict[int, Tuple[float, Visibility]] = {}
+_lock = threading.Lock()
+
+
+def _sees_everything(db: Session, user: User) -> bool:
+    if user.is_admin:
+        return True
+    if not user.role_id:
+        return False
+    return db.query(RolePermission.id).join(Permission, Permission.id == RolePermission.permission_id).filter(
+        RolePermission.role_id == user.role_id,
+        Permission.name == SEE_ALL_PERMISSION,
+    ).first() is not None
+
+
+def for_user(db: Session, user: User) -> Visibility:
+    hit = _cache.get(user.id)
+    if hit and time.monotonic() - hit[0] < VISIBILITY_CACHE_SECONDS:
+        return hit[1]
+
+    if _sees_everything(db, user):
+        visible = Visibility(user.id, True)
+    else:
+        client_ids = frozenset(
+            client_id for (client_id,) in
+            db.query(ClientAssignment.client_id).filter(ClientAssignment.user_id == user.id)
+            if client_id is not None
+        )
+        visible = Visibility(user.id, False, client_ids)
+    with _lock:
+        _cache[user.id] = (time.monotonic(), visible)
+    return visible
+
+
+def invalidate(user_ids: Optional[Iterable[int]] = None):
+    """Forget the given users' sets, or everyone's (role permission changes)."""
+    with _lock:
+        if user_ids is None:
+            _cache.clear()
+        else:
+            for user_id in user_ids:
+                _cache.pop(user_id, None)
+
+
+def invalidate_on_commit(db: Session, user_ids: Optional[Iterable[int]] = None):
+    user_ids = None if user_ids is None else list(user_ids)
+    on_commit(db, lambda: invalidate(user_ids))
+
+
+# ---------------------------------------------------
+# SQL
+# ---------------------------------------------------
+# The client set goes in as an IN list against the client_id index; own
+# assignments as a semi-join on the assignments' user_id index.
+
+def _clause(visible: Visibility, task_model, assignment_model):
+    return or_(
+        task_model.client_id.in_(sorted(visible.client_ids)),
+        task_model.id.in_(
+            select(assignment_model.task_id).where(assignment_model.user_id == visible.user_id)
+        ),
+    )
+
+
+def task_clause(visible: Optional[Visibility]):
+    """The filter as a bare expression for select()s; None when unrestricted."""
+    if visible is None or visible.everything:
+        return None
+    return _clause(visible, Task, TaskAssignment)
+
+
+def filter_tasks(query, visible: Optional[Visibility]):
+    clause = task_clause(visible)
+    return query if clause is None else query.filter(clause)
+
+
+def filter_archived(query, visible: Optional[Visibility]):
+    if visible is None or visible.everything:
+        return query
+    return query.filter(_clause(visible, ArchivedTask, ArchivedTaskAssignment))
+
+
+def filter_recurring(query, visible: Optional[Visibility]):
+    """Recurring definitions follow the same rule (client or assignee)."""
+    if visible is None or visible.everything:
+        return query
+    return query.filter(or_(
+        RecurringTask.client_id.in_(sorted(visible.client_ids)),
+        RecurringTask.assigned_user_id == visible.user_id,
+    ))
+
+
+# ---------------------------------------------------
+# SINGLE-ROW CHECKS
+# ---------------------------------------------------
+
+def can_see(visible: Optional[Visibility], task: Task) -> bool:
+    if visible is None or visible.everything or task.client_id in visible.client_ids:
+        return True
+    return any(a.user_id == visible.user_id for a in task.assignments)
+
+
+def can_see_recurring(visible: Optional[Visibility], definition: RecurringTask) -> bool:
+    """Single-row form of filter_recurring."""
+    if visible is None or visible.everything or definition.client_id in visible.client_ids:
+        return True
+    return definition.assigned_user_id == visible.user_id
+
+
+def can_see_client(visible: Optional[Visibility], client_id: int) -> bool:
+    """Whole-client reads (critical path...) need the client itself."""
+    return visible is None or visible.everything or client_id in visible.client_ids
+
+
+def can_see_id(db: Session, visible: Optional[Visibility], task_id: int) -> bool:
+    """For rows that outlive the hot task (attachments): checks the archive too."""
+    if visible is None or visible.everything:
+        return True
+    if filter_tasks(db.query(Task.id).filter(Task.id == task_id), visible).first():
+        return True
+    return filter_archived(db.query(ArchivedTask.id).filter(ArchivedTask.id == task_id), visible).first() is not None
+
+
+def visible_task(db: Session, user: User, task_id: int) -> Optional[Task]:
+    """The task if it exists and the user may see it; routers answer 404
+    either way, so hidden tasks look the same as missing ones."""
+    task = db.query(Task).filter(Task.id == task_id).first()
+    if task is None or not can_see(for_user(db, user), task):
+        return None
+    return task
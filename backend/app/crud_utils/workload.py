@@ -0,0 +1,210 @@
+import heapq
+import threading
+from collections import Counter
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Set, Tuple
+from datetime import date, datetime
+
+from backend.app import models
+from backend.app.models import ClientAssignment, Task, TaskAssignment, User
+from backend.app.utils.txn import on_commit
+
+COMPLETED = models.TaskStatus.completed.value
+
+# ---------------------------------------------------
+# LOAD
+# ---------------------------------------------------
+# A user's load is the sum over their open tasks of a due-date pressure
+# weight: overdue work counts three times a task with no due date.
+
+PRESSURE = (          # (due within N days, weight), first match wins
+    (-1, 3.0),        # overdue
+    (2, 2.0),
+    (7, 1.5),
+)
+
+
+def task_weight(due_date: Optional[datetime], today: Optional[date] = None) -> float:
+    if due_date is None:
+        return 1.0
+    days = (due_date.date() - (today or datetime.utcnow().date())).days
+    for within, weight in PRESSURE:
+        if days <= within:
+            return weight
+    return 1.0
+
+
+def task_load(task: Optional[Task]) -> Dict[int, float]:
+    """What the task adds to each assignee's load (nothing once completed)."""
+    if task is None or task.status == COMPLETED:
+        return {}
+    weight = task_weight(task.due_date)
+    return {a.user_id: weight for a in task.assignments}
+
+
+# ---------------------------------------------------
+# INDEX (per worker process)
+# ---------------------------------------------------
+# Loads per user plus, per client, a min-heap of (load, user_id, stamp)
+# over the client's active members. A load change pushes a fresh entry
+# into the heaps of the user's clients and bumps the user's stamp; older
+# entries are skipped when they surface (lazy deletion), and a heap is
+# rebuilt once stale entries outnumber live ones.
+#
+# Task writes hand over before/after loads from _sync_derived and the
+# difference is applied on commit. Weights drift as due dates approach and
+# other workers write too, so each worker also rebuilds the whole index
+# from the database periodically (startup.py), starting at boot.
+
+class LoadIndex:
+    def __init__(self):
+        self.loads: Dict[int, float] = {}
+        self.members: Dict[int, Set[int]] = {}        # client id -> user ids
+        self.clients_of: Dict[int, Set[int]] = {}     # user id -> client ids
+        self._heaps: Dict[int, List[Tuple[float, int, int]]] = {}
+        self._stamps: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    # ---- writes ----
+
+    def _push(self, user_id: int):
+        stamp = self._stamps.get(user_id, 0) + 1
+        self._stamps[user_id] = stamp
+        entry = (self.loads.get(user_id, 0.0), user_id, stamp)
+        for client_id in self.clients_of.get(user_id, ()):
+            heap = self._heaps.setdefault(client_id, [])
+            heapq.heappush(heap, entry)
+            if len(heap) > 2 * len(self.members[client_id]) + 8:
+                self._compact(client_id)
+
+    def _compact(self, client_id: int):
+        heap = [
+            (self.loads.get(user_id, 0.0), user_id, self._stamps.get(user_id, 0))
+            for user_id in self.members.get(client_id, ())
+        ]
+        heapq.heapify(heap)
+        self._heaps[client_id] = heap
+
+    def add_load(self, deltas: Dict[int, float]):
+        with self._lock:
+            for user_id, delta in deltas.items():
+                self.loads[user_id] = max(0.0, self.loads.get(user_id, 0.0) + delta)
+                self._push(user_id)
+
+    def add_member(self, client_id: int, user_id: int):
+        with self._lock:
+            self.members.setdefault(client_id, set()).add(user_id)
+            self.clients_of.setdefault(user_id, set()).add(client_id)
+            self._compact(client_id)
+
+    def remove_member(self, client_id: int, user_id: int):
+        with self._lock:
+            self.members.get(client_id, set()).discard(user_id)
+            self.clients_of.get(user_id, set()).discard(client_id)
+            self._compact(client_id)
+
+    def remove_user(self, user_id: int):
+        with self._lock:
+            for client_id in self.clients_of.pop(user_id, set()):
+                self.members.get(client_id, set()).discard(user_id)
+                self._compact(client_id)
+
+    # ---- reads ----
+
+    def pick(self, client_id: int, pending: Optional[Counter] = None) -> Optional[int]:
+        """Least-loaded active member of the client (ties to the lower id).
+
+        pending holds load already handed out in the caller's open
+        transaction (bulk creation), which the index hasn't seen yet. It
+        only ever adds, so an entry's stored load is a lower bound: pop
+        until the next entry can't beat the best effective load so far.
+        """
+        pending = pending or Counter()
+        with self._lock:
+            heap = self._heaps.get(client_id)
+            members = self.members.get(client_id)
+            if not heap or not members:
+                return None
+            popped, best = [], None
+            while heap:
+                load, user_id, stamp = heap[0]
+                if user_id not in members or stamp != self._stamps.get(user_id, 0):
+                    heapq.heappop(heap)   # stale
+                    continue
+                if best is not None and (load, user_id) >= best:
+                    break
+                popped.append(heapq.heappop(heap))
+                effective = (load + pending.get(user_id, 0.0), user_id)
+                if best is None or effective < best:
+                    best = effective
+            for entry in popped:
+                heapq.heappush(heap, entry)
+            return best[1] if best else None
+
+
+_index: Optional[LoadIndex] = None
+_build_lock = threading.Lock()
+
+
+def rebuild(db: Session, today: Optional[date] = None) -> int:
+    """Reload loads and client memberships: two queries."""
+    index = LoadIndex()
+    for user_id, due_date in (
+        db.query(TaskAssignment.user_id, Task.due_date)
+        .join(Task, Task.id == TaskAssignment.task_id)
+        .filter((Task.status != COMPLETED) | Task.status.is_(None))
+    ):
+        index.loads[user_id] = index.loads.get(user_id, 0.0) + task_weight(due_date, today)
+    for client_id, user_id in (
+        db.query(ClientAssignment.client_id, ClientAssignment.user_id)
+        .join(User, User.id == ClientAssignment.user_id)
+        .filter(User.is_active.is_(True))
+    ):
+        index.members.setdefault(client_id, set()).add(user_id)
+        index.clients_of.setdefault(user_id, set()).add(client_id)
+    for client_id in index.members:
+        index._compact(client_id)
+
+    global _index
+    _index = index   # one assignment: readers never see a half-built index
+    return len(index.members)
+
+
+def get_index(db: Session) -> LoadIndex:
+    if _index is None:
+        with _build_lock:
+            if _index is None:
+                rebuild(db)
+    return _index
+
+
+def pick_assignee(db: Session, client_id: int, pending: Optional[Counter] = None) -> Optional[int]:
+    return get_index(db).pick(client_id, pending)
+
+
+# ---------------------------------------------------
+# WRITE PATHS
+# ---------------------------------------------------
+
+def apply_task_change(db: Session, before: Optional[Dict[int, float]], after: Optional[Dict[int, float]]):
+    deltas = Counter(after or {})
+    deltas.subtract(before or {})
+    deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+    if deltas:
+        on_commit(db, lambda: _index and _index.add_load(deltas))
+
+
+def member_added(db: Session, client_id: int, user_id: int):
+    on_commit(db, lambda: _index and _index.add_member(client_id, user_id))
+
+
+def member_removed(db: Session, client_id: int, user_id: int):
+    on_commit(db, lambda: _index and _index.remove_member(client_id, user_id))
+
+
+def user_changed(user: User):
+    """After the user's own commit: deactivated users stop being picked.
+    Reactivation is picked up by the next rebuild (memberships are read
+    from the database then)."""
+    if _index is not None and not user.is_active:
+        _index.remove_user(user.id)
@@ -1,9 +1,12 @@
 import os
 from pathlib import Path
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
 
+from backend.app.utils import slow_queries
+from backend.app.utils.metrics import TimedQueuePool, instrument_engine
+
 # Load environment variables
 load_dotenv()
 
@@ -20,14 +23,44 @@ DATABASE_URL = os.getenv(
     f"sqlite:///{DEFAULT_DB_PATH}"
 )
 
+# Per-worker pool; the production launcher (backend.app.serve) divides
+# DB_MAX_CONNECTIONS across workers when DB_POOL_SIZE isn't given.
+POOL_OPTIONS = {
+    "poolclass": TimedQueuePool,
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_pre_ping": DATABASE_URL.startswith("postgresql"),
+}
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
 # Enable check_same_thread only for SQLite
 if DATABASE_URL.startswith("sqlite"):
     engine = create_engine(
         DATABASE_URL,
-        connect_args={"check_same_thread": False}
+        connect_args={"check_same_thread": False},
+        # in-memory SQLite needs its default single-connection pool
+        **({} if ":memory:" in DATABASE_URL else POOL_OPTIONS),
     )
+
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL lets readers run alongside the single writer (and other
+        # worker processes); busy_timeout makes a blocked writer wait for
+        # the lock instead of failing at once with "database is locked".
+        cursor = dbapi_connection.cursor()
+        if ":memory:" not in DATABASE_URL:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
 else:
-    engine = create_engine(DATABASE_URL)
+    engine = create_engine(DATABASE_URL, **POOL_OPTIONS)
+
+# Query counts/timings and pool usage for /metrics
+instrument_engine(engine)
+# Statements over SLOW_QUERY_MS: logged, aggregated, EXPLAINed once per shape
+slow_queries.instrument_engine(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -1,21 +1,55 @@
+import logging
 from fastapi import FastAPI
 from backend.app import auth
 from dotenv import load_dotenv
 from backend.app.routers import tasks_router
 from backend.app.routers import admin_permissions_router
+from backend.app.routers import clients_router
+from backend.app.routers import planner_router
+from backend.app.routers import dashboard_router
+from backend.app.routers import calendar_router
+from backend.app.routers import recurrence_router
+from backend.app.routers import events_router
+from backend.app.routers import sync_router
+from backend.app.routers import metrics_router
+from backend.app.routers import profiles_router
+from backend.app.routers import slow_queries_router
+from backend.app.routers import health_router
+from backend.app.routers import attachments_router
+from backend.app.routers import time_router
+from backend.app.routers import billing_router
+from backend.app.routers import views_router
+from backend.app.routers import autocomplete_router
 from fastapi.security import APIKeyHeader
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 from backend.app.routers.users_router import router as users_router
-from backend.app.startup import seed_data
+from backend.app.startup import seed_data, start_background_jobs, stop_background_jobs
+from backend.app.utils.metrics import MetricsMiddleware
+from backend.app.utils.admission import AdmissionMiddleware
+from backend.app.utils import profiling
 import os
 load_dotenv()
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO"),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
 app = FastAPI()
 origins = [
     "http://localhost:3000",
     "http://10.0.0.237:3000",
 ]
 
+# Middleware added later wraps the ones added earlier (runs first).
+
+# Only acts on requests carrying X-Profile / ?_profile= (admins only)
+app.add_middleware(profiling.ProfilingMiddleware)
+
+# Read/write concurrency limits with a bounded queue; turns excess load
+# away with 429/503 + Retry-After instead of letting it pile up in SQLite
+app.add_middleware(AdmissionMiddleware)
+
+# Outside admission so rejections still carry CORS headers
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -24,15 +58,47 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so latency includes CORS and every other middleware
+app.add_middleware(MetricsMiddleware)
+
+# The production launcher seeds once before forking workers and turns this off
+SEED_ON_STARTUP = os.getenv("SEED_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+
+
 @app.on_event("startup")
 def startup_event():
-    seed_data()
+    if SEED_ON_STARTUP:
+        seed_data()
+    start_background_jobs()
+
+@app.on_event("shutdown")
+def shutdown_event():
+    stop_background_jobs()
 
 app.include_router(tasks_router.router)
+app.include_router(clients_router.router)
+app.include_router(planner_router.router)
+app.include_router(dashboard_router.router)
+app.include_router(calendar_router.router)
+app.include_router(recurrence_router.router)
+app.include_router(events_router.router)
+app.include_router(sync_router.router)
+app.include_router(metrics_router.router)
+app.include_router(profiles_router.router)
+app.include_router(slow_queries_router.router)
+app.include_router(health_router.router)
+app.include_router(attachments_router.router)
+app.include_router(time_router.router)
+app.include_router(billing_router.router)
+app.include_router(views_router.router)
+app.include_router(autocomplete_router.router)
 app.include_router(auth.router)
 # Attach admin router with a single /admin prefix (router itself has no prefix)
 app.include_router(admin_permissions_router.router, prefix="/admin", tags=["Admin Permissions"])
 app.include_router(users_router)
+
+# After every router is included: lets ProfilingMiddleware profile endpoints
+profiling.install(app)
 api_key_scheme = APIKeyHeader(name="Authorization")  # not strictly required, but available if you use it in future
 
 def custom_openapi():
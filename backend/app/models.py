@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, Boolean, DateTime, Table, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Boolean, Date, DateTime, Float, Table, ForeignKey, UniqueConstraint, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
@@ -77,7 +77,7 @@ class ClientAssignment(Base):
     __tablename__ = "client_assignments"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)  # user directory client counts
     client_id = Column(Integer, ForeignKey("clients.id"))
 
     user = relationship("User", back_populates="client_assignments")
@@ -87,19 +87,32 @@ class Task(Base):
     __tablename__ = "tasks"
 
     id = Column(Integer, primary_key=True, index=True)
-    client_id = Column(Integer, ForeignKey("clients.id"), nullable=False)
+    client_id = Column(Integer, ForeignKey("clients.id"), nullable=False, index=True)  # visibility: IN (visible clients)
 
     title = Column(String, nullable=False)
     description = Column(Text)
 
     status = Column(String, default=TaskStatus.new.value)
-    due_date = Column(DateTime, nullable=True)
+    due_date = Column(DateTime, nullable=True, index=True)  # calendar range scans
 
     billable = Column(Boolean, default=False)
+    estimated_hours = Column(Float, nullable=True)
+
+    # Urgency used by the inbox; NULL once the task is completed.
+    # Maintained by crud_utils.priority on writes and by the periodic sweep.
+    priority_score = Column(Integer, nullable=True, index=True)
 
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True, index=True)  # set when status becomes completed; archival scans it
+    version = Column(Integer, nullable=False, default=1)  # bumped on every write, sent with push events
+
+    # Never hand out a deleted task's id again: time entries, attachments,
+    # archived rows and change-log tombstones all keep pointing at it
+    __table_args__ = (
+        {"sqlite_autoincrement": True},
+    )
 
     # Relationships
     client = relationship("Client", back_populates="tasks")
@@ -107,24 +120,39 @@ class Task(Base):
     subtasks = relationship("Subtask", back_populates="task", cascade="all, delete-orphan")
     assignments = relationship("TaskAssignment", back_populates="task", cascade="all, delete-orphan")
     tags = relationship("Tag", secondary="task_tags", back_populates="tasks")
+    attachments = relationship(
+        "Attachment",
+        primaryjoin="Task.id == foreign(Attachment.task_id)",
+        order_by="Attachment.id",
+        viewonly=True,
+    )
 
 class TaskAssignment(Base):
     __tablename__ = "task_assignments"
 
     id = Column(Integer, primary_key=True, index=True)
-    task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
+    task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     role = Column(String, default="assignee")  # assignee, reviewer, etc.
+    assigned_at = Column(DateTime, nullable=True, default=datetime.utcnow, index=True)  # "newly assigned" in digests
+
+    # Copy of Task.priority_score so a user's inbox is a scan of
+    # ix_task_assignments_user_priority instead of a join + sort.
+    priority_score = Column(Integer, nullable=True)
 
     user = relationship("User", back_populates="task_assignments")
     task = relationship("Task", back_populates="assignments")
 
+    __table_args__ = (
+        Index("ix_task_assignments_user_priority", "user_id", "priority_score"),
+    )
+
 class Subtask(Base):
     __tablename__ = "subtasks"
 
     id = Column(Integer, primary_key=True, index=True)
-    task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
+    task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False, index=True)
 
     title = Column(String, nullable=False)
     completed = Column(Boolean, default=False)
@@ -149,3 +177,370 @@ class TaskTag(Base):
 
     task_id = Column(Integer, ForeignKey("tasks.id"), primary_key=True)
     tag_id = Column(Integer, ForeignKey("tags.id"), primary_key=True)
+
+
+# =============================
+# PLANNER (precomputed weekly rotation)
+# =============================
+
+class PlannerEntry(Base):
+    """One row per (user, client) pair from ClientAssignment, carrying the
+    client's weekday and its open task totals. Kept in sync incrementally by
+    crud_utils.planner so GET /planner/week never aggregates over tasks."""
+    __tablename__ = "planner_entries"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    client_id = Column(Integer, ForeignKey("clients.id"), nullable=False, index=True)
+    weekday = Column(Integer, nullable=False)  # 0 = Monday ... 6 = Sunday
+
+    open_tasks = Column(Integer, nullable=False, default=0)
+    hours_due = Column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "client_id", name="uix_planner_user_client"),
+        Index("ix_planner_entries_user_weekday", "user_id", "weekday"),
+    )
+
+
+# =============================
+# DASHBOARD ROLLUPS
+# =============================
+
+class DashboardRollup(Base):
+    """Counter rows keyed by (scope, scope_id, metric, bucket).
+
+    scope is "all" (scope_id 0), "client" or "user". Metrics:
+      status     bucket = status name          -> tasks in that status
+      due        bucket = ISO due date         -> open tasks due that day
+      completed  bucket = "YYYY-MM"            -> tasks completed that month
+      subtasks   bucket = "open" / "completed" -> subtask counts
+    Maintained by crud_utils.rollups inside the task write transactions.
+    """
+    __tablename__ = "dashboard_rollups"
+
+    scope = Column(String, primary_key=True)
+    scope_id = Column(Integer, primary_key=True)
+    metric = Column(String, primary_key=True)
+    bucket = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+
+# =============================
+# RECURRING TASK DEFINITIONS
+# =============================
+
+class RecurrenceFrequency(str, enum.Enum):
+    daily = "daily"
+    weekly = "weekly"
+    monthly = "monthly"
+    yearly = "yearly"
+
+
+class RecurringTask(Base):
+    """A task template that repeats on a schedule. Occurrences are expanded
+    on the fly by utils.recurrence_engine (e.g. for the calendar)."""
+    __tablename__ = "recurring_tasks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    client_id = Column(Integer, ForeignKey("clients.id"), nullable=False)
+
+    title = Column(String, nullable=False)
+    description = Column(Text)
+    billable = Column(Boolean, default=False)
+    estimated_hours = Column(Float, nullable=True)
+    assigned_user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+
+    frequency = Column(String, nullable=False, default=RecurrenceFrequency.monthly.value)
+    interval = Column(Integer, nullable=False, default=1)
+    start_date = Column(DateTime, nullable=False)
+    until = Column(DateTime, nullable=True)
+    active = Column(Boolean, default=True)
+
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    client = relationship("Client")
+
+
+# =============================
+# EVENT BROKER OUTBOX
+# =============================
+
+class BrokerEvent(Base):
+    """Short-lived relay table used by utils.events.DatabaseBroker so push
+    events published by one worker reach subscribers on the others."""
+    __tablename__ = "broker_events"
+
+    id = Column(Integer, primary_key=True)
+    origin = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+# =============================
+# CHANGE LOG (delta sync)
+# =============================
+
+class ChangeLogEntry(Base):
+    """Append-only record of task/subtask/assignment/tag mutations.
+
+    version is AUTOINCREMENT so it never goes backwards, even after the
+    compaction job removes old rows. op is "upsert" or "delete"; deletes
+    are kept as tombstones until retention drops them. For task_tag rows
+    entity_id is the tag id and task_id says which task it was linked to.
+    """
+    __tablename__ = "change_log"
+
+    version = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(String, nullable=False)   # task, subtask, task_assignment, task_tag, tag
+    entity_id = Column(Integer, nullable=False)
+    task_id = Column(Integer, nullable=True)
+    client_id = Column(Integer, nullable=True)
+    op = Column(String, nullable=False)        # upsert / delete
+    changed_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+    __table_args__ = (
+        Index("ix_change_log_entity", "entity", "entity_id", "task_id"),
+        {"sqlite_autoincrement": True},
+    )
+
+
+class SyncState(Base):
+    """Small key/value table for sync bookkeeping (e.g. pruned_through)."""
+    __tablename__ = "sync_state"
+
+    key = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+
+# =============================
+# LEADER LEASES (multi-worker singletons)
+# =============================
+
+class Lease(Base):
+    """Time-limited lock row used by utils.leader so exactly one worker
+    (across processes and hosts sharing the database) runs singleton
+    duties such as the priority sweep. The holder renews expires_at; if it
+    dies, another worker takes over once the lease has expired."""
+    __tablename__ = "leases"
+
+    name = Column(String, primary_key=True)
+    holder = Column(String, nullable=False)
+    acquired_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+
+# =============================
+# ARCHIVE (completed tasks moved out of the hot tables)
+# =============================
+
+class ArchivedTask(Base):
+    """A completed task moved out of `tasks` by crud_utils.archive.
+
+    Keeps the task's id and the columns listing/export filter and sort on;
+    the description and the subtasks (JSON) are zlib-compressed. Assignments
+    and tags keep their own small tables so user/tag filters stay in SQL.
+    """
+    __tablename__ = "archived_tasks"
+
+    id = Column(Integer, primary_key=True)  # same id the task had
+    client_id = Column(Integer, nullable=False, index=True)
+    title = Column(String, nullable=False)
+    description_z = Column(LargeBinary, nullable=True)
+    subtasks_z = Column(LargeBinary, nullable=True)
+
+    status = Column(String, nullable=False)
+    due_date = Column(DateTime, nullable=True)
+    billable = Column(Boolean, default=False)
+    estimated_hours = Column(Float, nullable=True)
+
+    created_by = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    version = Column(Integer, nullable=False, default=1)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class ArchivedTaskAssignment(Base):
+    __tablename__ = "archived_task_assignments"
+
+    id = Column(Integer, primary_key=True)  # same id the assignment had
+    task_id = Column(Integer, ForeignKey("archived_tasks.id"), nullable=False, index=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    role = Column(String, nullable=True)
+
+
+class ArchivedTaskTag(Base):
+    __tablename__ = "archived_task_tags"
+
+    task_id = Column(Integer, ForeignKey("archived_tasks.id"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id"), primary_key=True)
+
+
+# =============================
+# ATTACHMENTS (content-addressed blobs on disk)
+# =============================
+
+class Attachment(Base):
+    """A file attached to a task. The bytes live in utils.blobstore under
+    their sha256, shared by every attachment with the same content.
+
+    task_id has no foreign key so attachments stay put when the task is
+    moved to the archive tables (the archived task keeps its id).
+    """
+    __tablename__ = "attachments"
+
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, nullable=False, index=True)
+    sha256 = Column(String(64), nullable=False, index=True)
+    filename = Column(String, nullable=False)
+    content_type = Column(String, nullable=False, default="application/octet-stream")
+    size = Column(Integer, nullable=False)
+    uploaded_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+# =============================
+# TIME TRACKING & BILLING ROLLUPS
+# =============================
+
+class TimeEntry(Base):
+    """Minutes a user worked on a task on a given day.
+
+    client_id and billable are copied from the task when the entry is
+    written, and task_id has no foreign key, so billing history stays
+    intact when the task is archived or deleted.
+    """
+    __tablename__ = "time_entries"
+
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, nullable=False, index=True)
+    client_id = Column(Integer, ForeignKey("clients.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    work_date = Column(Date, nullable=False)
+    minutes = Column(Integer, nullable=False)
+    billable = Column(Boolean, nullable=False, default=False)
+    note = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_time_entries_work_date_client", "work_date", "client_id"),
+        Index("ix_time_entries_user_work_date", "user_id", "work_date"),
+    )
+
+
+class BillingRollup(Base):
+    """Time totals per (month, client, user), maintained by
+    crud_utils.billing inside the time-entry write transactions, so the
+    month-end reports read a few hundred counter rows, never the entries."""
+    __tablename__ = "billing_rollups"
+
+    month = Column(String, primary_key=True)     # "YYYY-MM"
+    client_id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, primary_key=True)
+    minutes = Column(Integer, nullable=False, default=0)
+    billable_minutes = Column(Integer, nullable=False, default=0)
+    entries = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_billing_rollups_month_user", "month", "user_id"),
+    )
+
+
+# =============================
+# TASK DEPENDENCIES (blocked-by graph + closure)
+# =============================
+
+class TaskDependency(Base):
+    """Edge: task_id is blocked by depends_on_id."""
+    __tablename__ = "task_dependencies"
+
+    task_id = Column(Integer, ForeignKey("tasks.id"), primary_key=True)
+    depends_on_id = Column(Integer, ForeignKey("tasks.id"), primary_key=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class TaskReachability(Base):
+    """Transitive closure of task_dependencies: descendant_id is (directly
+    or indirectly) blocked by ancestor_id, through `paths` distinct paths.
+    Counting paths lets crud_utils.dependencies remove an edge without
+    recomputing the graph; a row goes away when its count reaches zero."""
+    __tablename__ = "task_reachability"
+
+    ancestor_id = Column(Integer, primary_key=True)
+    descendant_id = Column(Integer, primary_key=True, index=True)
+    paths = Column(Integer, nullable=False, default=0)
+
+
+# =============================
+# SAVED VIEWS (per-user filters + precomputed membership)
+# =============================
+
+class SavedView(Base):
+    """A user's named task filter. `filters` is the canonical JSON from
+    crud_utils.views.normalize(); client_id is copied out of it so the
+    write path only loads the views a task could belong to."""
+    __tablename__ = "saved_views"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    name = Column(String, nullable=False)
+    filters = Column(Text, nullable=False, default="{}")
+    client_id = Column(Integer, nullable=True, index=True)
+    last_opened_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "name", name="uq_saved_views_user_name"),
+    )
+
+
+class SavedViewMember(Base):
+    """A task matching a view's write-time predicates. changed_at is the
+    last write to the task while it was a member; rows changed after the
+    view's last_opened_at are its unread count."""
+    __tablename__ = "saved_view_members"
+
+    view_id = Column(Integer, ForeignKey("saved_views.id"), primary_key=True)
+    task_id = Column(Integer, primary_key=True, index=True)
+    changed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+# =============================
+# DAILY DIGEST DELIVERIES
+# =============================
+
+class DigestDelivery(Base):
+    """One row per (user, digest day) the digest job tried to send.
+    status is "sent" or "failed"; failed rows are retried (attempts counts
+    the tries) and sent ones are never sent again."""
+    __tablename__ = "digest_deliveries"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    digest_date = Column(Date, nullable=False, index=True)
+    sent_at = Column(DateTime, nullable=False, default=datetime.utcnow)   # last attempt
+    items = Column(Integer, nullable=False, default=0)
+    sender = Column(String, nullable=False)
+    message_id = Column(String, nullable=True)
+    status = Column(String, nullable=False, default="sent", server_default="sent")
+    attempts = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "digest_date", name="uq_digest_deliveries_user_date"),
+    )
+
+
+class DigestRun(Base):
+    """One row per digest day, written when its run starts. Later runs for
+    the day only retry failed sends, and only ever look at work assigned
+    before started_at, so nobody gets a "morning" digest in the afternoon."""
+    __tablename__ = "digest_runs"
+
+    digest_date = Column(Date, primary_key=True)
+    started_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
@@ -6,7 +6,11 @@ from backend.app.schemas.permissions import RoleCreate, RoleOut, PermissionBase,
 from backend.app.models import Role, Permission, RolePermission, User
 from backend.app.utils.permissions import require_permission
 from backend.app.utils.security import get_current_user
-from backend.app.schemas.roles import RoleCreate, RoleOut, RoleUpdate
+from backend.app.schemas.roles import (
+    RoleCreate, RoleOut, RoleUpdate, PermissionMatrix, PermissionMatrixUpdate, PermissionMatrixResult,
+)
+from backend.app.crud_utils import roles as role_crud, visibility
+from backend.app.crud_utils.roles import UnknownIds
 from typing import List, Dict
 
 router = APIRouter()  # no prefix here — main.py will attach prefix="/admin"
@@ -40,38 +44,48 @@ def create_role(
         db.add(rp)
 
     db.commit()
-    db.refresh(new_role)
 
-    # Return role (SQLAlchemy model) — response_model will convert via ORM mode
-    return new_role
+    return role_crud.roles_with_permissions(db, [new_role.id])[0]
 
 @router.get("/roles", response_model=List[RoleOut], tags=["Admin Permissions"])
 def get_roles(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("manage_roles"))
 ):
-    roles = db.query(Role).all()
-
-    output = []
-    for role in roles:
-        permission_objects = [
-            PermissionOut(
-                id=rp.permission.id,
-                name=rp.permission.name,
-                description=rp.permission.description
-            )
-            for rp in role.permissions
-        ]
-
-        output.append(
-            RoleOut(
-                id=role.id,
-                name=role.name,
-                permissions=permission_objects
-            )
-        )
+    return role_crud.roles_with_permissions(db)
+
+
+# ---------------------------------------------------
+# PERMISSION MATRIX
+# ---------------------------------------------------
+# The whole role x permission grid in three queries, and a diff over it
+# applied in one transaction.
+
+@router.get("/permissions/matrix", response_model=PermissionMatrix, tags=["Admin Permissions"])
+def get_permission_matrix(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("manage_roles"))
+):
+    return role_crud.permission_matrix(db)
+
+
+@router.patch("/permissions/matrix", response_model=PermissionMatrixResult, tags=["Admin Permissions"])
+def update_permission_matrix(
+    changes: PermissionMatrixUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("manage_roles"))
+):
+    grant = [(c.role_id, p) for c in changes.roles for p in c.grant]
+    revoke = [(c.role_id, p) for c in changes.roles for p in c.revoke]
+    try:
+        counts = role_crud.apply_grants(db, grant, revoke)
+    except UnknownIds as exc:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(exc))
+    db.commit()
+    return {**counts, "matrix": role_crud.permission_matrix(db)}
+
 
-    return output
 @router.post("/permissions", tags=["Admin Permissions"])
 def create_permission(
     permission: PermissionCreate,
@@ -142,41 +156,20 @@ def update_role(
             raise HTTPException(400, "A role with this name already exists")
         role.name = updates.name
 
-    # Add permissions
-    if updates.add_permissions:
-        for perm_id in updates.add_permissions:
-            exists = db.query(RolePermission).filter(
-                RolePermission.role_id == role.id,
-                RolePermission.permission_id == perm_id
-            ).first()
-            if not exists:
-                db.add(RolePermission(role_id=role.id, permission_id=perm_id))
-
-    # Remove permissions
-    if updates.remove_permissions:
-        db.query(RolePermission).filter(
-            RolePermission.role_id == role.id,
-            RolePermission.permission_id.in_(updates.remove_permissions)
-        ).delete(synchronize_session=False)
+    # Add / remove permissions (one INSERT and one DELETE)
+    try:
+        role_crud.apply_grants(
+            db,
+            [(role.id, perm_id) for perm_id in updates.add_permissions or []],
+            [(role.id, perm_id) for perm_id in updates.remove_permissions or []],
+        )
+    except UnknownIds as exc:
+        db.rollback()
+        raise HTTPException(400, str(exc))
 
     db.commit()
-    db.refresh(role)
-
-    
-    permission_objects = [
-        PermissionOut(
-            id=rp.permission.id,
-            name=rp.permission.name,
-            description=rp.permission.description
-        )
-        for rp in role.permissions
-    ]
 
-    return RoleOut(
-        id=role.id,
-        name=role.name,
-        permissions=permission_objects
-    )
+    return role_crud.roles_with_permissions(db, [role.id])[0]
 
 @router.patch("/users/{user_id}/role", response_model=Dict)
 def set_user_role(
@@ -204,5 +197,6 @@ def set_user_role(
     user.role_id = role_id
     db.commit()
     db.refresh(user)
+    visibility.invalidate([user.id])
 
     return {"id": user.id, "email": user.email, "role_id": user.role_id, "role_name": role.name}
@@ -0,0 +1,131 @@
+import logging
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import List
+
+from backend.app.database import get_db
+from backend.app import crud_utils
+from backend.app.auth import get_current_user
+from backend.app.models import User
+from backend.app.schemas.tasks import AttachmentOut
+from backend.app.utils import blobstore
+from backend.app.utils.file_responses import ranged_file_response
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/attachments", tags=["Attachments"])
+
+
+def _check_task_visible(db: Session, current_user: User, task_id: int):
+    # Attachments outlive archival, so the archive counts too
+    if not crud_utils.visibility.can_see_id(db, crud_utils.visibility.for_user(db, current_user), task_id):
+        raise HTTPException(status_code=404, detail="Task not found")
+
+
+def _visible_attachment(db: Session, current_user: User, attachment_id: int):
+    attachment = crud_utils.tasks.get_attachment(db, attachment_id)
+    if not attachment or not crud_utils.visibility.can_see_id(
+        db, crud_utils.visibility.for_user(db, current_user), attachment.task_id
+    ):
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    return attachment
+
+
+# ---------------------------------------------------
+# LIST ATTACHMENTS OF A TASK
+# ---------------------------------------------------
+
+@router.get("/", response_model=List[AttachmentOut])
+def list_attachments(
+    task_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    _check_task_visible(db, current_user, task_id)
+    return crud_utils.tasks.list_attachments(db, task_id)
+
+
+# ---------------------------------------------------
+# UPLOAD (raw request body, streamed to disk)
+# ---------------------------------------------------
+# The body is the file itself, e.g.
+#   fetch(`/attachments/?task_id=7&filename=${encodeURIComponent(f.name)}`,
+#         {method: "POST", body: f, headers: {"Content-Type": f.type}})
+# It is hashed and written in chunks as it arrives; nothing is buffered.
+
+@router.post("/", response_model=AttachmentOut, status_code=201)
+async def upload_attachment(
+    request: Request,
+    task_id: int,
+    filename: str = Query(..., min_length=1, max_length=255),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if not await run_in_threadpool(crud_utils.visibility.visible_task, db, current_user, task_id):
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > blobstore.MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"Attachment exceeds {blobstore.MAX_BYTES} bytes")
+
+    try:
+        sha256, size = await blobstore.store(request.stream())
+    except blobstore.TooLarge as exc:
+        raise HTTPException(status_code=413, detail=str(exc))
+
+    name = os.path.basename(filename.replace("\\", "/")) or "attachment"
+    content_type = request.headers.get("content-type") or "application/octet-stream"
+    attachment = await run_in_threadpool(
+        crud_utils.tasks.add_attachment, db, task_id, sha256, size, name, content_type, current_user.id
+    )
+    if not attachment:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return attachment
+
+
+# ---------------------------------------------------
+# DOWNLOAD (Range / If-None-Match aware)
+# ---------------------------------------------------
+
+@router.get("/{attachment_id}")
+def download_attachment(
+    attachment_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    attachment = _visible_attachment(db, current_user, attachment_id)
+
+    path = blobstore.path_for(attachment.sha256)
+    if not path.exists():
+        logger.error("Attachment %s: blob %s missing from %s", attachment.id, attachment.sha256, blobstore.ATTACHMENT_DIR)
+        raise HTTPException(status_code=404, detail="Attachment content missing")
+
+    # Content-addressed: the bytes behind this ETag can never change
+    return ranged_file_response(
+        request,
+        path,
+        etag=attachment.sha256,
+        media_type=attachment.content_type,
+        filename=attachment.filename,
+        immutable=True,
+    )
+
+
+# ---------------------------------------------------
+# DELETE
+# ---------------------------------------------------
+
+@router.delete("/{attachment_id}", status_code=204)
+def delete_attachment(
+    attachment_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    _visible_attachment(db, current_user, attachment_id)
+    if not crud_utils.tasks.delete_attachment(db, attachment_id):
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    return
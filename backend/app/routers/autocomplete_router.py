@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List
+
+from backend.app.database import get_db
+from backend.app import crud_utils
+from backend.app.auth import get_current_user
+from backend.app.models import User
+from backend.app.schemas.autocomplete import AutocompleteItem, AutocompleteKind
+from backend.app.utils.fastjson import FastJSONResponse
+
+router = APIRouter(prefix="/autocomplete", tags=["Autocomplete"])
+
+
+# ---------------------------------------------------
+# TYPEAHEAD (in-memory index, no SQL once built)
+# ---------------------------------------------------
+
+@router.get("/{kind}", response_model=List[AutocompleteItem])
+def autocomplete(
+    kind: AutocompleteKind,
+    q: str = Query("", max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Prefix matches first, then close spellings; most used first.
+    An empty q returns the most used entries."""
+    return FastJSONResponse(crud_utils.autocomplete.search(
+        db, kind.value, q, limit, visible=crud_utils.visibility.for_user(db, current_user)
+    ))
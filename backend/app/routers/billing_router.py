@@ -0,0 +1,90 @@
+import calendar
+import csv
+import io
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from backend.app.database import get_db
+from backend.app import crud_utils
+from backend.app.schemas.billing import BillingSummaryOut
+from backend.app.models import User
+from backend.app.utils.permissions import require_permission
+
+router = APIRouter(prefix="/billing", tags=["Billing"])
+
+MONTH_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
+
+
+def _month_bounds(month: str):
+    year, mon = int(month[:4]), int(month[5:7])
+    return date(year, mon, 1), date(year, mon, calendar.monthrange(year, mon)[1])
+
+
+# ---------------------------------------------------
+# MONTHLY SUMMARY (reads billing_rollups only)
+# ---------------------------------------------------
+
+@router.get("/summary", response_model=BillingSummaryOut)
+def billing_summary(
+    month: str = Query(None, regex=MONTH_PATTERN),  # default: current month
+    group_by: str = Query("client", regex="^(client|user)$"),
+    client_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("view_billing")),
+):
+    month = month or datetime.utcnow().strftime("%Y-%m")
+    return crud_utils.billing.summary(db, month, group_by=group_by, client_id=client_id, user_id=user_id)
+
+
+# ---------------------------------------------------
+# EXPORT (CSV of the period's entries, streamed)
+# ---------------------------------------------------
+
+@router.get("/export")
+def billing_export(
+    month: Optional[str] = Query(None, regex=MONTH_PATTERN),
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    client_id: Optional[int] = None,
+    billable_only: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("view_billing")),
+):
+    if month:
+        start, end = _month_bounds(month)
+    if not start or not end:
+        raise HTTPException(status_code=400, detail="Give month=YYYY-MM or both start and end")
+
+    rows = crud_utils.billing.export_rows(db, start, end, client_id=client_id, billable_only=billable_only)
+
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(crud_utils.billing.EXPORT_HEADER)
+        for i, row in enumerate(rows, 1):
+            writer.writerow(row)
+            if i % 500 == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    filename = f"billing-{month or f'{start}_{end}'}.csv"
+    return StreamingResponse(
+        generate(),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/rebuild")
+def rebuild_billing(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("manage_tasks")),
+):
+    rows = crud_utils.billing.rebuild_billing(db)
+    return {"message": "Billing rollups rebuilt", "rows": rows}
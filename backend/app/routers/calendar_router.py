@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date
+
+from backend.app.database import get_db
+from backend.app import crud_utils
+from backend.app.schemas.calendar import CalendarOut
+from backend.app.auth import get_current_user
+from backend.app.models import User
+
+router = APIRouter(prefix="/calendar", tags=["Calendar"])
+
+MAX_WINDOW_DAYS = 92  # a quarter; a month view is ~42 days
+
+
+@router.get("/", response_model=CalendarOut)
+def get_calendar(
+    start: date,
+    end: date,
+    user_id: Optional[int] = None,
+    per_day: int = Query(crud_utils.calendar.DEFAULT_CARDS_PER_DAY, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must be on or after start")
+    if (end - start).days > MAX_WINDOW_DAYS:
+        raise HTTPException(status_code=400, detail=f"Window is limited to {MAX_WINDOW_DAYS} days")
+
+    return crud_utils.calendar.calendar_range(
+        db, start, end, user_id=user_id, per_day=per_day,
+        visible=crud_utils.visibility.for_user(db, current_user),
+    )
@@ -0,0 +1,111 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import List
+
+from backend.app.database import get_db
+from backend.app import crud_utils
+from backend.app.schemas.clients import ClientCreate, ClientUpdate, ClientOut
+from backend.app.schemas.tasks import CriticalPathOut
+from backend.app.auth import get_current_user
+from backend.app.utils.permissions import require_permission
+
+router = APIRouter(prefix="/clients", tags=["Clients"])
+
+
+# ---------------------------------------------------
+# LIST / GET CLIENTS
+# ---------------------------------------------------
+
+@router.get("/", response_model=List[ClientOut])
+def list_clients(
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    return crud_utils.clients.list_clients(db)
+
+
+@router.get("/{client_id}", response_model=ClientOut)
+def get_client(
+    client_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    client = crud_utils.clients.get_client(db, client_id)
+    if not client:
+        raise HTTPException(status_code=404, detail="Client not found")
+    return client
+
+
+# ---------------------------------------------------
+# CREATE / UPDATE CLIENT
+# ---------------------------------------------------
+
+@router.post("/", response_model=ClientOut)
+def create_client(
+    client_data: ClientCreate,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_permission("manage_tasks")),
+):
+    return crud_utils.clients.create_client(db, client_data)
+
+
+@router.patch("/{client_id}", response_model=ClientOut)
+def update_client(
+    client_id: int,
+    updates: ClientUpdate,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_permission("manage_tasks")),
+):
+    client = crud_utils.clients.update_client(db, client_id, updates)
+    if not client:
+        raise HTTPException(status_code=404, detail="Client not found")
+    return client
+
+
+# ---------------------------------------------------
+# ASSIGN USERS TO CLIENT
+# ---------------------------------------------------
+# Client membership decides which tasks a user can read
+# (crud_utils.visibility), so only task managers change it.
+
+@router.post("/{client_id}/assign/{user_id}")
+def assign_user_to_client(
+    client_id: int,
+    user_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_permission("manage_tasks")),
+):
+    if not crud_utils.clients.get_client(db, client_id):
+        raise HTTPException(status_code=404, detail="Client not found")
+    assignment = crud_utils.clients.assign_user_to_client(db, client_id, user_id)
+    return {"message": "User assigned", "assignment_id": assignment.id}
+
+
+@router.delete("/{client_id}/assign/{user_id}")
+def unassign_user_from_client(
+    client_id: int,
+    user_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(require_permission("manage_tasks")),
+):
+    success = crud_utils.clients.unassign_user_from_client(db, client_id, user_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Assignment not found")
+    return {"message": "User removed"}
+
+
+# ---------------------------------------------------
+# CRITICAL PATH (longest chain of open, dependent tasks)
+# ---------------------------------------------------
+
+@router.get("/{client_id}/critical-path", response_model=CriticalPathOut)
+def get_critical_path(
+    client_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    # Covers every open task of the client, so it needs the client itself
+    visible = crud_utils.visibility.for_user(db, current_user)
+    if not crud_utils.clients.get_client(db, client_id) or not crud_utils.visibility.can_see_client(visible, client_id):
+        raise HTTPException(status_code=404, detail="Client not found")
+    return crud_utils.dependencies.critical_path(db, client_id)
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from backend.app.database import get_db
+from backend.app import crud_utils
+from backend.app.schemas.dashboard import DashboardSummaryOut
+from backend.app.auth import get_current_user
+from backend.app.models import User
+from backend.app.utils.permissions import require_permission
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+
+# ---------------------------------------------------
+# SUMMARY (reads dashboard_rollups only)
+# ---------------------------------------------------
+
+@router.get("/summary", response_model=DashboardSummaryOut)
+def get_summary(
+    user_id: Optional[int] = None,
+    client_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Task visibility (crud_utils.visibility) applies to the counts too:
+    a client's numbers need the client, another user's need the right to
+    see every task, and the unfiltered summary of a restricted user adds
+    up their visible clients rather than the whole firm."""
+    visible = crud_utils.visibility.for_user(db, current_user)
+    if client_id:
+        if not crud_utils.visibility.can_see_client(visible, client_id):
+            raise HTTPException(status_code=404, detail="Client not found")
+        return crud_utils.rollups.summary(db, scope="client", scope_id=client_id)
+    if user_id:
+        if user_id != current_user.id and not visible.everything:
+            raise HTTPException(status_code=403, detail="Permission denied")
+        return crud_utils.rollups.summary(db, scope="user", scope_id=user_id)
+    if not visible.everything:
+        return crud_utils.rollups.summary(db, scope="client", scope_ids=visible.client_ids)
+    return crud_utils.rollups.summary(db)
+
+
+@router.post("/rebuild")
+def rebuild_rollups(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("manage_tasks")),
+):
+    rows = crud_utils.rollups.rebuild_rollups(db)
+    return {"message": "Dashboard rollups rebuilt", "rows": rows}
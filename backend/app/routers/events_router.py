@@ -0,0 +1,72 @@
+import json
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import Optional
+
+from backend.app.auth import get_current_user
+from backend.app.crud_utils import visibility
+from backend.app.database import SessionLocal
+from backend.app.utils.events import get_broker
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+HEARTBEAT_SECONDS = 15
+
+
+def _authenticate(request: Request) -> visibility.Visibility:
+    # Not Depends(get_current_user): its yield-based get_db would keep a
+    # pooled connection (and a read transaction) open for as long as the
+    # stream runs. Check the token on a session of our own and let go.
+    db = SessionLocal()
+    try:
+        return visibility.for_user(db, get_current_user(request, db))
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------
+# TASK CHANGE STREAM (Server-Sent Events)
+# ---------------------------------------------------
+
+@router.get("/tasks")
+async def stream_task_events(
+    request: Request,
+    client_id: Optional[int] = None,
+    assignee_id: Optional[int] = None,
+):
+    """
+    text/event-stream of compact task change events:
+        {"type": "task.updated", "task_id": 12, "client_id": 3,
+         "assignees": [4], "fields": ["status"], "version": 7, "ts": "..."}
+    A {"type": "resync"} event means events were dropped for this
+    connection and the client should refetch.
+    Only tasks the user may read (crud_utils.visibility) are streamed.
+    """
+    visible = await run_in_threadpool(_authenticate, request)
+    if client_id and not visibility.can_see_client(visible, client_id):
+        raise HTTPException(status_code=404, detail="Client not found")
+    broker = get_broker()
+    subscription = broker.subscribe(client_id=client_id, assignee_id=assignee_id, visible=visible)
+
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                if await request.is_disconnected():
+                    break
+                event = await subscription.get(timeout=HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ": ping\n\n"
+                    continue
+                payload = json.dumps(event, default=str)
+                event_id = f"id: {event['version']}\n" if "version" in event else ""
+                yield f"{event_id}event: {event['type']}\ndata: {payload}\n\n"
+        finally:
+            broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
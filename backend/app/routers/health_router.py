@@ -0,0 +1,34 @@
+import os
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+
+from backend.app.database import SessionLocal
+
+router = APIRouter(tags=["Health"])
+
+
+# ---------------------------------------------------
+# LOAD BALANCER / ORCHESTRATOR PROBE
+# ---------------------------------------------------
+
+@router.get("/healthz", include_in_schema=False)
+def healthz():
+    from backend.app.startup import leader
+
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT 1"))
+        database = "ok"
+    except Exception:
+        database = "unavailable"
+    finally:
+        db.close()
+
+    body = {
+        "status": "ok" if database == "ok" else "degraded",
+        "database": database,
+        "pid": os.getpid(),
+        "leader": leader.is_leader,
+    }
+    return JSONResponse(body, status_code=200 if database == "ok" else 503)
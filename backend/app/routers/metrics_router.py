@@ -0,0 +1,24 @@
+import os
+import secrets
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from typing import Optional
+
+from backend.app.utils import metrics
+
+router = APIRouter(tags=["Metrics"])
+
+# Optional shared secret for the scraper; unset means open (keep /metrics
+# off the public ingress in that case).
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+
+# ---------------------------------------------------
+# PROMETHEUS SCRAPE ENDPOINT
+# ---------------------------------------------------
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics(authorization: Optional[str] = Header(None)):
+    if METRICS_TOKEN and not secrets.compare_digest(authorization or "", f"Bearer {METRICS_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from backend.app.database import get_db
+from backend.app import crud_utils
+from backend.app.schemas.planner import PlannerUserOut
+from backend.app.auth import get_current_user
+from backend.app.models import User
+from backend.app.utils.permissions import require_permission
+
+router = APIRouter(prefix="/planner", tags=["Planner"])
+
+
+# ---------------------------------------------------
+# WEEKLY PLANNER
+# ---------------------------------------------------
+
+@router.get("/week", response_model=List[PlannerUserOut])
+def get_week(
+    user_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    # Rows come straight from planner_entries and are already plain dicts,
+    # so skip response_model re-validation (the schema still documents it).
+    return JSONResponse(crud_utils.planner.get_week(
+        db, user_id=user_id, visible=crud_utils.visibility.for_user(db, current_user)
+    ))
+
+
+@router.post("/rebuild")
+def rebuild_planner(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("manage_tasks")),
+):
+    rows = crud_utils.planner.rebuild_planner(db)
+    return {"message": "Planner rebuilt", "entries": rows}
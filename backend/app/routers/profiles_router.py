@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from backend.app.models import User
+from backend.app.utils import profiling
+from backend.app.utils.permissions import require_permission
+
+router = APIRouter(prefix="/admin/profiles", tags=["Admin Profiling"])
+
+
+# ---------------------------------------------------
+# STORED REQUEST PROFILES
+# ---------------------------------------------------
+# Reports are produced by sending a request with `X-Profile: cpu[,memory]`
+# (or `?_profile=cpu`); the response's X-Profile-Id header names the report.
+
+@router.get("/")
+def list_profiles(
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(require_permission(profiling.PROFILE_PERMISSION)),
+):
+    return profiling.list_reports(limit=limit)
+
+
+@router.get("/{profile_id}")
+def get_profile(
+    profile_id: str,
+    current_user: User = Depends(require_permission(profiling.PROFILE_PERMISSION)),
+):
+    report = profiling.load_report(profile_id)
+    if not report:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return report
+
+
+@router.delete("/{profile_id}", status_code=204)
+def delete_profile(
+    profile_id: str,
+    current_user: User = Depends(require_permission(profiling.PROFILE_PERMISSION)),
+):
+    if not profiling.delete_report(profile_id):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return None
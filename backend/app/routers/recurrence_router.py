@@ -0,0 +1,69 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from backend.app.database import get_db
+from backend.app import crud_utils
+from backend.app.schemas.recurrence import RecurringTaskCreate, RecurringTaskUpdate, RecurringTaskOut
+from backend.app.auth import get_current_user
+
+router = APIRouter(prefix="/recurrences", tags=["Recurring Tasks"])
+
+
+def _check_client_visible(db: Session, current_user, client_id: int):
+    """Definitions materialise tasks in their client, so writing one
+    needs the client itself (crud_utils.visibility)."""
+    if not crud_utils.visibility.can_see_client(crud_utils.visibility.for_user(db, current_user), client_id):
+        raise HTTPException(status_code=404, detail="Client not found")
+
+
+def _visible_definition(db: Session, current_user, recurring_id: int):
+    definition = crud_utils.recurrence.get_recurring_task(db, recurring_id)
+    if not definition or not crud_utils.visibility.can_see_recurring(
+        crud_utils.visibility.for_user(db, current_user), definition
+    ):
+        raise HTTPException(status_code=404, detail="Recurring task not found")
+    return definition
+
+
+@router.post("/", response_model=RecurringTaskOut)
+def create_recurring_task(
+    data: RecurringTaskCreate,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    _check_client_visible(db, current_user, data.client_id)
+    return crud_utils.recurrence.create_recurring_task(db, data, creator_id=current_user.id)
+
+
+@router.get("/", response_model=List[RecurringTaskOut])
+def list_recurring_tasks(
+    client_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    return crud_utils.recurrence.list_recurring_tasks(
+        db, client_id=client_id, visible=crud_utils.visibility.for_user(db, current_user)
+    )
+
+
+@router.patch("/{recurring_id}", response_model=RecurringTaskOut)
+def update_recurring_task(
+    recurring_id: int,
+    updates: RecurringTaskUpdate,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    _visible_definition(db, current_user, recurring_id)
+    return crud_utils.recurrence.update_recurring_task(db, recurring_id, updates)
+
+
+@router.delete("/{recurring_id}", status_code=204)
+def delete_recurring_task(
+    recurring_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    _visible_definition(db, current_user, recurring_id)
+    crud_utils.recurrence.delete_recurring_task(db, recurring_id)
+    return
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, Query
+
+from backend.app.models import User
+from backend.app.utils import slow_queries
+from backend.app.utils.permissions import require_permission
+
+router = APIRouter(prefix="/admin/slow-queries", tags=["Admin Profiling"])
+
+
+# ---------------------------------------------------
+# SLOW-QUERY LOG (this worker's aggregates)
+# ---------------------------------------------------
+
+@router.get("/")
+def top_slow_queries(
+    limit: int = Query(20, ge=1, le=500),
+    order: str = Query("total", regex="^(total|max|count)$"),
+    current_user: User = Depends(require_permission("profile_requests")),
+):
+    """Statement shapes over SLOW_QUERY_MS, worst first, with the routes
+    that issued them and the plan captured the first time each was seen."""
+    return {
+        "threshold_ms": slow_queries.SLOW_QUERY_MS,
+        "queries": slow_queries.top(limit=limit, order=order),
+    }
+
+
+@router.delete("/", status_code=204)
+def reset_slow_queries(
+    current_user: User = Depends(require_permission("profile_requests")),
+):
+    slow_queries.reset()
+    return None
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from backend.app.database import get_db
+from backend.app import crud_utils
+from backend.app.schemas.sync import SyncOut
+from backend.app.auth import get_current_user
+from backend.app.models import User
+from backend.app.utils.permissions import require_permission
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+
+# ---------------------------------------------------
+# DELTA SYNC
+# ---------------------------------------------------
+
+@router.get("/", response_model=SyncOut)
+def sync(
+    since: Optional[int] = None,
+    limit: int = Query(1000, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Changes after version `since`, one entry per changed row. Call without
+    `since` (or when told to reset) after a full load to get a cursor.
+    Keep calling while has_more is true. Tasks the caller can't see
+    (crud_utils.visibility) come back as tombstones.
+    """
+    return crud_utils.changelog.changes_since(
+        db, since, limit=limit, visible=crud_utils.visibility.for_user(db, current_user)
+    )
+
+
+@router.post("/compact")
+def compact_change_log(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("manage_tasks")),
+):
+    result = crud_utils.changelog.compact(db, retention_days=crud_utils.changelog.RETENTION_DAYS)
+    return {"message": "Change log compacted", **result}
@@ -1,23 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException
+import csv
+import io
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 
 from backend.app.database import get_db
 from backend.app import crud_utils
 from backend.app.schemas.tasks import (
     TaskCreate,
+    TaskBulkCreate,
     TaskUpdate,
     TaskOut,
     SubtaskCreate,
     SubtaskUpdate,
     SubtaskOut,
+    TaskDependenciesOut,
+    DependencyTaskOut,
 )
 from backend.app.auth import get_current_user
-from typing import List, Optional
+from backend.app.crud_utils.dependencies import DependencyCycle
+from backend.app.utils.permissions import require_permission
+from typing import Dict, List, Optional
 from backend.app.models import User
+from backend.app.utils.fastjson import FastJSONResponse
 from datetime import datetime
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
 
+def _visible_task(db: Session, current_user: User, task_id: int):
+    """404 for missing tasks and for tasks hidden from the caller
+    (crud_utils.visibility), on every /tasks/{task_id} route."""
+    task = crud_utils.visibility.visible_task(db, current_user, task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+
+def _visible_subtask(db: Session, current_user: User, subtask_id: int):
+    subtask = crud_utils.tasks.get_subtask(db, subtask_id)
+    if not subtask or not crud_utils.visibility.visible_task(db, current_user, subtask.task_id):
+        raise HTTPException(status_code=404, detail="Subtask not found")
+    return subtask
+
+
 # ---------------------------------------------------
 # CREATE TASK
 # ---------------------------------------------------
@@ -32,6 +57,17 @@ def create_task(
     return task
 
 
+@router.post("/bulk", response_model=List[TaskOut])
+def create_tasks_bulk(
+    payload: TaskBulkCreate,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """Create up to 500 tasks in one transaction (all or nothing).
+    auto_assign spreads them across the client's members by load."""
+    return crud_utils.tasks.create_tasks(db, payload.tasks, creator_id=current_user.id)
+
+
 # ---------------------------------------------------
 # LIST TASKS
 # ---------------------------------------------------
@@ -54,9 +90,12 @@ def list_tasks(
 
     # SORTING
     sort_by: Optional[str] = "created_at",  # created_at, updated_at, due_date, title
-    sort_dir: Optional[str] = "desc"        # asc or desc
+    sort_dir: Optional[str] = "desc",       # asc or desc
+
+    # Also read completed tasks moved to the archive tables
+    include_archived: bool = False,
 ):
-    tasks = crud_utils.tasks.list_tasks(
+    body = crud_utils.tasks.list_tasks_json(
         db=db,
         statuses=statuses,
         client_id=client_id,
@@ -67,19 +106,88 @@ def list_tasks(
         search=search,
         sort_by=sort_by,
         sort_dir=sort_dir,
+        include_archived=include_archived,
+        visible=crud_utils.visibility.for_user(db, current_user),
+    )
+    # Serialized TaskOut dicts, possibly straight from the result cache
+    return Response(content=body, media_type="application/json")
+
+
+# ---------------------------------------------------
+# EXPORT (CSV, streamed)
+# ---------------------------------------------------
+
+@router.get("/export")
+def export_tasks(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    statuses: Optional[str] = None,
+    client_id: Optional[int] = None,
+    assigned_user_id: Optional[int] = None,
+    billable: Optional[bool] = None,
+    due_before: Optional[datetime] = None,
+    due_after: Optional[datetime] = None,
+    tags: Optional[str] = None,
+    search: Optional[str] = None,
+    include_archived: bool = False,
+):
+    rows = crud_utils.tasks.export_task_rows(
+        db=db,
+        statuses=statuses,
+        client_id=client_id,
+        assigned_user_id=assigned_user_id,
+        billable=billable,
+        due_before=due_before,
+        due_after=due_after,
+        tags=tags,
+        search=search,
+        sort_by="id",
+        sort_dir="asc",
+        include_archived=include_archived,
+        visible=crud_utils.visibility.for_user(db, current_user),
     )
-    return tasks
+
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(crud_utils.task_rows.EXPORT_HEADER)
+        for i, row in enumerate(rows, 1):
+            writer.writerow(row)
+            if i % 500 == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="tasks.csv"'},
+    )
+# ---------------------------------------------------
+# MY TASKS INBOX
+# ---------------------------------------------------
+
+@router.get("/inbox", response_model=List[TaskOut])
+def get_inbox(
+    limit: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    # Open tasks assigned to the caller, most urgent first
+    return crud_utils.tasks.inbox(db, current_user.id, limit=limit)
+
 # ---------------------------------------------------
 # KANBAN VIEW
 # ---------------------------------------------------
 
-@router.get("/kanban")
+@router.get("/kanban", response_model=Dict[str, List[TaskOut]])
 def get_kanban_board(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
-    board = crud_utils.tasks.kanban_board(db)
-    return board
+    board = crud_utils.tasks.kanban_board_dicts(db, visible=crud_utils.visibility.for_user(db, current_user))
+    return FastJSONResponse(board)
 
 # ---------------------------------------------------
 # GET SINGLE TASK
@@ -91,10 +199,7 @@ def get_task(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    task = crud_utils.tasks.get_task(db, task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    return task
+    return _visible_task(db, current_user, task_id)
 
 
 # ---------------------------------------------------
@@ -108,6 +213,7 @@ def update_task(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
+    _visible_task(db, current_user, task_id)
     task = crud_utils.tasks.update_task(db, task_id, updates)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -124,6 +230,7 @@ def delete_task(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
+    _visible_task(db, current_user, task_id)
     deleted = crud_utils.tasks.delete_task(db, task_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -141,6 +248,7 @@ def assign_user_to_task(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
+    _visible_task(db, current_user, task_id)
     assignment = crud_utils.tasks.add_user_to_task(db, task_id, user_id)
     return {"message": "User assigned", "assignment_id": assignment.id}
 
@@ -152,6 +260,7 @@ def remove_user_from_task(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
+    _visible_task(db, current_user, task_id)
     success = crud_utils.tasks.remove_user_from_task(db, task_id, user_id)
     if not success:
         raise HTTPException(status_code=404, detail="Assignment not found")
@@ -169,6 +278,7 @@ def add_subtask(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
+    _visible_task(db, current_user, task_id)
     subtask = crud_utils.tasks.add_subtask(db, task_id, subtask_data)
     return subtask
 
@@ -180,6 +290,7 @@ def update_subtask(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
+    _visible_subtask(db, current_user, subtask_id)
     updated = crud_utils.tasks.update_subtask(
         db,
         subtask_id,
@@ -197,7 +308,83 @@ def delete_subtask(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
+    _visible_subtask(db, current_user, subtask_id)
     deleted = crud_utils.tasks.delete_subtask(db, subtask_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Subtask not found")
-    return
\ No newline at end of file
+    return
+
+
+# ---------------------------------------------------
+# DEPENDENCIES ("task_id is blocked by depends_on_id")
+# ---------------------------------------------------
+
+@router.post("/dependencies/rebuild")
+def rebuild_dependency_closure(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("manage_tasks")),
+):
+    rows = crud_utils.dependencies.rebuild_closure(db)
+    return {"message": "Dependency closure rebuilt", "rows": rows}
+
+
+@router.get("/{task_id}/dependencies", response_model=TaskDependenciesOut)
+def get_dependencies(
+    task_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    _visible_task(db, current_user, task_id)
+    visible = crud_utils.visibility.for_user(db, current_user)
+    return {
+        "task_id": task_id,
+        "blocked_by": crud_utils.dependencies.blocked_by(db, task_id, visible=visible),
+        "blocks": crud_utils.dependencies.blocks(db, task_id, visible=visible),
+    }
+
+
+@router.post("/{task_id}/dependencies/{depends_on_id}", response_model=TaskDependenciesOut)
+def add_dependency(
+    task_id: int,
+    depends_on_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    _visible_task(db, current_user, task_id)
+    _visible_task(db, current_user, depends_on_id)
+    try:
+        task = crud_utils.tasks.add_dependency(db, task_id, depends_on_id)
+    except DependencyCycle as exc:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=str(exc))
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return get_dependencies(task_id, db, current_user)
+
+
+@router.delete("/{task_id}/dependencies/{depends_on_id}", status_code=204)
+def remove_dependency(
+    task_id: int,
+    depends_on_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    _visible_task(db, current_user, task_id)
+    _visible_task(db, current_user, depends_on_id)
+    if not crud_utils.tasks.remove_dependency(db, task_id, depends_on_id):
+        raise HTTPException(status_code=404, detail="Dependency not found")
+    return
+
+
+@router.get("/{task_id}/downstream", response_model=List[DependencyTaskOut])
+def get_downstream(
+    task_id: int,
+    include_completed: bool = True,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """Every task transitively blocked by this one (that the caller can see)."""
+    _visible_task(db, current_user, task_id)
+    return crud_utils.dependencies.downstream(
+        db, task_id, include_completed, visible=crud_utils.visibility.for_user(db, current_user)
+    )
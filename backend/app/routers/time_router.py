@@ -0,0 +1,101 @@
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from backend.app.database import get_db
+from backend.app import crud_utils
+from backend.app.schemas.billing import TimeEntryCreate, TimeEntryUpdate, TimeEntryOut
+from backend.app.auth import get_current_user
+from backend.app.models import User
+from backend.app.utils.permissions import has_permission
+
+router = APIRouter(prefix="/time", tags=["Time Tracking"])
+
+
+def _check_owner(db: Session, current_user: User, user_id: int):
+    """Anyone logs and edits their own time; other people's needs manage_tasks."""
+    if user_id != current_user.id and not has_permission(db, current_user, "manage_tasks"):
+        raise HTTPException(status_code=403, detail="Permission denied")
+
+
+def _sees_all_entries(db: Session, current_user: User) -> bool:
+    """Everyone's time (and so client billing detail) is for billing and
+    task managers; the rest only list their own entries."""
+    return has_permission(db, current_user, "view_billing") or has_permission(db, current_user, "manage_tasks")
+
+
+# ---------------------------------------------------
+# LOG TIME
+# ---------------------------------------------------
+
+@router.post("/", response_model=TimeEntryOut)
+def create_time_entry(
+    data: TimeEntryCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    user_id = data.user_id or current_user.id
+    _check_owner(db, current_user, user_id)
+    entry = crud_utils.billing.create_entry(
+        db, data, user_id=user_id, visible=crud_utils.visibility.for_user(db, current_user)
+    )
+    if not entry:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return entry
+
+
+# ---------------------------------------------------
+# LIST
+# ---------------------------------------------------
+
+@router.get("/", response_model=List[TimeEntryOut])
+def list_time_entries(
+    task_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    client_id: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if not _sees_all_entries(db, current_user):
+        if user_id and user_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Permission denied")
+        user_id = current_user.id
+    return crud_utils.billing.list_entries(
+        db, task_id=task_id, user_id=user_id, client_id=client_id, start=start, end=end, limit=limit
+    )
+
+
+# ---------------------------------------------------
+# UPDATE / DELETE
+# ---------------------------------------------------
+
+@router.patch("/{entry_id}", response_model=TimeEntryOut)
+def update_time_entry(
+    entry_id: int,
+    updates: TimeEntryUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    entry = crud_utils.billing.get_entry(db, entry_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Time entry not found")
+    _check_owner(db, current_user, entry.user_id)
+    return crud_utils.billing.update_entry(db, entry_id, updates)
+
+
+@router.delete("/{entry_id}", status_code=204)
+def delete_time_entry(
+    entry_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    entry = crud_utils.billing.get_entry(db, entry_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Time entry not found")
+    _check_owner(db, current_user, entry.user_id)
+    crud_utils.billing.delete_entry(db, entry_id)
+    return
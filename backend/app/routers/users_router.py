@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional
 from sqlalchemy.orm import Session
 from backend.app.models import Role, Permission, RolePermission, User
 from backend.app.database import get_db
-from backend.app.schemas.users import UserCreate, UserOut, UserUpdate
+from backend.app.schemas.users import UserCreate, UserOut, UserUpdate, UserDirectoryPage
+from backend.app.crud_utils import directory
+from backend.app.crud_utils.directory import BadCursor
 from backend.app.utils.security import get_current_user, hash_password
 from backend.app import crud
 from backend.app import models
@@ -40,6 +42,27 @@ def list_users_endpoint(
     return crud.list_users(db)
 
 
+# -------------------------
+# DIRECTORY WITH WORKLOAD
+# -------------------------
+@router.get("/directory", response_model=UserDirectoryPage)
+def user_directory(
+    role_id: Optional[int] = None,
+    is_active: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("manage_tasks")),
+):
+    """Users by name with open / overdue / due-this-week task counts and
+    assigned client counts, one query per page. Follow next_cursor for
+    the next page."""
+    try:
+        return directory.list_directory(db, role_id=role_id, is_active=is_active, cursor=cursor, limit=limit)
+    except BadCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
 # -------------------------
 # GET SELF
 # -------------------------
@@ -0,0 +1,118 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import List
+
+from backend.app.database import get_db
+from backend.app import crud_utils
+from backend.app.schemas.tasks import TaskOut
+from backend.app.schemas.views import SavedViewCreate, SavedViewUpdate, SavedViewOut
+from backend.app.auth import get_current_user
+from backend.app.models import User
+from backend.app.utils.fastjson import FastJSONResponse
+from backend.app.utils.permissions import require_permission
+
+router = APIRouter(prefix="/views", tags=["Saved Views"])
+
+
+def _get_own_view(db: Session, view_id: int, current_user: User):
+    view = crud_utils.views.get_view(db, view_id, current_user.id)
+    if not view:
+        raise HTTPException(status_code=404, detail="View not found")
+    return view
+
+
+# ---------------------------------------------------
+# LIST (with task and unread counts)
+# ---------------------------------------------------
+
+@router.get("/", response_model=List[SavedViewOut])
+def list_views(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return crud_utils.views.list_views(
+        db, current_user.id, visible=crud_utils.visibility.for_user(db, current_user)
+    )
+
+
+# ---------------------------------------------------
+# CREATE / UPDATE / DELETE
+# ---------------------------------------------------
+
+@router.post("/", response_model=SavedViewOut)
+def create_view(
+    data: SavedViewCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        view = crud_utils.views.create_view(db, data, current_user.id)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="View name already exists")
+    return crud_utils.views.view_summary(db, view, visible=crud_utils.visibility.for_user(db, current_user))
+
+
+@router.patch("/{view_id}", response_model=SavedViewOut)
+def update_view(
+    view_id: int,
+    data: SavedViewUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        view = crud_utils.views.update_view(db, view_id, current_user.id, data)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="View name already exists")
+    if not view:
+        raise HTTPException(status_code=404, detail="View not found")
+    return crud_utils.views.view_summary(db, view, visible=crud_utils.visibility.for_user(db, current_user))
+
+
+@router.delete("/{view_id}", status_code=204)
+def delete_view(
+    view_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if not crud_utils.views.delete_view(db, view_id, current_user.id):
+        raise HTTPException(status_code=404, detail="View not found")
+    return
+
+
+@router.post("/rebuild")
+def rebuild_views(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("manage_tasks")),
+):
+    views = crud_utils.views.rebuild_views(db)
+    return {"message": "Saved view membership rebuilt", "views": views}
+
+
+# ---------------------------------------------------
+# OPEN A VIEW (precomputed ids; marks it read)
+# ---------------------------------------------------
+
+@router.get("/{view_id}", response_model=SavedViewOut)
+def get_view(
+    view_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    view = _get_own_view(db, view_id, current_user)
+    return crud_utils.views.view_summary(db, view, visible=crud_utils.visibility.for_user(db, current_user))
+
+
+@router.get("/{view_id}/tasks", response_model=List[TaskOut])
+def open_view(
+    view_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    view = _get_own_view(db, view_id, current_user)
+    # Already TaskOut-shaped; skip per-object validation (schema stays documented)
+    return FastJSONResponse(
+        crud_utils.views.open_view(db, view, visible=crud_utils.visibility.for_user(db, current_user))
+    )
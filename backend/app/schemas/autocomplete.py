@@ -0,0 +1,16 @@
+from enum import Enum
+from pydantic import BaseModel
+from typing import Optional
+
+
+class AutocompleteKind(str, Enum):
+    tags = "tags"
+    clients = "clients"
+    users = "users"
+
+
+class AutocompleteItem(BaseModel):
+    id: int
+    label: str                      # tag/client name, user full name (or email)
+    detail: Optional[str] = None    # users: email
+    usage: int = 0                  # tasks using the tag/client/user
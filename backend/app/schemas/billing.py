@@ -0,0 +1,73 @@
+from pydantic import BaseModel, validator
+from typing import List, Optional
+from datetime import date, datetime
+
+MAX_MINUTES = 24 * 60
+
+
+def _check_minutes(value):
+    if value is not None and not 0 < value <= MAX_MINUTES:
+        raise ValueError(f"minutes must be between 1 and {MAX_MINUTES}")
+    return value
+
+
+# ---------------------------
+# TIME ENTRY SCHEMAS
+# ---------------------------
+
+class TimeEntryCreate(BaseModel):
+    task_id: int
+    minutes: int
+    work_date: Optional[date] = None     # defaults to today
+    billable: Optional[bool] = None      # defaults to the task's flag
+    note: Optional[str] = None
+    user_id: Optional[int] = None        # someone else's time: needs manage_tasks
+
+    _minutes = validator("minutes", allow_reuse=True)(_check_minutes)
+
+
+class TimeEntryUpdate(BaseModel):
+    minutes: Optional[int] = None
+    work_date: Optional[date] = None
+    billable: Optional[bool] = None
+    note: Optional[str] = None
+
+    _minutes = validator("minutes", allow_reuse=True)(_check_minutes)
+
+
+class TimeEntryOut(BaseModel):
+    id: int
+    task_id: int
+    client_id: int
+    user_id: int
+    work_date: date
+    minutes: int
+    billable: bool
+    note: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        orm_mode = True
+
+
+# ---------------------------
+# BILLING REPORTS
+# ---------------------------
+
+class BillingLine(BaseModel):
+    id: int                  # client id or user id, per group_by
+    name: Optional[str] = None
+    minutes: int = 0
+    billable_minutes: int = 0
+    entries: int = 0
+    hours: float = 0.0
+    billable_hours: float = 0.0
+
+
+class BillingSummaryOut(BaseModel):
+    month: str
+    group_by: str            # "client" or "user"
+    lines: List[BillingLine] = []
+    total_minutes: int = 0
+    total_billable_minutes: int = 0
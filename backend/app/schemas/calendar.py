@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date, datetime
+
+
+class CalendarCard(BaseModel):
+    id: Optional[int] = None            # None for a recurring occurrence
+    recurring_id: Optional[int] = None
+    title: str
+    status: Optional[str] = None
+    client_id: int
+    billable: bool = False
+    due_date: datetime
+
+
+class CalendarDay(BaseModel):
+    date: date
+    count: int                          # everything due that day
+    truncated: bool = False             # True when count > len(tasks)
+    tasks: List[CalendarCard] = []
+
+
+class CalendarOut(BaseModel):
+    start: date
+    end: date
+    days: List[CalendarDay] = []
@@ -0,0 +1,33 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class ClientBase(BaseModel):
+    name: str
+    assigned_weekday: str  # "Monday" ... "Sunday"
+
+
+class ClientCreate(ClientBase):
+    pass
+
+
+class ClientUpdate(BaseModel):
+    name: Optional[str] = None
+    assigned_weekday: Optional[str] = None
+
+
+class ClientAssignmentOut(BaseModel):
+    id: int
+    user_id: int
+    client_id: int
+
+    class Config:
+        orm_mode = True
+
+
+class ClientOut(ClientBase):
+    id: int
+    assignments: List[ClientAssignmentOut] = []
+
+    class Config:
+        orm_mode = True
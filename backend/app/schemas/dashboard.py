@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import Dict
+
+
+class SubtaskCounts(BaseModel):
+    open: int = 0
+    completed: int = 0
+
+
+class DashboardSummaryOut(BaseModel):
+    scope: str  # "all", "client", "user" or "clients" (sum over the caller's visible clients)
+    scope_id: int
+    by_status: Dict[str, int] = {}
+    total: int = 0
+    overdue: int = 0
+    due_this_week: int = 0
+    completed_this_month: int = 0
+    subtasks: SubtaskCounts = SubtaskCounts()
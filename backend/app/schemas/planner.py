@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class PlannerClientOut(BaseModel):
+    client_id: int
+    client_name: str
+    open_tasks: int
+    hours_due: float
+
+
+class PlannerDayOut(BaseModel):
+    weekday: str
+    weekday_index: int
+    open_tasks: int
+    hours_due: float
+    clients: List[PlannerClientOut] = []
+
+
+class PlannerUserOut(BaseModel):
+    user_id: int
+    full_name: Optional[str] = None
+    email: str
+    days: List[PlannerDayOut] = []
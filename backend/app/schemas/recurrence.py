@@ -0,0 +1,56 @@
+from pydantic import BaseModel, validator
+from typing import Optional
+from datetime import datetime
+
+FREQUENCIES = ("daily", "weekly", "monthly", "yearly")
+
+
+def _check_frequency(value):
+    if value is not None and value not in FREQUENCIES:
+        raise ValueError(f"frequency must be one of: {', '.join(FREQUENCIES)}")
+    return value
+
+
+class RecurringTaskBase(BaseModel):
+    title: str
+    description: Optional[str] = None
+    billable: bool = False
+    estimated_hours: Optional[float] = None
+    assigned_user_id: Optional[int] = None
+
+    frequency: str = "monthly"  # daily, weekly, monthly, yearly
+    interval: int = 1
+    start_date: datetime
+    until: Optional[datetime] = None
+
+    _frequency = validator("frequency", allow_reuse=True)(_check_frequency)
+
+
+class RecurringTaskCreate(RecurringTaskBase):
+    client_id: int
+
+
+class RecurringTaskUpdate(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+    billable: Optional[bool] = None
+    estimated_hours: Optional[float] = None
+    assigned_user_id: Optional[int] = None
+    frequency: Optional[str] = None
+    interval: Optional[int] = None
+    start_date: Optional[datetime] = None
+    until: Optional[datetime] = None
+    active: Optional[bool] = None
+
+    _frequency = validator("frequency", allow_reuse=True)(_check_frequency)
+
+
+class RecurringTaskOut(RecurringTaskBase):
+    id: int
+    client_id: int
+    active: bool
+    created_by: int
+    created_at: datetime
+
+    class Config:
+        orm_mode = True
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, validator
 from typing import List, Optional
 
 class PermissionOut(BaseModel):
@@ -29,3 +29,41 @@ class RoleUpdate(BaseModel):
     add_permissions: Optional[List[int]] = None
     remove_permissions: Optional[List[int]] = None
 
+
+
+# ---------------------------
+# PERMISSION MATRIX
+# ---------------------------
+
+class MatrixRole(BaseModel):
+    id: int
+    name: str
+    permission_ids: List[int] = []
+
+
+class PermissionMatrix(BaseModel):
+    permissions: List[PermissionOut]
+    roles: List[MatrixRole]
+
+
+class RoleGrantChange(BaseModel):
+    role_id: int
+    grant: List[int] = []
+    revoke: List[int] = []
+
+    @validator("revoke", allow_reuse=True)
+    def _not_both(cls, value, values):
+        both = set(value) & set(values.get("grant") or [])
+        if both:
+            raise ValueError(f"permission ids both granted and revoked: {sorted(both)}")
+        return value
+
+
+class PermissionMatrixUpdate(BaseModel):
+    roles: List[RoleGrantChange]
+
+
+class PermissionMatrixResult(BaseModel):
+    granted: int
+    revoked: int
+    matrix: PermissionMatrix
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import List
+
+from backend.app.schemas.tasks import TaskOut, TagOut
+
+
+class TaskTagRef(BaseModel):
+    task_id: int
+    tag_id: int
+
+
+class SyncTombstones(BaseModel):
+    tasks: List[int] = []
+    subtasks: List[int] = []
+    task_assignments: List[int] = []
+    task_tags: List[TaskTagRef] = []
+
+
+class SyncOut(BaseModel):
+    version: int          # pass back as ?since= on the next call
+    reset: bool = False   # cursor missing/too old: reload everything, then sync from `version`
+    has_more: bool = False
+    tasks: List[TaskOut] = []
+    tags: List[TagOut] = []
+    deleted: SyncTombstones = SyncTombstones()
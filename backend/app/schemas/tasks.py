@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
 
@@ -58,21 +58,28 @@ class TaskBase(BaseModel):
     description: Optional[str] = None
     due_date: Optional[datetime] = None
     billable: bool = False
+    estimated_hours: Optional[float] = None
     status: Optional[str] = None  # "new", "in_progress", etc.
 
 
 class TaskCreate(TaskBase):
     client_id: int
     assigned_users: Optional[List[int]] = []  # user IDs
+    auto_assign: bool = False  # no assigned_users: pick the least-loaded client member
     subtasks: Optional[List[SubtaskCreate]] = []
     tags: Optional[List[str]] = []
 
+
+class TaskBulkCreate(BaseModel):
+    tasks: List[TaskCreate] = Field(..., min_items=1, max_items=500)  # one transaction
+
 class TaskUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
     status: Optional[str] = None
     due_date: Optional[datetime] = None
     billable: Optional[bool] = None
+    estimated_hours: Optional[float] = None
 
 class TagOut(BaseModel):
     id: int
@@ -81,15 +88,73 @@ class TagOut(BaseModel):
     class Config:
         orm_mode = True
 
+
+# ---------------------------
+# ATTACHMENT SCHEMAS
+# ---------------------------
+
+class AttachmentOut(BaseModel):
+    id: int
+    task_id: int
+    filename: str
+    content_type: str
+    size: int
+    sha256: str
+    uploaded_by: Optional[int] = None
+    created_at: datetime
+
+    class Config:
+        orm_mode = True
+
 class TaskOut(TaskBase):
     id: int
     client_id: int
     created_by: int
     created_at: datetime
     updated_at: datetime
+    priority_score: Optional[int] = None
+    version: int = 1
+    archived: bool = False  # read from the archive (include_archived=true)
 
     subtasks: List[SubtaskOut] = []
     assignments: List[TaskAssignmentOut] = []
     tags: List[TagOut] = []
+    attachments: List[AttachmentOut] = []
+    class Config:
+        orm_mode = True
+
+# ---------------------------
+# DEPENDENCY SCHEMAS
+# ---------------------------
+
+class DependencyTaskOut(BaseModel):
+    id: int
+    title: str
+    status: Optional[str] = None
+    client_id: int
+    due_date: Optional[datetime] = None
+    estimated_hours: Optional[float] = None
+
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+
+class TaskDependenciesOut(BaseModel):
+    task_id: int
+    blocked_by: List[DependencyTaskOut] = []
+    blocks: List[DependencyTaskOut] = []
+
+
+class CriticalPathTask(BaseModel):
+    id: int
+    title: str
+    status: Optional[str] = None
+    due_date: Optional[datetime] = None
+    estimated_hours: Optional[float] = None
+    finish_hours: float  # cumulative estimated hours along the path
+
+
+class CriticalPathOut(BaseModel):
+    client_id: int
+    total_hours: float = 0.0
+    tasks: List[CriticalPathTask] = []
@@ -34,4 +34,21 @@ class UserOut(BaseModel):
     role: Optional[RoleShort] = None
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class UserDirectoryEntry(BaseModel):
+    id: int
+    email: EmailStr
+    full_name: Optional[str] = None
+    is_active: bool
+    is_admin: bool
+    role: Optional[RoleShort] = None
+    open_tasks: int = 0
+    overdue_tasks: int = 0
+    due_this_week: int = 0
+    clients: int = 0
+
+
+class UserDirectoryPage(BaseModel):
+    items: List[UserDirectoryEntry]
+    next_cursor: Optional[str] = None   # pass back as ?cursor= for the next page
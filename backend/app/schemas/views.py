@@ -0,0 +1,75 @@
+from pydantic import BaseModel, validator
+from typing import List, Optional
+from datetime import datetime
+
+SORT_FIELDS = ("created_at", "updated_at", "due_date", "title", "priority_score")
+
+
+def _check_sort_by(value):
+    if value is not None and value not in SORT_FIELDS:
+        raise ValueError(f"sort_by must be one of: {', '.join(SORT_FIELDS)}")
+    return value
+
+
+def _check_sort_dir(value):
+    if value is not None and value not in ("asc", "desc"):
+        raise ValueError("sort_dir must be asc or desc")
+    return value
+
+
+def _check_days(value):
+    if value is not None and not 0 <= value <= 366:
+        raise ValueError("due_within_days must be between 0 and 366")
+    return value
+
+
+# ---------------------------
+# FILTER DEFINITION
+# ---------------------------
+
+class ViewFilters(BaseModel):
+    # Evaluated on every task write (membership is stored)
+    statuses: List[str] = []
+    client_id: Optional[int] = None
+    assigned_user_id: Optional[int] = None
+    billable: Optional[bool] = None
+    tags: List[str] = []
+    search: Optional[str] = None
+    due_before: Optional[datetime] = None
+    due_after: Optional[datetime] = None
+
+    # Relative to now, applied when the view is opened
+    overdue: bool = False                   # due in the past and not completed
+    due_within_days: Optional[int] = None
+
+    sort_by: str = "created_at"
+    sort_dir: str = "desc"
+
+    _sort_by = validator("sort_by", allow_reuse=True)(_check_sort_by)
+    _sort_dir = validator("sort_dir", allow_reuse=True)(_check_sort_dir)
+    _days = validator("due_within_days", allow_reuse=True)(_check_days)
+
+
+# ---------------------------
+# SAVED VIEW SCHEMAS
+# ---------------------------
+
+class SavedViewCreate(BaseModel):
+    name: str
+    filters: ViewFilters = ViewFilters()
+
+
+class SavedViewUpdate(BaseModel):
+    name: Optional[str] = None
+    filters: Optional[ViewFilters] = None
+
+
+class SavedViewOut(BaseModel):
+    id: int
+    name: str
+    filters: ViewFilters
+    task_count: int = 0
+    unread_count: int = 0
+    last_opened_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
@@ -0,0 +1,94 @@
+# backend/app/serve.py
+"""Production launcher: python -m backend.app.serve
+
+  - seeds the database once, before any worker starts (workers then skip
+    the seed in their startup event)
+  - starts WEB_CONCURRENCY workers (default: one per CPU core)
+  - sizes each worker's connection pool so the deployment stays under
+    DB_MAX_CONNECTIONS, if that is set
+  - switches the push-event broker to the database relay and the list
+    result cache to the host-wide SQLite store when there is more than
+    one worker, so SSE clients and cached lists see writes made on any
+    worker (the cache file is emptied here, before the workers start)
+  - on SIGTERM/SIGINT stops accepting connections and lets in-flight
+    requests finish for up to GRACEFUL_TIMEOUT seconds; the leader
+    releases its lease so another worker takes over singleton jobs
+
+Singleton duties (priority sweep, change-log compaction, archival) run only on the
+worker holding the leader lease (utils.leader), also across hosts that
+share the database.
+"""
+import argparse
+import logging
+import os
+
+logger = logging.getLogger("backend.app.serve")
+
+
+def default_workers() -> int:
+    return int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+
+
+def configure_environment(workers: int):
+    """Env for the workers; must run before backend.app.database is imported."""
+    max_connections = os.getenv("DB_MAX_CONNECTIONS")
+    if max_connections and "DB_POOL_SIZE" not in os.environ:
+        per_worker = max(2, int(max_connections) // workers)
+        os.environ["DB_POOL_SIZE"] = str(per_worker)
+        os.environ.setdefault("DB_MAX_OVERFLOW", "0")
+    if workers > 1:
+        os.environ.setdefault("EVENT_BROKER", "database")
+        os.environ.setdefault("RESULT_CACHE", "sqlite")
+    os.environ["SEED_ON_STARTUP"] = "false"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument("--graceful-timeout", type=float, default=float(os.getenv("GRACEFUL_TIMEOUT", "30")))
+    parser.add_argument("--no-seed", action="store_true", help="skip the one-off seed before starting")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO"),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    configure_environment(args.workers)
+
+    if not args.no_seed:
+        from backend.app.startup import seed_data
+        from backend.app.database import engine
+
+        seed_data()
+        engine.dispose()  # don't hand pooled connections to forked workers
+
+    if os.getenv("RESULT_CACHE") == "sqlite":
+        from backend.app.utils import result_cache
+
+        # Entries may predate a restore or an out-of-band import
+        result_cache.get_store().clear()
+
+    import uvicorn
+
+    logger.info(
+        "Starting %d worker(s) on %s:%d (pool %s+%s per worker, broker %s, result cache %s)",
+        args.workers, args.host, args.port,
+        os.getenv("DB_POOL_SIZE", "5"), os.getenv("DB_MAX_OVERFLOW", "10"),
+        os.getenv("EVENT_BROKER", "local"), os.getenv("RESULT_CACHE", "memory"),
+    )
+    uvicorn.run(
+        "backend.app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        proxy_headers=True,
+        forwarded_allow_ips=os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+        log_level=os.getenv("LOG_LEVEL", "info").lower(),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,27 @@
 
+import logging
+import os
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from backend.app.database import SessionLocal
+from backend.app.crud_utils import priority, changelog, archive, tasks, autocomplete, workload, digest
+from backend.app.utils import background, blobstore, mailer
+from backend.app.utils.events import get_broker
+from backend.app.utils.leader import LeaderElection
 from backend.app.models import User, Role, Permission, RolePermission
 from backend.app.utils.security import hash_password
 
+logger = logging.getLogger(__name__)
+
 
 DEFAULT_PERMISSIONS = [
     ("manage_users", "Can manage users"),
     ("manage_roles", "Can manage roles"),
     ("manage_permissions", "Can manage permissions"),
     ("manage_tasks", "Can manage all tasks"),
+    ("profile_requests", "Can profile requests and read profile reports"),
+    ("view_billing", "Can view billing summaries and exports"),
 ]
 
 
@@ -18,9 +30,24 @@ ADMIN_PASSWORD = "YecnyBKruz2025"
 
 
 def seed_data():
-    db: Session = SessionLocal()
-
-    print("🔄 Running startup seed...")
+    """Idempotent. Workers starting together may race on the unique names;
+    the loser retries once and then finds everything in place."""
+    for attempt in (1, 2):
+        db: Session = SessionLocal()
+        try:
+            _seed(db)
+            return
+        except IntegrityError:
+            db.rollback()
+            if attempt == 2:
+                raise
+            logger.info("Startup seed raced with another process; retrying")
+        finally:
+            db.close()
+
+
+def _seed(db: Session):
+    logger.info("Running startup seed")
 
     # -----------------------------
     # 1️⃣ Ensure permissions exist
@@ -84,4 +111,122 @@ def seed_data():
             admin_user.role_id = admin_role.id
             db.commit()
 
-    print("✅ Startup seed completed.\n")
\ No newline at end of file
+    logger.info("Startup seed completed")
+
+
+# -----------------------------
+# Background jobs
+# -----------------------------
+
+PRIORITY_SWEEP_SECONDS = int(os.getenv("PRIORITY_SWEEP_SECONDS", "3600"))
+CHANGE_LOG_COMPACT_SECONDS = int(os.getenv("CHANGE_LOG_COMPACT_SECONDS", str(6 * 3600)))
+ARCHIVE_INTERVAL_SECONDS = int(os.getenv("ARCHIVE_INTERVAL_SECONDS", str(24 * 3600)))
+ATTACHMENT_GC_SECONDS = int(os.getenv("ATTACHMENT_GC_SECONDS", str(6 * 3600)))
+AUTOCOMPLETE_REFRESH_SECONDS = int(os.getenv("AUTOCOMPLETE_REFRESH_SECONDS", "60"))
+WORKLOAD_REFRESH_SECONDS = int(os.getenv("WORKLOAD_REFRESH_SECONDS", "300"))
+DIGEST_CHECK_SECONDS = int(os.getenv("DIGEST_CHECK_SECONDS", "900"))
+DIGEST_HOUR_UTC = int(os.getenv("DIGEST_HOUR_UTC", "7"))
+
+
+def _priority_sweep():
+    db: Session = SessionLocal()
+    try:
+        priority.sweep(db)
+    finally:
+        db.close()
+
+
+def _change_log_compaction():
+    db: Session = SessionLocal()
+    try:
+        changelog.compact(db)
+    finally:
+        db.close()
+
+
+def _archive_completed():
+    db: Session = SessionLocal()
+    try:
+        archived = archive.archive_completed(db)
+        if archived:
+            logger.info("Archived %d completed tasks", archived)
+    finally:
+        db.close()
+
+
+def _attachment_gc():
+    db: Session = SessionLocal()
+    try:
+        referenced = tasks.referenced_blobs(db)
+    finally:
+        db.close()
+    result = blobstore.collect_garbage(referenced)
+    if result["removed"]:
+        logger.info("Attachment GC removed %(removed)d blobs (%(bytes_freed)d bytes)", result)
+
+
+def _daily_digest():
+    """The first check after the digest hour sends the day's digests
+    (digest_runs marks the day); later checks only retry failed sends."""
+    if mailer.get_sender() is None or datetime.utcnow().hour < DIGEST_HOUR_UTC:
+        return
+    db: Session = SessionLocal()
+    try:
+        result = digest.send_digests(db)
+        if result["users"]:
+            logger.info("Daily digest for %(day)s (retry: %(retry)s): %(sent)d sent, %(failed)d failed", result)
+    finally:
+        db.close()
+
+
+def _refresh_autocomplete():
+    db: Session = SessionLocal()
+    try:
+        autocomplete.rebuild(db)
+    finally:
+        db.close()
+
+
+def _refresh_workload():
+    db: Session = SessionLocal()
+    try:
+        workload.rebuild(db)
+    finally:
+        db.close()
+
+
+# Jobs that must run once per deployment, not once per worker
+SINGLETON_JOBS = {
+    "priority_sweep": (PRIORITY_SWEEP_SECONDS, _priority_sweep),
+    "change_log_compaction": (CHANGE_LOG_COMPACT_SECONDS, _change_log_compaction),
+    "task_archival": (ARCHIVE_INTERVAL_SECONDS, _archive_completed),
+    "attachment_gc": (ATTACHMENT_GC_SECONDS, _attachment_gc),
+    "daily_digest": (DIGEST_CHECK_SECONDS, _daily_digest),
+}
+
+
+def _start_singletons():
+    for name, (interval, fn) in SINGLETON_JOBS.items():
+        background.run_periodic(name, interval, fn)
+
+
+def _stop_singletons():
+    for name in SINGLETON_JOBS:
+        background.stop(name)
+
+
+leader = LeaderElection("singletons", on_elected=_start_singletons, on_demoted=_stop_singletons)
+
+
+def start_background_jobs():
+    get_broker().start()
+    leader.start()
+    # Per worker: each process has its own typeahead and load index
+    background.run_periodic("autocomplete_refresh", AUTOCOMPLETE_REFRESH_SECONDS, _refresh_autocomplete)
+    background.run_periodic("workload_refresh", WORKLOAD_REFRESH_SECONDS, _refresh_workload)
+
+
+def stop_background_jobs():
+    leader.stop()
+    background.stop_all()
+    get_broker().stop()
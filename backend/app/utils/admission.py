@@ -0,0 +1,215 @@
+# backend/app/utils/admission.py
+"""Admission control: bounded concurrency per pool, with a short queue.
+
+Each request is mapped, by longest path prefix, to a pool for its kind
+(read = GET/HEAD/OPTIONS, write = everything else). A pool admits up to
+`limit` requests at once; the next `queue` wait in FIFO order for at most
+`timeout` seconds. Past that the request is turned away at once, before
+it touches the threadpool or the database:
+
+  429 + Retry-After   the pool's queue is full (back off)
+  503 + Retry-After   waited `timeout` seconds without getting a slot
+
+Defaults keep SQLite writes to a few at a time (one writer holds the lock
+anyway, the rest would only sit in busy_timeout holding threads), keep
+reads + writes + login below the threadpool's 40 threads, and give the
+bcrypt-bound login, the streaming export and attachment transfers (which
+hold a slot for as long as the client takes to send or read the file)
+their own pools so they can't crowd out normal reads and writes.
+
+Override with ADMISSION_CONFIG, inline JSON or a path to a JSON file:
+  {"pools":  {"write": {"limit": 2, "queue": 20, "timeout": 5}},
+   "routes": {"/clients": {"write": "client_writes"}}}
+Unknown pools named in "routes" are created with the default settings.
+
+State is per worker process.
+"""
+import asyncio
+import json
+import math
+import os
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from starlette.responses import JSONResponse
+
+from backend.app.utils import metrics
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+DEFAULT_POOLS = {
+    "read": {"limit": 28, "queue": 200, "timeout": 10.0},
+    "write": {"limit": 4, "queue": 100, "timeout": 10.0},
+    "auth": {"limit": 4, "queue": 50, "timeout": 10.0},
+    "export": {"limit": 2, "queue": 4, "timeout": 5.0},
+    "files": {"limit": 8, "queue": 50, "timeout": 10.0},
+}
+
+# prefix -> {"read": pool, "write": pool}; "" is the fallback
+DEFAULT_ROUTES = {
+    "": {"read": "read", "write": "write"},
+    "/auth/login": {"read": "auth", "write": "auth"},
+    "/tasks/export": {"read": "export"},
+    "/billing/export": {"read": "export"},
+    "/attachments": {"read": "files", "write": "files"},
+}
+
+# Long-lived or must-always-answer endpoints bypass admission entirely
+EXEMPT_PREFIXES = ("/metrics", "/healthz", "/events/")
+
+ADMISSION_IN_FLIGHT = metrics.register(metrics.Gauge(
+    "admission_in_flight", "Requests admitted and running, per pool.", ("pool",)))
+ADMISSION_QUEUED = metrics.register(metrics.Gauge(
+    "admission_queued", "Requests waiting for a slot, per pool.", ("pool",)))
+ADMISSION_REJECTED = metrics.register(metrics.Counter(
+    "admission_rejected_total", "Requests turned away, per pool and reason.", ("pool", "reason")))
+ADMISSION_WAIT = metrics.register(metrics.Histogram(
+    "admission_wait_seconds", "Time admitted requests spent queued.", ("pool",),
+    (0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)))
+
+
+class Rejected(Exception):
+    def __init__(self, status: int, reason: str, retry_after: int):
+        self.status = status
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Pool:
+    """FIFO semaphore with a bounded wait queue. Lives on one event loop."""
+
+    def __init__(self, name: str, limit: int, queue: int, timeout: float):
+        self.name = name
+        self.limit = max(1, int(limit))
+        self.max_queue = max(0, int(queue))
+        self.timeout = float(timeout)
+        self.active = 0
+        self._waiters: deque = deque()
+        self._service_time = 0.05  # EWMA of seconds a request holds a slot
+
+    def retry_after(self) -> int:
+        backlog = len(self._waiters) + 1
+        return max(1, math.ceil(backlog * self._service_time / self.limit))
+
+    async def acquire(self) -> float:
+        """Returns seconds spent waiting, or raises Rejected."""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            ADMISSION_IN_FLIGHT.inc(self.name)
+            return 0.0
+
+        if len(self._waiters) >= self.max_queue:
+            ADMISSION_REJECTED.inc(self.name, "queue_full")
+            raise Rejected(429, "queue_full", self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        ADMISSION_QUEUED.inc(self.name)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.timeout)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was handed over just as the deadline hit; keep it
+                return time.perf_counter() - started
+            waiter.cancel()
+            ADMISSION_REJECTED.inc(self.name, "timeout")
+            raise Rejected(503, "timeout", self.retry_after())
+        except asyncio.CancelledError:
+            # Client went away while queued; pass a slot we were given on
+            if waiter.done() and not waiter.cancelled():
+                self.release(0.0)
+            else:
+                waiter.cancel()
+            raise
+        finally:
+            ADMISSION_QUEUED.dec(self.name)
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        return time.perf_counter() - started
+
+    def release(self, held_seconds: float):
+        self._service_time += 0.1 * (held_seconds - self._service_time)
+        # Hand the slot straight to the oldest live waiter (active unchanged)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                return
+        self.active -= 1
+        ADMISSION_IN_FLIGHT.dec(self.name)
+
+
+def load_config(raw: Optional[str] = None):
+    pools = {name: dict(settings) for name, settings in DEFAULT_POOLS.items()}
+    routes = {prefix: dict(mapping) for prefix, mapping in DEFAULT_ROUTES.items()}
+
+    raw = raw if raw is not None else os.getenv("ADMISSION_CONFIG", "")
+    if raw.strip():
+        if not raw.lstrip().startswith("{"):
+            with open(raw) as fh:
+                raw = fh.read()
+        overrides = json.loads(raw)
+        for name, settings in overrides.get("pools", {}).items():
+            pools.setdefault(name, dict(DEFAULT_POOLS["read"])).update(settings)
+        for prefix, mapping in overrides.get("routes", {}).items():
+            routes.setdefault(prefix, {}).update(mapping)
+
+    for mapping in routes.values():
+        for pool_name in mapping.values():
+            pools.setdefault(pool_name, dict(DEFAULT_POOLS["read"]))
+    return pools, routes
+
+
+class AdmissionMiddleware:
+    def __init__(self, app, config: Optional[str] = None, enabled: Optional[bool] = None):
+        self.app = app
+        if enabled is None:
+            enabled = os.getenv("ADMISSION_CONTROL", "true").lower() in ("1", "true", "yes")
+        self.enabled = enabled
+        pool_settings, routes = load_config(config)
+        self.pools: Dict[str, Pool] = {
+            name: Pool(name, s["limit"], s["queue"], s["timeout"]) for name, s in pool_settings.items()
+        }
+        # longest prefix first
+        self.routes = sorted(routes.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def pool_for(self, path: str, method: str) -> Optional[Pool]:
+        kind = "read" if method in READ_METHODS else "write"
+        for prefix, mapping in self.routes:
+            if path.startswith(prefix) and kind in mapping:
+                return self.pools[mapping[kind]]
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if (
+            not self.enabled
+            or scope["type"] != "http"
+            or scope["path"].startswith(EXEMPT_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        pool = self.pool_for(scope["path"], scope["method"])
+        if pool is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            waited = await pool.acquire()
+        except Rejected as rejected:
+            response = JSONResponse(
+                {"detail": "Server busy, retry later", "reason": rejected.reason, "pool": pool.name},
+                status_code=rejected.status,
+                headers={"Retry-After": str(rejected.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        ADMISSION_WAIT.observe(waited, pool.name)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            pool.release(time.perf_counter() - started)
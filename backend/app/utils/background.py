@@ -0,0 +1,43 @@
+# backend/app/utils/background.py
+import logging
+import threading
+from typing import Callable, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+_jobs: Dict[str, Tuple[threading.Thread, threading.Event]] = {}
+
+
+def run_periodic(name: str, interval_seconds: float, fn: Callable[[], None]):
+    """Run fn now and then every interval_seconds on a daemon thread.
+    Registering the same name twice is a no-op."""
+    if name in _jobs:
+        return
+
+    stop = threading.Event()
+
+    def loop():
+        while True:
+            try:
+                fn()
+            except Exception:
+                logger.exception("Background job %s failed", name)
+            if stop.wait(interval_seconds):
+                return
+
+    thread = threading.Thread(target=loop, name=f"job-{name}", daemon=True)
+    _jobs[name] = (thread, stop)
+    thread.start()
+
+
+def stop(name: str, timeout: float = 5.0):
+    job = _jobs.pop(name, None)
+    if job:
+        thread, stop_event = job
+        stop_event.set()
+        thread.join(timeout)
+
+
+def stop_all(timeout: float = 5.0):
+    for name in list(_jobs):
+        stop(name, timeout)
@@ -0,0 +1,111 @@
+# backend/app/utils/blobstore.py
+"""Content-addressed blob storage on local disk.
+
+A blob lives at ATTACHMENT_DIR/<sha[:2]>/<sha[2:4]>/<sha256>, so the same
+bytes uploaded twice are stored once. Uploads stream into a temp file
+under ATTACHMENT_DIR/tmp in CHUNK_SIZE pieces while being hashed. The
+temp file is then renamed into place, or dropped if the blob already
+exists. The rename is atomic, so readers never see a partial blob.
+
+Blobs are never deleted when an attachment row goes away; collect_garbage()
+removes files no row references once they are older than a grace period,
+which also covers uploads whose row was never committed.
+"""
+import hashlib
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Optional, Tuple
+
+import aiofiles
+import aiofiles.os
+
+ATTACHMENT_DIR = Path(os.getenv(
+    "ATTACHMENT_DIR", Path(__file__).resolve().parents[3] / "attachments"
+))
+CHUNK_SIZE = 256 * 1024
+MAX_BYTES = int(os.getenv("ATTACHMENT_MAX_BYTES", str(50 * 1024 * 1024)))
+GC_GRACE_SECONDS = int(os.getenv("ATTACHMENT_GC_GRACE_SECONDS", "3600"))
+
+_TMP = "tmp"
+
+
+class TooLarge(Exception):
+    pass
+
+
+def path_for(sha256: str) -> Path:
+    return ATTACHMENT_DIR / sha256[:2] / sha256[2:4] / sha256
+
+
+async def store(chunks: AsyncIterator[bytes], max_bytes: Optional[int] = None) -> Tuple[str, int]:
+    """Write the stream to its content address; returns (sha256, size)."""
+    max_bytes = max_bytes or MAX_BYTES
+    tmp_dir = ATTACHMENT_DIR / _TMP
+    await aiofiles.os.makedirs(tmp_dir, exist_ok=True)
+    tmp_path = tmp_dir / uuid.uuid4().hex
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(tmp_path, "wb") as fh:
+            async for chunk in chunks:
+                if not chunk:
+                    continue
+                size += len(chunk)
+                if size > max_bytes:
+                    raise TooLarge(f"Attachment exceeds {max_bytes} bytes")
+                digest.update(chunk)
+                await fh.write(chunk)
+
+        sha256 = digest.hexdigest()
+        final = path_for(sha256)
+        try:
+            os.utime(final)  # already stored: dedupe, and restart its GC grace period
+            await aiofiles.os.remove(tmp_path)
+        except FileNotFoundError:
+            await aiofiles.os.makedirs(final.parent, exist_ok=True)
+            await aiofiles.os.replace(tmp_path, final)
+        return sha256, size
+    except BaseException:
+        try:
+            await aiofiles.os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+# ---------------------------------------------------
+# GARBAGE COLLECTION
+# ---------------------------------------------------
+
+def collect_garbage(referenced: Iterable[str], grace_seconds: int = GC_GRACE_SECONDS,
+                    now: Optional[float] = None) -> dict:
+    """Delete blobs (and stale temp files) that nothing references and that
+    haven't been written in `grace_seconds`. Runs in a background thread."""
+    now = now or time.time()
+    referenced = set(referenced)
+    removed = kept = freed = 0
+
+    if not ATTACHMENT_DIR.exists():
+        return {"removed": 0, "kept": 0, "bytes_freed": 0}
+
+    for path in ATTACHMENT_DIR.glob("*/*/*"):
+        if not path.is_file():
+            continue
+        stat = path.stat()
+        if path.name in referenced or now - stat.st_mtime < grace_seconds:
+            kept += 1
+            continue
+        path.unlink(missing_ok=True)
+        removed += 1
+        freed += stat.st_size
+
+    for path in (ATTACHMENT_DIR / _TMP).glob("*"):
+        stat = path.stat()
+        if now - stat.st_mtime >= grace_seconds:
+            path.unlink(missing_ok=True)
+            freed += stat.st_size
+
+    return {"removed": removed, "kept": kept, "bytes_freed": freed}
@@ -0,0 +1,280 @@
+# backend/app/utils/events.py
+"""Push channel for task changes.
+
+Write paths publish compact events after commit (see crud_utils.tasks);
+the /events SSE endpoint hands each connection a Subscription.
+
+Brokers:
+  LocalBroker     in-process fan-out, the default for a single worker.
+  DatabaseBroker  LocalBroker + a relay through the broker_events table so
+                  every worker sees every event. Needs nothing beyond the
+                  app database, so it runs against a throwaway SQLite file.
+Pick one with EVENT_BROKER=local|database or a "package.module:Class" path
+to plug in another implementation (it only needs start/stop/publish/
+subscribe/unsubscribe; subscribe() takes client_id, assignee_id and
+visible, and hands back a Subscription).
+"""
+import asyncio
+import importlib
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from backend.app.utils.txn import advisory_lock, on_commit
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBER_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "256"))
+
+RESYNC_EVENT = {"type": "resync"}
+
+
+class Subscription:
+    """One listener. Lives on the event loop that created it; publish()
+    may be called from any thread.
+
+    Backpressure: when a slow consumer's queue fills up, the backlog is
+    dropped and replaced by a single "resync" event telling the client to
+    refetch, so one stalled tab can't grow memory without bound.
+
+    visible (crud_utils.visibility) is the listener's read access, taken
+    when it connects: events for tasks outside it are never delivered.
+    """
+
+    def __init__(self, client_id: Optional[int] = None, assignee_id: Optional[int] = None,
+                 max_queue: int = SUBSCRIBER_QUEUE_SIZE, visible=None):
+        self.client_id = client_id
+        self.assignee_id = assignee_id
+        self.visible = visible
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def matches(self, event: dict) -> bool:
+        if event.get("type") == RESYNC_EVENT["type"]:
+            return True
+        if self.client_id is not None and event.get("client_id") != self.client_id:
+            return False
+        if self.assignee_id is not None and self.assignee_id not in (event.get("assignees") or ()):
+            return False
+        if self.visible is not None and not self.visible.everything:
+            return (event.get("client_id") in self.visible.client_ids
+                    or self.visible.user_id in (event.get("assignees") or ()))
+        return True
+
+    def _offer(self, event: dict):
+        # Runs on the subscriber's loop
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+
+    def deliver(self, event: dict):
+        try:
+            self.loop.call_soon_threadsafe(self._offer, event)
+        except RuntimeError:
+            pass  # loop already closed; the endpoint will unsubscribe
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LocalBroker:
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def subscribe(self, client_id: Optional[int] = None, assignee_id: Optional[int] = None,
+                  visible=None) -> Subscription:
+        sub = Subscription(client_id=client_id, assignee_id=assignee_id, visible=visible)
+        with self._lock:
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: dict):
+        self._dispatch([event])
+
+    def _dispatch(self, events: Iterable[dict]):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for event in events:
+            for sub in subscribers:
+                if sub.matches(event):
+                    sub.deliver(event)
+
+
+class DatabaseBroker(LocalBroker):
+    """Relays events between workers through the broker_events table.
+
+    publish() delivers locally right away and appends a row; a poller
+    thread picks up rows written by other workers. Rows older than
+    EVENT_RETENTION_SECONDS are pruned about once a minute by whichever
+    worker gets there first.
+    """
+
+    PRUNE_EVERY = timedelta(seconds=60)
+    # poll_once() keeps a high-water mark on the row id, which only holds
+    # if ids become visible in order. On Postgres two publishers can draw
+    # ids 10 and 11 and commit 11 first, and a poll in between would skip
+    # 10 for good, so inserts take a transaction-scoped advisory lock
+    # (SQLite's single writer already commits them in order).
+    WRITE_LOCK_KEY = 7331003
+
+    def __init__(self, session_factory=None, poll_interval: float = None, retention_seconds: int = None):
+        super().__init__()
+        self.origin = uuid.uuid4().hex
+        self.poll_interval = poll_interval or float(os.getenv("EVENT_POLL_SECONDS", "0.5"))
+        self.retention = timedelta(seconds=retention_seconds or int(os.getenv("EVENT_RETENTION_SECONDS", "300")))
+        self._session_factory = session_factory
+        self._last_id = None
+        self._last_prune = datetime.utcnow()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _session(self):
+        if self._session_factory is None:
+            from backend.app.database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def start(self):
+        from sqlalchemy import func
+        from backend.app.models import BrokerEvent
+
+        db = self._session()
+        try:
+            self._last_id = db.query(func.max(BrokerEvent.id)).scalar() or 0
+        finally:
+            db.close()
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="event-broker-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(self.poll_interval * 4)
+
+    def publish(self, event: dict):
+        from backend.app.models import BrokerEvent
+
+        self._dispatch([event])
+        db = self._session()
+        try:
+            advisory_lock(db, self.WRITE_LOCK_KEY)
+            db.add(BrokerEvent(origin=self.origin, payload=json.dumps(event, default=str)))
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("Could not relay event to other workers")
+        finally:
+            db.close()
+
+    def poll_once(self):
+        from backend.app.models import BrokerEvent
+
+        db = self._session()
+        try:
+            rows = (
+                db.query(BrokerEvent.id, BrokerEvent.origin, BrokerEvent.payload)
+                .filter(BrokerEvent.id > self._last_id)
+                .order_by(BrokerEvent.id)
+                .all()
+            )
+            if rows:
+                self._last_id = rows[-1][0]
+                self._dispatch(json.loads(payload) for _, origin, payload in rows if origin != self.origin)
+
+            now = datetime.utcnow()
+            if now - self._last_prune >= self.PRUNE_EVERY:
+                self._last_prune = now
+                db.query(BrokerEvent).filter(
+                    BrokerEvent.created_at < now - self.retention
+                ).delete(synchronize_session=False)
+                db.commit()
+        finally:
+            db.close()
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll_once()
+            except Exception:
+                logger.exception("Event broker poll failed")
+
+
+# ---------------------------------------------------
+# BROKER SELECTION
+# ---------------------------------------------------
+
+BROKERS = {
+    "local": LocalBroker,
+    "database": DatabaseBroker,
+}
+
+_broker = None
+
+
+def _load(name: str):
+    if name in BROKERS:
+        return BROKERS[name]()
+    module_name, _, class_name = name.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        _broker = _load(os.getenv("EVENT_BROKER", "local"))
+    return _broker
+
+
+def set_broker(broker):
+    """Swap the broker (tests, embedding)."""
+    global _broker
+    _broker = broker
+
+
+# ---------------------------------------------------
+# EVENT HELPERS
+# ---------------------------------------------------
+
+def task_event(event_type: str, task_id: int, client_id: int, assignees, fields, version: int) -> dict:
+    return {
+        "type": event_type,           # task.created / task.updated / task.deleted
+        "task_id": task_id,
+        "client_id": client_id,
+        "assignees": sorted(set(assignees)),
+        "fields": sorted(set(fields)),
+        "version": version,
+        "ts": datetime.utcnow().isoformat(),
+    }
+
+
+def publish_on_commit(db, event: dict):
+    """Queue an event to be broadcast once db's transaction commits."""
+    on_commit(db, lambda: get_broker().publish(event))
@@ -0,0 +1,27 @@
+# backend/app/utils/fastjson.py
+"""JSON encoding for the high-volume list endpoints, with orjson (a
+requirement, see requirement.txt). Output matches FastAPI's default
+encoding for the types our row dicts contain (str, int, float, bool,
+None, datetime, date, list, dict).
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import Response
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(Response):
+    """Response for payloads that are already plain dicts/lists.
+
+    Returning it from a route skips response_model validation and
+    jsonable_encoder; keep response_model on the decorator so the OpenAPI
+    schema still describes the payload.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,136 @@
+# backend/app/utils/file_responses.py
+"""File downloads with HTTP Range, conditional requests and zero-copy send.
+
+Starlette 0.27's FileResponse has no Range support, so this answers:
+  304  If-None-Match matches the ETag
+  206  a single satisfiable "bytes=" range (and If-Range, if sent, matches)
+  416  a range that starts past the end of the file
+  200  everything else, including multi-range requests (RFC 9110 allows
+       serving the whole representation instead)
+
+The body goes out through the ASGI "http.response.zerocopysend"
+extension (the server hands the file descriptor to sendfile) when the
+server offers it. Otherwise it is read with aiofiles in CHUNK_SIZE pieces,
+so memory use is flat no matter how large the file is.
+"""
+import os
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+import aiofiles
+from starlette.requests import Request
+from starlette.responses import Response
+
+CHUNK_SIZE = 256 * 1024
+ZEROCOPY = "http.response.zerocopysend"
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """(start, end) inclusive for a single byte range; None to send the
+    whole file. Raises ValueError when the range can't be satisfied."""
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_s, sep, end_s = header[6:].strip().partition("-")
+    if not sep or not (start_s or end_s) or not all(p.isdigit() for p in (start_s, end_s) if p):
+        return None  # malformed: ignore it
+
+    if not start_s:  # suffix: the last N bytes
+        length = int(end_s)
+        if length == 0 or size == 0:
+            raise ValueError("unsatisfiable suffix range")
+        return max(0, size - length), size - 1
+
+    start = int(start_s)
+    if start >= size:
+        raise ValueError("range starts past the end")
+    end = int(end_s) if end_s else size - 1
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def content_disposition(filename: str, inline: bool = False) -> str:
+    fallback = filename.encode("ascii", "replace").decode("ascii").replace('"', "")
+    kind = "inline" if inline else "attachment"
+    return f"{kind}; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename)}"
+
+
+class FileSliceResponse(Response):
+    """Sends bytes [start, end] of a file that is known to exist."""
+
+    def __init__(self, path, start: int, end: int, status_code: int, headers: dict, media_type: str):
+        super().__init__(content=None, status_code=status_code, headers=headers, media_type=media_type)
+        self.path = path
+        self.start = start
+        self.count = end - start + 1
+        self.headers["content-length"] = str(self.count)
+
+    async def __call__(self, scope, receive, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope.get("method") == "HEAD" or self.count <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if ZEROCOPY in scope.get("extensions", {}):
+            with open(self.path, "rb") as fh:
+                await send({
+                    "type": ZEROCOPY,
+                    "file": fh,
+                    "offset": self.start,
+                    "count": self.count,
+                    "more_body": False,
+                })
+            return
+
+        remaining = self.count
+        async with aiofiles.open(self.path, "rb") as fh:
+            await fh.seek(self.start)
+            while remaining > 0:
+                chunk = await fh.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:  # file shrank under us; end the body anyway
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def ranged_file_response(
+    request: Request,
+    path,
+    etag: str,
+    media_type: str,
+    filename: str,
+    immutable: bool = False,
+) -> Response:
+    size = os.stat(path).st_size
+    quoted_etag = f'"{etag}"'
+    headers = {
+        "accept-ranges": "bytes",
+        "x-content-type-options": "nosniff",  # content type is whatever the uploader sent
+        "etag": quoted_etag,
+        "content-disposition": content_disposition(filename),
+        "cache-control": "private, max-age=31536000, immutable" if immutable else "private, no-cache",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or quoted_etag in if_none_match):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if if_range and if_range.strip() != quoted_etag:
+        range_header = None  # representation changed: send all of it
+
+    try:
+        byte_range = parse_range(range_header, size)
+    except ValueError:
+        headers["content-range"] = f"bytes */{size}"
+        return Response(status_code=416, headers=headers)
+
+    if byte_range is None:
+        return FileSliceResponse(path, 0, size - 1, 200, headers, media_type)
+
+    start, end = byte_range
+    headers["content-range"] = f"bytes {start}-{end}/{size}"
+    return FileSliceResponse(path, start, end, 206, headers, media_type)
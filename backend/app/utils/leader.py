@@ -0,0 +1,158 @@
+# backend/app/utils/leader.py
+"""Leader election through a lease row in the app database.
+
+Every worker runs a LeaderElection; whichever holds the "singletons"
+lease runs the duties that must happen once per deployment (priority
+sweep, change-log compaction). The holder renews the lease every ttl/3.
+If it stops renewing (crash, partition, shutdown) another worker takes
+the lease once it has expired, so a failover takes at most one ttl.
+
+Lease expiry is compared against each worker's own clock: keep hosts
+NTP-synced and the ttl well above any expected skew.
+"""
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import case, or_
+from sqlalchemy.exc import IntegrityError
+
+logger = logging.getLogger(__name__)
+
+LEASE_TTL_SECONDS = float(os.getenv("LEADER_LEASE_SECONDS", "30"))
+
+
+class LeaderElection:
+    def __init__(
+        self,
+        name: str = "singletons",
+        ttl_seconds: float = LEASE_TTL_SECONDS,
+        on_elected: Optional[Callable[[], None]] = None,
+        on_demoted: Optional[Callable[[], None]] = None,
+        session_factory=None,
+    ):
+        self.name = name
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self._session_factory = session_factory
+        self._leader = False
+        self._valid_until = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._leader and self._valid_until is not None and datetime.utcnow() < self._valid_until
+
+    def _session(self):
+        if self._session_factory is None:
+            from backend.app.database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    # ---------------------------------------------------
+    # LEASE OPERATIONS
+    # ---------------------------------------------------
+
+    def try_acquire(self, now: Optional[datetime] = None) -> bool:
+        """Take or renew the lease. One UPDATE when the row exists."""
+        from backend.app.models import Lease
+
+        now = now or datetime.utcnow()
+        expires_at = now + self.ttl
+        db = self._session()
+        try:
+            updated = (
+                db.query(Lease)
+                .filter(
+                    Lease.name == self.name,
+                    or_(Lease.holder == self.holder, Lease.expires_at < now),
+                )
+                .update(
+                    {
+                        Lease.acquired_at: case((Lease.holder == self.holder, Lease.acquired_at), else_=now),
+                        Lease.holder: self.holder,
+                        Lease.expires_at: expires_at,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            if not updated:
+                db.add(Lease(name=self.name, holder=self.holder, acquired_at=now, expires_at=expires_at))
+            db.commit()
+        except IntegrityError:
+            db.rollback()  # someone else holds it
+            return False
+        finally:
+            db.close()
+
+        self._valid_until = expires_at
+        return True
+
+    def release(self):
+        from backend.app.models import Lease
+
+        db = self._session()
+        try:
+            db.query(Lease).filter(Lease.name == self.name, Lease.holder == self.holder).delete(
+                synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+        self._valid_until = None
+
+    # ---------------------------------------------------
+    # LIFECYCLE
+    # ---------------------------------------------------
+
+    def _tick(self):
+        try:
+            held = self.try_acquire()
+        except Exception:
+            logger.exception("Lease %s: renew failed", self.name)
+            held = self.is_leader  # keep it until our last renewal runs out
+
+        if held and not self._leader:
+            self._leader = True
+            logger.info("Lease %s: %s is now leader", self.name, self.holder)
+            if self.on_elected:
+                self.on_elected()
+        elif not held and self._leader:
+            self._leader = False
+            logger.warning("Lease %s: %s lost leadership", self.name, self.holder)
+            if self.on_demoted:
+                self.on_demoted()
+
+    def start(self):
+        """First attempt runs inline, so a lone worker is leader right away."""
+        self._stop.clear()
+        self._tick()
+        interval = self.ttl.total_seconds() / 3
+
+        def loop():
+            while not self._stop.wait(interval):
+                self._tick()
+
+        self._thread = threading.Thread(target=loop, name=f"lease-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Step down and hand the lease over without waiting for expiry."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(5)
+        if self._leader:
+            self._leader = False
+            if self.on_demoted:
+                self.on_demoted()
+            try:
+                self.release()
+            except Exception:
+                logger.exception("Lease %s: release failed", self.name)
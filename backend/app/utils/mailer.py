@@ -0,0 +1,144 @@
+# backend/app/utils/mailer.py
+"""Outgoing mail through a pluggable sender.
+
+Pick one with MAIL_SENDER=smtp|maildir|off (default off), or a
+"package.module:Class" path to plug in another implementation (it only
+needs `name`, send(message) -> message id and close()).
+
+  smtp     SMTP_HOST / SMTP_PORT (587), SMTP_USER / SMTP_PASSWORD,
+           SMTP_STARTTLS (on unless "0"). One connection per sending
+           thread, reopened when the server drops it; close() quits them.
+  maildir  every message delivered to a local Maildir (MAIL_MAILDIR,
+           default ./mail); for development and tests, readable with any
+           mail client or the mailbox module.
+
+MAIL_FROM sets the From address.
+"""
+import importlib
+import mailbox
+import os
+import smtplib
+import threading
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+from pathlib import Path
+from typing import Optional
+
+MAIL_FROM = os.getenv("MAIL_FROM", "tasks@localhost")
+
+
+def build_message(to: str, subject: str, text: str, html: Optional[str] = None) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = MAIL_FROM
+    message["To"] = to
+    message["Subject"] = subject
+    message["Date"] = formatdate(localtime=False)
+    message["Message-ID"] = make_msgid(domain=MAIL_FROM.rpartition("@")[2] or None)
+    message.set_content(text)
+    if html:
+        message.add_alternative(html, subtype="html")
+    return message
+
+
+# ---------------------------------------------------
+# SENDERS
+# ---------------------------------------------------
+
+class SMTPSender:
+    name = "smtp"
+
+    def __init__(self):
+        self.host = os.getenv("SMTP_HOST", "localhost")
+        self.port = int(os.getenv("SMTP_PORT", "587"))
+        self.user = os.getenv("SMTP_USER")
+        self.password = os.getenv("SMTP_PASSWORD")
+        self.starttls = os.getenv("SMTP_STARTTLS", "1") != "0"
+        self._local = threading.local()
+        self._open = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        conn = smtplib.SMTP(self.host, self.port, timeout=30)
+        if self.starttls:
+            conn.starttls()
+        if self.user:
+            conn.login(self.user, self.password or "")
+        with self._lock:
+            self._open.append(conn)
+        return conn
+
+    def send(self, message: EmailMessage) -> str:
+        conn = getattr(self._local, "conn", None)
+        for attempt in (1, 2):
+            if conn is None:
+                conn = self._local.conn = self._connect()
+            try:
+                conn.send_message(message)
+                return message["Message-ID"]
+            except smtplib.SMTPServerDisconnected:
+                conn = self._local.conn = None
+                if attempt == 2:
+                    raise
+
+    def close(self):
+        """Quit every connection the sending threads opened."""
+        with self._lock:
+            conns, self._open = self._open, []
+        for conn in conns:
+            try:
+                conn.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+        self._local = threading.local()
+
+
+class MaildirSender:
+    name = "maildir"
+
+    def __init__(self, path: str = None):
+        self.path = Path(path or os.getenv("MAIL_MAILDIR", "mail"))
+        for sub in ("tmp", "new", "cur"):   # Maildir(create=True) skips these for an existing directory
+            (self.path / sub).mkdir(parents=True, exist_ok=True)
+        self._box = mailbox.Maildir(self.path, create=False)
+        self._lock = threading.Lock()
+
+    def send(self, message: EmailMessage) -> str:
+        with self._lock:
+            self._box.add(message)
+        return message["Message-ID"]
+
+    def close(self):
+        pass
+
+
+SENDERS = {
+    "smtp": SMTPSender,
+    "maildir": MaildirSender,
+}
+
+_sender = None
+_loaded = False
+
+
+def _load(name: str):
+    if name == "off":
+        return None
+    if name in SENDERS:
+        return SENDERS[name]()
+    module_name, _, class_name = name.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+def get_sender():
+    """The configured sender, or None when MAIL_SENDER=off."""
+    global _sender, _loaded
+    if not _loaded:
+        _sender = _load(os.getenv("MAIL_SENDER", "off"))
+        _loaded = True
+    return _sender
+
+
+def set_sender(sender):
+    """Swap the sender (tests, embedding); None turns mail off."""
+    global _sender, _loaded
+    _sender, _loaded = sender, True
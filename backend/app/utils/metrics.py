@@ -0,0 +1,319 @@
+# backend/app/utils/metrics.py
+"""Process-local request and database metrics in Prometheus text format.
+
+  MetricsMiddleware        per-route latency histogram, status counts and
+                           in-flight gauge (pure ASGI, no per-request
+                           allocations beyond a small stats object)
+  instrument_engine()      cursor hooks: query count and SQL time, overall
+                           and per request; pool checkouts/checked-out
+  TimedQueuePool           QueuePool that also records how long checkouts
+                           wait for a free connection
+  render()                 the /metrics payload
+
+Routes are labelled with their template ("/tasks/{task_id}"), never the
+raw path, so label cardinality stays bounded. Values are per process; with
+several workers each one reports its own numbers.
+"""
+import bisect
+import contextvars
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250, 1000)
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+# ---------------------------------------------------
+# PRIMITIVES
+# ---------------------------------------------------
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _label_text(self, values: Tuple, extra: str = "") -> str:
+        parts = [f'{k}="{_escape(v)}"' for k, v in zip(self.labels, values)]
+        if extra:
+            parts.append(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def total(self) -> float:
+        with self._lock:
+            return sum(self._values.values())
+
+    def lines(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{self._label_text(k)} {_num(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value: float):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0] * (len(self.buckets) + 2)
+            row[index] += 1
+            row[-1] += value
+
+    def count(self, *labels) -> int:
+        row = self._values.get(labels)
+        return sum(row[:-1]) if row else 0
+
+    def lines(self):
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        out = []
+        for labels, row in items:
+            cumulative = 0
+            for bound, hits in zip(self.buckets + (float("inf"),), row[:-1]):
+                cumulative += hits
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{_num(bound)}"'
+                out.append(f"{self.name}_bucket{self._label_text(labels, le)} {cumulative}")
+            out.append(f"{self.name}_sum{self._label_text(labels)} {_num(row[-1])}")
+            out.append(f"{self.name}_count{self._label_text(labels)} {cumulative}")
+        return out
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _num(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not float(value).is_integer() else str(int(value))
+
+
+# ---------------------------------------------------
+# REGISTRY
+# ---------------------------------------------------
+
+REGISTRY = []
+
+
+def register(metric):
+    REGISTRY.append(metric)
+    return metric
+
+
+def render() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.header())
+        lines.extend(metric.lines())
+    return "\n".join(lines) + "\n"
+
+
+HTTP_REQUESTS = register(Counter(
+    "http_requests_total", "Requests by route template, method and status.", ("method", "route", "status")))
+HTTP_LATENCY = register(Histogram(
+    "http_request_duration_seconds", "Request latency by route template.", ("method", "route")))
+HTTP_IN_FLIGHT = register(Gauge(
+    "http_requests_in_flight", "Requests currently being served."))
+REQUEST_QUERIES = register(Histogram(
+    "http_request_db_queries", "SQL statements issued per request.", ("method", "route"), COUNT_BUCKETS))
+REQUEST_SQL_TIME = register(Histogram(
+    "http_request_db_seconds", "Time spent in SQL per request.", ("method", "route")))
+
+DB_QUERIES = register(Counter(
+    "db_queries_total", "SQL statements executed.", ("kind",)))
+DB_QUERY_TIME = register(Histogram(
+    "db_query_duration_seconds", "Per-statement execution time.", ("kind",), QUERY_BUCKETS))
+DB_POOL_CHECKOUTS = register(Counter(
+    "db_pool_checkouts_total", "Connections checked out of the pool."))
+DB_POOL_CHECKED_OUT = register(Gauge(
+    "db_pool_checked_out", "Connections currently checked out."))
+DB_POOL_WAIT = register(Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled connection.", (), WAIT_BUCKETS))
+DB_POOL_TIMEOUTS = register(Counter(
+    "db_pool_timeouts_total", "Checkouts that gave up waiting for a connection."))
+
+
+# ---------------------------------------------------
+# PER-REQUEST SQL STATS
+# ---------------------------------------------------
+
+class RequestStats:
+    __slots__ = ("queries", "sql_seconds", "statements", "scope")
+
+    def __init__(self, scope=None):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.statements = None  # a list while a profiler wants the SQL text
+        self.scope = scope      # ASGI scope, for the route template
+
+
+# Set by the middleware; sync endpoints run in a worker thread with a copy
+# of the context, which still points at the same (mutable) stats object.
+_request_stats: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar(
+    "request_stats", default=None
+)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+def bind_request_stats(stats: RequestStats):
+    """Make stats the current request's; returns a token for reset."""
+    return _request_stats.set(stats)
+
+
+def reset_request_stats(token):
+    _request_stats.reset(token)
+
+
+def route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    def __init__(self, app, exclude_paths: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = set(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        stats = RequestStats(scope)
+        token = _request_stats.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_FLIGHT.dec()
+            _request_stats.reset(token)
+
+            method = scope["method"]
+            route = route_template(scope)
+            HTTP_REQUESTS.inc(method, route, str(status))
+            HTTP_LATENCY.observe(elapsed, method, route)
+            REQUEST_QUERIES.observe(stats.queries, method, route)
+            REQUEST_SQL_TIME.observe(stats.sql_seconds, method, route)
+
+
+# ---------------------------------------------------
+# SQLALCHEMY HOOKS
+# ---------------------------------------------------
+
+def _statement_kind(statement: str) -> str:
+    head = statement.lstrip()[:6].upper()
+    if head in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+        return head.lower()
+    return "other"
+
+
+def instrument_engine(engine):
+    """Attach query/pool hooks to an engine (idempotent)."""
+    if getattr(engine, "_metrics_instrumented", False):
+        return
+    engine._metrics_instrumented = True
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        kind = _statement_kind(statement)
+        DB_QUERIES.inc(kind)
+        DB_QUERY_TIME.observe(elapsed, kind)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.sql_seconds += elapsed
+            if stats.statements is not None:
+                stats.statements.append((statement, elapsed))
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        started = context.connection.info.get("query_started") if context.connection else None
+        if started:
+            started.pop()
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.inc()
+        DB_POOL_CHECKED_OUT.inc()
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.dec()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records time spent waiting for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - started)
@@ -4,6 +4,18 @@ from backend.app.database import get_db
 from backend.app.utils.security import get_current_user
 from backend.app.models import Permission
 from fastapi.security.api_key import APIKeyHeader
+
+
+def has_permission(db: Session, user, permission_name: str) -> bool:
+    """True when the user's role grants permission_name."""
+    if not getattr(user, "role", None):
+        return False
+    permission = db.query(Permission).filter(Permission.name == permission_name).first()
+    if not permission:
+        return False
+    return permission.id in {rp.permission_id for rp in user.role.permissions or []}
+
+
 def require_permission(permission_name: str):
     """
     Dependency generator: use as Depends(require_permission("some.permission"))
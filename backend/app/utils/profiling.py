@@ -0,0 +1,403 @@
+# backend/app/utils/profiling.py
+"""Profile a single request on demand.
+
+An admin adds `X-Profile: cpu` (or `cpu,memory`) to a request, or
+`?_profile=cpu,memory` to the URL. That one request then runs with:
+  cpu     cProfile around the endpoint function, in whichever thread runs
+          it (sync endpoints execute in the threadpool)
+  memory  a tracemalloc snapshot diff, top allocation sites
+and always the SQL it issued with per-statement timings (statement text
+only; bound parameters are never stored). The report is saved as JSON
+under PROFILE_DIR and its id returned in the X-Profile-Id response header;
+read it back from /admin/profiles/{id}.
+
+Requests without the flag pay one header/query-string scan in the
+middleware and a context variable lookup in the endpoint wrapper.
+
+Notes: tracemalloc is process-wide, so one memory profile runs at a time
+and concurrent requests can show up in its diff. For async endpoints the
+profiler also sees whatever else the event loop runs while they await.
+"""
+import asyncio
+import cProfile
+import contextvars
+import functools
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs
+
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from backend.app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY_PARAM = "_profile"
+PROFILE_PERMISSION = "profile_requests"
+
+PROFILE_DIR = Path(os.getenv(
+    "PROFILE_DIR", Path(__file__).resolve().parents[3] / "profiles"
+))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+
+MAX_STATEMENTS = 500
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 25
+TREE_MAX_DEPTH = 25
+TREE_MIN_SHARE = 0.01  # drop call-tree branches under 1% of the endpoint's time
+
+_memory_lock = threading.Lock()
+
+
+class ProfileSession:
+    def __init__(self, cpu: bool, memory: bool):
+        self.id = datetime.utcnow().strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:8]
+        self.cpu = cpu
+        self.memory = memory
+        self.profiler = cProfile.Profile() if cpu else None
+        self.root = None  # (file, line, name) of the profiled endpoint
+        self.notes = []
+
+
+_active: contextvars.ContextVar[Optional[ProfileSession]] = contextvars.ContextVar(
+    "profile_session", default=None
+)
+
+
+# ---------------------------------------------------
+# ENDPOINT WRAPPER
+# ---------------------------------------------------
+
+def _code_key(fn):
+    code = getattr(fn, "__code__", None)
+    return (code.co_filename, code.co_firstlineno, code.co_name) if code else None
+
+
+def _profiled(call):
+    """Wrap an endpoint so an active session profiles it in its own thread."""
+    if getattr(call, "_profiling_wrapped", False):
+        return call
+
+    def enable(session):
+        if not session.cpu or session.root is not None:
+            return False
+        session.root = _code_key(call)
+        try:
+            session.profiler.enable()
+            return True
+        except ValueError:  # another profiler already owns this thread
+            session.notes.append("cpu profiler unavailable in this thread")
+            return False
+
+    if asyncio.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def wrapper(*args, **kwargs):
+            session = _active.get()
+            if session is None or not enable(session):
+                return await call(*args, **kwargs)
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                session.profiler.disable()
+    else:
+        @functools.wraps(call)
+        def wrapper(*args, **kwargs):
+            session = _active.get()
+            if session is None or not enable(session):
+                return call(*args, **kwargs)
+            try:
+                return call(*args, **kwargs)
+            finally:
+                session.profiler.disable()
+
+    wrapper._profiling_wrapped = True
+    return wrapper
+
+
+def install(app):
+    """Wrap every API route's endpoint; call after all routers are included.
+    The request handlers read dependant.call on each request, so swapping it
+    here is enough."""
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            route.dependant.call = _profiled(route.dependant.call)
+
+
+# ---------------------------------------------------
+# MIDDLEWARE
+# ---------------------------------------------------
+
+def _requested_modes(scope) -> Optional[set]:
+    value = None
+    for name, header_value in scope.get("headers") or ():
+        if name == PROFILE_HEADER:
+            value = header_value.decode("latin-1")
+            break
+    if value is None:
+        query = scope.get("query_string") or b""
+        if PROFILE_QUERY_PARAM.encode() not in query:
+            return None
+        value = ",".join(parse_qs(query.decode("latin-1")).get(PROFILE_QUERY_PARAM, []))
+    modes = {m.strip().lower() for m in value.split(",") if m.strip()}
+    if not modes or modes & {"1", "true", "yes"}:
+        modes = {"cpu"}
+    return modes & {"cpu", "memory"} or None
+
+
+def _authorized(scope) -> Optional[int]:
+    """User id when the caller may profile, else None. Runs in a thread."""
+    from fastapi import HTTPException
+    from backend.app.database import SessionLocal
+    from backend.app.utils.permissions import has_permission
+    from backend.app.utils.security import get_current_user
+
+    db = SessionLocal()
+    try:
+        user = get_current_user(Request(scope), db)
+        return user.id if has_permission(db, user, PROFILE_PERMISSION) else None
+    except HTTPException:
+        return None
+    finally:
+        db.close()
+
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        modes = _requested_modes(scope)
+        if modes is None:
+            await self.app(scope, receive, send)
+            return
+
+        user_id = await run_in_threadpool(_authorized, scope)
+        if user_id is None:
+            await JSONResponse({"detail": "Profiling requires the profile_requests permission"},
+                               status_code=403)(scope, receive, send)
+            return
+
+        await self._profile(scope, receive, send, modes, user_id)
+
+    async def _profile(self, scope, receive, send, modes, user_id):
+        session = ProfileSession(cpu="cpu" in modes, memory="memory" in modes)
+        status = 500
+
+        stats = metrics.current_request_stats()
+        stats_token = None
+        if stats is None:
+            stats = metrics.RequestStats(scope)
+            stats_token = metrics.bind_request_stats(stats)
+        stats.statements = []
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-profile-id", session.id.encode())]
+            await send(message)
+
+        memory = session.memory and _memory_lock.acquire(blocking=False)
+        if session.memory and not memory:
+            session.notes.append("memory profile skipped: another one is running")
+        started_tracing = False
+        before = None
+        if memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(25)
+                started_tracing = True
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+
+        token = _active.set(session)
+        started_at = datetime.utcnow()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            wall = time.perf_counter() - started
+            _active.reset(token)
+
+            allocations = None
+            if memory:
+                try:
+                    after = tracemalloc.take_snapshot()
+                    _, peak = tracemalloc.get_traced_memory()
+                    allocations = _allocation_report(before, after, peak)
+                finally:
+                    if started_tracing:
+                        tracemalloc.stop()
+                    _memory_lock.release()
+
+            statements, stats.statements = stats.statements, None
+            if stats_token is not None:
+                metrics.reset_request_stats(stats_token)
+
+            report = {
+                "id": session.id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": (scope.get("query_string") or b"").decode("latin-1"),
+                "route": metrics.route_template(scope),
+                "status": status,
+                "user_id": user_id,
+                "started_at": started_at.isoformat(),
+                "wall_ms": round(wall * 1000, 3),
+                "modes": sorted(modes),
+                "notes": session.notes,
+                "sql": _sql_report(statements),
+                "cpu": _cpu_report(session) if session.cpu else None,
+                "memory": allocations,
+            }
+            try:
+                await run_in_threadpool(save_report, report)
+            except OSError:
+                logger.exception("Could not write profile report %s", session.id)
+
+
+# ---------------------------------------------------
+# REPORT BUILDING
+# ---------------------------------------------------
+
+def _sql_report(statements):
+    statements = statements or []
+    return {
+        "count": len(statements),
+        "total_ms": round(sum(elapsed for _, elapsed in statements) * 1000, 3),
+        "truncated": len(statements) > MAX_STATEMENTS,
+        "statements": [
+            {"ms": round(elapsed * 1000, 3), "sql": " ".join(statement.split())}
+            for statement, elapsed in statements[:MAX_STATEMENTS]
+        ],
+    }
+
+
+def _label(key):
+    filename, line, name = key
+    return {"function": name, "file": filename, "line": line}
+
+
+def _cpu_report(session: ProfileSession):
+    if session.root is None:
+        return {"total_ms": 0, "top": [], "tree": None}
+    try:
+        stats = pstats.Stats(session.profiler).stats
+    except TypeError:  # nothing was recorded
+        return {"total_ms": 0, "top": [], "tree": None}
+
+    top = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:TOP_FUNCTIONS]
+
+    # pstats keeps callers per function; invert to callees with the
+    # cumulative time spent along each edge.
+    callees = {}
+    for callee, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((callee, edge[3], edge[1]))
+
+    root = session.root if session.root in stats else max(stats, key=lambda k: stats[k][3])
+    root_time = stats[root][3] or 1e-9
+
+    def node(key, cumulative, calls, depth, path):
+        entry = dict(_label(key), calls=calls, cumulative_ms=round(cumulative * 1000, 3), children=[])
+        if depth >= TREE_MAX_DEPTH:
+            return entry
+        for child, child_time, child_calls in sorted(callees.get(key, ()), key=lambda c: c[1], reverse=True):
+            if child in path or child_time < root_time * TREE_MIN_SHARE:
+                continue
+            entry["children"].append(node(child, child_time, child_calls, depth + 1, path | {child}))
+        return entry
+
+    return {
+        "total_ms": round(root_time * 1000, 3),
+        "top": [
+            dict(_label(key), calls=nc, own_ms=round(tt * 1000, 3), cumulative_ms=round(ct * 1000, 3))
+            for key, (_, nc, tt, ct, _) in top
+        ],
+        "tree": node(root, root_time, stats[root][1], 0, {root}),
+    }
+
+
+def _allocation_report(before, after, peak):
+    diff = after.compare_to(before, "lineno")
+    return {
+        "peak_kb": round(peak / 1024, 1),
+        "net_kb": round(sum(stat.size_diff for stat in diff) / 1024, 1),
+        "top": [
+            {
+                "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_kb": round(stat.size_diff / 1024, 1),
+                "count": stat.count_diff,
+            }
+            for stat in diff[:TOP_ALLOCATIONS]
+        ],
+    }
+
+
+# ---------------------------------------------------
+# STORAGE
+# ---------------------------------------------------
+
+def save_report(report: dict):
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    path = PROFILE_DIR / f"{report['id']}.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(report, default=str))
+    tmp.replace(path)
+
+    reports = sorted(PROFILE_DIR.glob("*.json"))
+    for old in reports[:-PROFILE_KEEP] if PROFILE_KEEP > 0 else ():
+        old.unlink(missing_ok=True)
+
+
+def _valid_id(report_id: str) -> bool:
+    return bool(report_id) and all(c.isalnum() or c == "-" for c in report_id)
+
+
+def load_report(report_id: str) -> Optional[dict]:
+    if not _valid_id(report_id):
+        return None
+    path = PROFILE_DIR / f"{report_id}.json"
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def list_reports(limit: int = 50):
+    summaries = []
+    for path in sorted(PROFILE_DIR.glob("*.json"), reverse=True)[:limit] if PROFILE_DIR.exists() else ():
+        try:
+            report = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        summaries.append({
+            key: report.get(key)
+            for key in ("id", "method", "path", "query", "route", "status", "user_id", "started_at", "wall_ms", "modes")
+        } | {"sql_count": report["sql"]["count"], "sql_ms": report["sql"]["total_ms"]})
+    return summaries
+
+
+def delete_report(report_id: str) -> bool:
+    if not _valid_id(report_id):
+        return False
+    path = PROFILE_DIR / f"{report_id}.json"
+    if not path.exists():
+        return False
+    path.unlink()
+    return True
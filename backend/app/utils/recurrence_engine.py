@@ -0,0 +1,35 @@
+# backend/app/utils/recurrence_engine.py
+from datetime import datetime
+from typing import List
+
+from dateutil.rrule import rrule, DAILY, WEEKLY, MONTHLY, YEARLY
+
+FREQUENCIES = {
+    "daily": DAILY,
+    "weekly": WEEKLY,
+    "monthly": MONTHLY,
+    "yearly": YEARLY,
+}
+
+
+def occurrences(definition, window_start: datetime, window_end: datetime) -> List[datetime]:
+    """Due datetimes of a RecurringTask that fall in [window_start, window_end].
+
+    Monthly rules anchored on the 29th-31st skip short months, matching
+    dateutil's RFC 5545 behaviour.
+    """
+    freq = FREQUENCIES.get(definition.frequency)
+    if freq is None:
+        return []
+
+    until = definition.until
+    if until is not None and until < window_start:
+        return []
+
+    rule = rrule(
+        freq,
+        dtstart=definition.start_date,
+        interval=max(definition.interval or 1, 1),
+        until=until,
+    )
+    return rule.between(window_start, window_end, inc=True)
@@ -0,0 +1,302 @@
+# backend/app/utils/result_cache.py
+"""Versioned cache for serialized list results.
+
+Entries are keyed by a namespace, the normalized request parameters and
+the current data versions, so there is no TTL: a write bumps the versions
+on commit and every key built before it simply stops being looked up
+(the stale entries age out of the LRU).
+
+Versions:
+  all          bumped by every task write; keys for queries across clients
+  client:<id>  bumped by writes to that client's tasks
+  epoch        bumped by bulk jobs (priority sweep, archival...) that
+               touch many clients at once; part of every key
+A query filtered to one client is keyed on (epoch, client:<id>), so
+writes to other clients leave it cached.
+
+The versions are read before the database is, so a write that commits
+while a result is being built can only leave it under an old key.
+
+Stores (RESULT_CACHE=memory|sqlite|off):
+  memory  in-process LRU, the default for a single worker.
+  sqlite  an SQLite file (RESULT_CACHE_PATH, default under /dev/shm when
+          it exists, named after a hash of DATABASE_URL) shared by every
+          worker on the host; versions live in the same file. serve.py picks it when running several workers.
+Neither is shared across hosts: with several hosts turn the cache off,
+or point RESULT_CACHE_PATH at storage they all see. Writes made outside
+the app (tools/generate_data.py) aren't seen until the cache is cleared.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from backend.app.utils import metrics
+from backend.app.utils.txn import on_commit
+
+logger = logging.getLogger(__name__)
+
+MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "2000"))
+MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+ALL = "all"
+EPOCH = "epoch"
+
+CACHE_REQUESTS = metrics.register(metrics.Counter(
+    "result_cache_requests_total", "Cache lookups by namespace and result (hit/miss).", ("namespace", "result")))
+CACHE_EVICTIONS = metrics.register(metrics.Counter(
+    "result_cache_evictions_total", "Entries dropped to stay within the size limits."))
+CACHE_INVALIDATIONS = metrics.register(metrics.Counter(
+    "result_cache_invalidations_total", "Version bumps, by scope kind.", ("scope",)))
+CACHE_ENTRIES = metrics.register(metrics.Gauge(
+    "result_cache_entries", "Entries currently cached (this worker's view)."))
+CACHE_BYTES = metrics.register(metrics.Gauge(
+    "result_cache_bytes", "Bytes currently cached (this worker's view)."))
+
+
+def client_scope(client_id: int) -> str:
+    return f"client:{client_id}"
+
+
+# ---------------------------------------------------
+# STORES
+# ---------------------------------------------------
+
+class MemoryStore:
+    """LRU bounded by entry count and total bytes; state is per process."""
+
+    def __init__(self, max_entries: int = None, max_bytes: int = None):
+        self.max_entries = max_entries or MAX_ENTRIES
+        self.max_bytes = max_bytes or MAX_BYTES
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._versions = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._entries[key] = value
+            self._bytes += len(value)
+            evicted = 0
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, dropped = self._entries.popitem(last=False)
+                self._bytes -= len(dropped)
+                evicted += 1
+            size = (len(self._entries), self._bytes)
+        if evicted:
+            CACHE_EVICTIONS.inc(amount=evicted)
+        CACHE_ENTRIES.set(value=size[0])
+        CACHE_BYTES.set(value=size[1])
+
+    def versions(self, scopes: Sequence[str]) -> List[int]:
+        return [self._versions.get(scope, 0) for scope in scopes]
+
+    def bump(self, scopes: Iterable[str]):
+        with self._lock:
+            for scope in scopes:
+                self._versions[scope] = self._versions.get(scope, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        CACHE_ENTRIES.set(value=0)
+        CACHE_BYTES.set(value=0)
+
+
+def _default_path() -> str:
+    # One file per database, so two deployments on a host (staging and
+    # prod...) never serve each other's results
+    from backend.app.database import DATABASE_URL
+    digest = hashlib.sha256(DATABASE_URL.encode()).hexdigest()[:12]
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, f"taskapp-result-cache-{digest}.db")
+
+
+class SQLiteStore:
+    """The same contract backed by an SQLite file, so every worker on the
+    host shares entries and versions. Eviction is by insertion order (a
+    hit only refreshes its slot once a minute, to keep reads read-only)."""
+
+    TOUCH_SECONDS = 60
+
+    def __init__(self, path: str = None, max_entries: int = None, max_bytes: int = None):
+        self.path = path or os.getenv("RESULT_CACHE_PATH") or _default_path()
+        self.max_entries = max_entries or MAX_ENTRIES
+        self.max_bytes = max_bytes or MAX_BYTES
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, used_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_entries_used_at ON entries (used_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS versions (scope TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")   # a lost cache file is only a cold cache
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        conn = self._conn()
+        row = conn.execute("SELECT value, used_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if now - row[1] > self.TOUCH_SECONDS:
+            conn.execute("UPDATE entries SET used_at = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def set(self, key: str, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, used_at) VALUES (?, ?, ?, ?)",
+                (key, value, len(value), time.time()),
+            )
+            count, total = conn.execute("SELECT count(*), coalesce(sum(size), 0) FROM entries").fetchone()
+            evicted = 0
+            if count > self.max_entries or total > self.max_bytes:
+                # Oldest first until both limits hold again
+                for old_key, size in conn.execute("SELECT key, size FROM entries ORDER BY used_at").fetchall():
+                    if count <= self.max_entries and total <= self.max_bytes:
+                        break
+                    conn.execute("DELETE FROM entries WHERE key = ?", (old_key,))
+                    count, total, evicted = count - 1, total - size, evicted + 1
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if evicted:
+            CACHE_EVICTIONS.inc(amount=evicted)
+        CACHE_ENTRIES.set(value=count)
+        CACHE_BYTES.set(value=total)
+
+    def versions(self, scopes: Sequence[str]) -> List[int]:
+        placeholders = ",".join("?" * len(scopes))
+        found = dict(self._conn().execute(
+            f"SELECT scope, version FROM versions WHERE scope IN ({placeholders})", list(scopes)
+        ).fetchall())
+        return [found.get(scope, 0) for scope in scopes]
+
+    def bump(self, scopes: Iterable[str]):
+        self._conn().executemany(
+            "INSERT INTO versions (scope, version) VALUES (?, 1)"
+            " ON CONFLICT(scope) DO UPDATE SET version = version + 1",
+            [(scope,) for scope in scopes],
+        )
+
+    def clear(self):
+        self._conn().execute("DELETE FROM entries")
+        CACHE_ENTRIES.set(value=0)
+        CACHE_BYTES.set(value=0)
+
+
+STORES = {
+    "memory": MemoryStore,
+    "sqlite": SQLiteStore,
+}
+
+_store = None
+_loaded = False
+
+
+def get_store():
+    """The configured store, or None when RESULT_CACHE=off."""
+    global _store, _loaded
+    if not _loaded:
+        name = os.getenv("RESULT_CACHE", "memory")
+        _store = None if name == "off" else STORES[name]()
+        _loaded = True
+    return _store
+
+
+def set_store(store):
+    """Swap the store (tests, embedding); None turns caching off."""
+    global _store, _loaded
+    _store, _loaded = store, True
+
+
+# ---------------------------------------------------
+# LOOKUP / STORE
+# ---------------------------------------------------
+
+def _scopes(client_id: Optional[int]) -> Tuple[str, ...]:
+    return (EPOCH, client_scope(client_id)) if client_id else (EPOCH, ALL)
+
+
+def lookup(namespace: str, params: dict, client_id: Optional[int] = None) -> Tuple[Optional[str], Optional[bytes]]:
+    """(key, cached body). Build the result and store() it under key on a
+    miss; key is None when caching is off."""
+    store = get_store()
+    if store is None:
+        return None, None
+
+    scopes = _scopes(client_id)
+    versions = ".".join(str(v) for v in store.versions(scopes))
+    digest = hashlib.sha1(
+        json.dumps(params, sort_keys=True, default=str, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+    key = f"{namespace}:{scopes[-1]}:{versions}:{digest}"
+
+    body = store.get(key)
+    CACHE_REQUESTS.inc(namespace, "hit" if body is not None else "miss")
+    return key, body
+
+
+def store(key: Optional[str], body: bytes):
+    if key is None:
+        return
+    try:
+        get_store().set(key, body)
+    except Exception:
+        # A cache that can't be written is only a slower request
+        logger.exception("Result cache write failed")
+
+
+# ---------------------------------------------------
+# INVALIDATION
+# ---------------------------------------------------
+
+def invalidate(client_ids: Iterable[int] = (), everything: bool = False):
+    store_ = get_store()
+    if store_ is None:
+        return
+    scopes = [ALL] + [client_scope(c) for c in sorted(set(client_ids)) if c]
+    if everything:
+        scopes.append(EPOCH)
+    store_.bump(scopes)
+    for scope in scopes:
+        CACHE_INVALIDATIONS.inc(scope.split(":")[0])
+
+
+def invalidate_on_commit(db, client_ids: Iterable[int] = (), everything: bool = False):
+    """Bump the versions once db's transaction commits (dropped on rollback)."""
+    client_ids = list(client_ids)
+    on_commit(db, lambda: invalidate(client_ids, everything))
@@ -0,0 +1,211 @@
+# backend/app/utils/slow_queries.py
+"""Slow-query log.
+
+Engine hooks time every statement; anything over SLOW_QUERY_MS is logged
+and aggregated by its normalized shape (literals and parameters replaced
+by ?, IN lists collapsed), with the routes that issued it. The first time
+a shape is seen, its plan is captured with EXPLAIN QUERY PLAN (SQLite) or
+EXPLAIN (Postgres) on the same connection, so a filter combination that
+starts scanning a whole table shows up flagged as a full scan.
+
+Parameter values are never stored. Aggregates are per process and kept
+for the MAX_SHAPES shapes with the most total time.
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import event
+
+from backend.app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+MAX_SHAPES = int(os.getenv("SLOW_QUERY_MAX_SHAPES", "500"))
+EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "WITH", "INSERT")
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|:\w+|\$\d+|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+_lock = threading.Lock()
+_shapes = {}
+
+
+def normalize(statement: str) -> str:
+    sql = _STRING.sub("?", statement)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("(?, ...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+def fingerprint(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def _caller() -> str:
+    stats = metrics.current_request_stats()
+    if stats is not None and stats.scope is not None:
+        return f"{stats.scope.get('method', '')} {metrics.route_template(stats.scope)}"
+    return f"thread:{threading.current_thread().name}"
+
+
+# ---------------------------------------------------
+# PLAN CAPTURE
+# ---------------------------------------------------
+
+def _explain(dialect: str, cursor, statement: str, parameters, executemany: bool):
+    """Plan rows for a statement, run on the raw DBAPI connection so it
+    doesn't re-enter these hooks. None when the dialect isn't supported."""
+    if executemany or not statement.lstrip()[:6].upper().startswith(EXPLAINABLE):
+        return None
+    if dialect == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    elif dialect == "postgresql":
+        prefix = "EXPLAIN "
+    else:
+        return None
+
+    explain_cursor = cursor.connection.cursor()
+    try:
+        explain_cursor.execute(prefix + statement, parameters)
+        rows = explain_cursor.fetchall()
+    except Exception:
+        logger.debug("EXPLAIN failed", exc_info=True)
+        return None
+    finally:
+        explain_cursor.close()
+
+    if dialect == "sqlite":
+        # (id, parent, notused, detail): indent children under their parent
+        depth = {0: -1}
+        plan = []
+        for row in rows:
+            node_id, parent, detail = row[0], row[1], row[-1]
+            depth[node_id] = depth.get(parent, -1) + 1
+            plan.append("  " * depth[node_id] + detail)
+        return plan
+    return [row[0] for row in rows]
+
+
+def is_full_scan(plan) -> bool:
+    # SQLite: "SCAN tasks" (or "SCAN TABLE tasks") without an index;
+    # Postgres: "Seq Scan on tasks".
+    for line in plan or ():
+        detail = line.strip()
+        if detail.startswith("SCAN") and "INDEX" not in detail:
+            return True
+        if "Seq Scan" in detail:
+            return True
+    return False
+
+
+# ---------------------------------------------------
+# RECORDING
+# ---------------------------------------------------
+
+def record(statement: str, elapsed: float, caller: str, plan_fn=None):
+    normalized = normalize(statement)
+    key = fingerprint(normalized)
+    now = datetime.utcnow()
+    elapsed_ms = elapsed * 1000
+
+    with _lock:
+        shape = _shapes.get(key)
+        is_new = shape is None
+        if is_new:
+            if len(_shapes) >= MAX_SHAPES:
+                del _shapes[min(_shapes, key=lambda k: _shapes[k]["total_ms"])]
+            shape = _shapes[key] = {
+                "fingerprint": key,
+                "sql": normalized,
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "routes": Counter(),
+                "first_seen": now,
+                "last_seen": now,
+                "plan": None,
+                "full_scan": None,
+            }
+        shape["count"] += 1
+        shape["total_ms"] += elapsed_ms
+        shape["max_ms"] = max(shape["max_ms"], elapsed_ms)
+        shape["routes"][caller] += 1
+        shape["last_seen"] = now
+
+    if is_new and plan_fn is not None:
+        plan = plan_fn()
+        with _lock:
+            shape["plan"] = plan
+            shape["full_scan"] = is_full_scan(plan) if plan is not None else None
+
+    logger.warning("Slow query %.1fms [%s] %s: %s", elapsed_ms, key, caller, normalized[:500])
+
+
+def instrument_engine(engine, threshold_ms: Optional[float] = None):
+    """Attach the slow-query hooks to an engine (idempotent)."""
+    if getattr(engine, "_slow_queries_instrumented", False):
+        return
+    engine._slow_queries_instrumented = True
+    threshold = (SLOW_QUERY_MS if threshold_ms is None else threshold_ms) / 1000.0
+    dialect = engine.dialect.name
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["slow_query_started"].pop()
+        if elapsed < threshold:
+            return
+        try:
+            record(
+                statement,
+                elapsed,
+                _caller(),
+                plan_fn=lambda: _explain(dialect, cursor, statement, parameters, executemany),
+            )
+        except Exception:
+            logger.exception("Could not record slow query")
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        started = context.connection.info.get("slow_query_started") if context.connection else None
+        if started:
+            started.pop()
+
+
+# ---------------------------------------------------
+# READ / RESET
+# ---------------------------------------------------
+
+SORT_KEYS = {"total": "total_ms", "max": "max_ms", "count": "count"}
+
+
+def top(limit: int = 20, order: str = "total"):
+    sort_key = SORT_KEYS.get(order, "total_ms")
+    with _lock:
+        shapes = [dict(shape, routes=dict(shape["routes"])) for shape in _shapes.values()]
+    shapes.sort(key=lambda s: s[sort_key], reverse=True)
+    for shape in shapes:
+        shape["mean_ms"] = round(shape["total_ms"] / shape["count"], 3)
+        shape["total_ms"] = round(shape["total_ms"], 3)
+        shape["max_ms"] = round(shape["max_ms"], 3)
+    return shapes[:limit]
+
+
+def reset():
+    with _lock:
+        _shapes.clear()
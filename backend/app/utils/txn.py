@@ -0,0 +1,50 @@
+# backend/app/utils/txn.py
+import logging
+from typing import Callable
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_KEY = "on_commit_callbacks"
+_LOCKS = "advisory_locks_held"
+
+
+def on_commit(db: Session, fn: Callable[[], None]):
+    """Run fn once the session's current transaction commits.
+    Dropped if it rolls back instead. Use for side effects that must not
+    be seen before the data is durable (push events, cache bumps...)."""
+    db.info.setdefault(_KEY, []).append(fn)
+
+
+def advisory_lock(db: Session, key: int):
+    """Serialize writers that share `key` until the current transaction
+    ends (pg_advisory_xact_lock, taken once per transaction). A no-op on
+    SQLite, which only ever has one writer."""
+    held = db.info.setdefault(_LOCKS, set())
+    if key in held or db.get_bind().dialect.name != "postgresql":
+        return
+    db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": key})
+    held.add(key)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_callbacks(session):
+    callbacks = session.info.pop(_KEY, None)
+    for fn in callbacks or []:
+        try:
+            fn()
+        except Exception:
+            logger.exception("on_commit callback failed")
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_callbacks(session):
+    session.info.pop(_KEY, None)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _release_locks(session):
+    session.info.pop(_LOCKS, None)
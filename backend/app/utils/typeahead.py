@@ -0,0 +1,224 @@
+# backend/app/utils/typeahead.py
+"""In-memory typeahead index: word-prefix matching plus trigram fuzzy
+matching for typos, ranked by a usage count.
+
+  prefix  every query word must start one of the entry's terms; found by
+          bisecting a sorted (term, id) list, so it costs O(log n) plus
+          the matches
+  fuzzy   when prefixes don't fill the page: entries sharing enough
+          trigrams with the query (a trigram -> ids posting map) are
+          candidates; each query word must then be within a small edit
+          distance of the start of one of their terms ("acem" finds
+          "Acme", "jonh" finds "John Smith")
+
+Prefix matches always rank above fuzzy ones; within a tier, higher usage
+first. All methods are thread-safe; the index is per process.
+"""
+import heapq
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Collection, Dict, Iterable, List, Optional, Set
+
+FUZZY_THRESHOLD = 0.3   # share of the query's trigrams a candidate must contain
+FUZZY_CANDIDATES = 50   # most-overlapping candidates checked by edit distance
+_WORDS = re.compile(r"[\w']+")
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lower-case, accents stripped, whitespace collapsed."""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(text.lower().split())
+
+
+def words(text: Optional[str]) -> List[str]:
+    return _WORDS.findall(normalize(text))
+
+
+def trigrams(word: str) -> Set[str]:
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_typos(word: str) -> int:
+    return 0 if len(word) < 3 else 1 if len(word) < 7 else 2
+
+
+def prefix_distance(word: str, term: str) -> int:
+    """Edit distance (with adjacent transpositions) from word to the
+    closest of term's prefixes of length len(word) - 1 .. len(word) + 1,
+    so a dropped or doubled letter still lines up. One DP table: the
+    last row holds the distance to every prefix of the term."""
+    target = term[:len(word) + 1]
+    previous2, previous = None, list(range(len(target) + 1))
+    for i in range(1, len(word) + 1):
+        current = [i] + [0] * len(target)
+        for j in range(1, len(target) + 1):
+            cost = word[i - 1] != target[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and word[i - 1] == target[j - 2] and word[i - 2] == target[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return min(previous[min(len(target), max(1, len(word) - 1)):])
+
+
+class _Entry:
+    __slots__ = ("label", "detail", "terms", "grams", "usage")
+
+    def __init__(self, label: str, detail: Optional[str], terms: Set[str], usage: int):
+        self.label = label
+        self.detail = detail
+        self.terms = terms
+        self.grams = set().union(*(trigrams(term) for term in terms)) if terms else set()
+        self.usage = usage
+
+
+class TypeaheadIndex:
+    def __init__(self):
+        self._entries: Dict[int, _Entry] = {}
+        self._terms: List[tuple] = []                 # sorted (term, id)
+        self._grams: Dict[str, Set[int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, entry_id: int):
+        return entry_id in self._entries
+
+    # ---- writes ----
+
+    def put(self, entry_id: int, label: str, detail: Optional[str] = None,
+            extra_terms: Iterable[str] = (), usage: Optional[int] = None):
+        """Add or replace an entry; usage is kept when not given."""
+        terms = set(words(label))
+        for extra in extra_terms:
+            terms.update(words(extra))
+            terms.add(normalize(extra))
+        with self._lock:
+            old = self._entries.get(entry_id)
+            if usage is None:
+                usage = old.usage if old else 0
+            if old:
+                self._unlink(entry_id, old)
+            entry = _Entry(label, detail, terms, usage)
+            self._entries[entry_id] = entry
+            for term in terms:
+                insort(self._terms, (term, entry_id))
+            for gram in entry.grams:
+                self._grams.setdefault(gram, set()).add(entry_id)
+
+    def remove(self, entry_id: int):
+        with self._lock:
+            entry = self._entries.pop(entry_id, None)
+            if entry:
+                self._unlink(entry_id, entry)
+
+    def add_usage(self, entry_id: int, delta: int):
+        with self._lock:
+            entry = self._entries.get(entry_id)
+            if entry:
+                entry.usage = max(0, entry.usage + delta)
+
+    def _unlink(self, entry_id: int, entry: _Entry):
+        for term in entry.terms:
+            i = bisect_left(self._terms, (term, entry_id))
+            if i < len(self._terms) and self._terms[i] == (term, entry_id):
+                del self._terms[i]
+        for gram in entry.grams:
+            ids = self._grams.get(gram)
+            if ids:
+                ids.discard(entry_id)
+                if not ids:
+                    del self._grams[gram]
+
+    # ---- reads ----
+
+    def _prefixed(self, prefix: str) -> Set[int]:
+        found = set()
+        i = bisect_left(self._terms, (prefix,))
+        while i < len(self._terms) and self._terms[i][0].startswith(prefix):
+            found.add(self._terms[i][1])
+            i += 1
+        return found
+
+    def _item(self, entry_id: int) -> dict:
+        entry = self._entries[entry_id]
+        return {"id": entry_id, "label": entry.label, "detail": entry.detail, "usage": entry.usage}
+
+    def search(self, query: str, limit: int = 10, only: Optional[Collection[int]] = None) -> List[dict]:
+        """only, when given, limits the results to those entry ids (what
+        the caller may see) before the page is cut."""
+        query_words = words(query)
+        with self._lock:
+            if not query_words:
+                candidates = self._entries if only is None else [i for i in only if i in self._entries]
+                top = heapq.nsmallest(
+                    limit, candidates, key=lambda i: (-self._entries[i].usage, self._entries[i].label)
+                )
+                return [self._item(i) for i in top]
+
+            matched: Optional[Set[int]] = None
+            for word in query_words:
+                found = self._prefixed(word)
+                matched = found if matched is None else matched & found
+                if not matched:
+                    break
+            matched = matched or set()
+            if only is not None:
+                matched = matched.intersection(only)
+
+            phrase = " ".join(query_words)
+
+            def prefix_rank(i):
+                entry = self._entries[i]
+                return (not normalize(entry.label).startswith(phrase), -entry.usage, entry.label)
+
+            results = heapq.nsmallest(limit, matched, key=prefix_rank)
+            if len(results) >= limit or len(phrase.replace(" ", "")) < 3:
+                return [self._item(i) for i in results]
+
+            # Typo tolerance for what is left of the page. Postings are
+            # walked smallest first; an id first seen in one of the last
+            # few can no longer reach `needed`, so those only add to ids
+            # already counted (skips the huge "  a"-style lists).
+            postings = sorted((self._grams.get(gram, ()) for gram in
+                               set().union(*(trigrams(word) for word in query_words))), key=len)
+            needed = FUZZY_THRESHOLD * len(postings)
+            shared = Counter()
+            for n, ids in enumerate(postings):
+                if len(postings) - n >= needed:
+                    for i in ids:
+                        if i not in matched and (only is None or i in only):
+                            shared[i] += 1
+                else:
+                    for i in shared:
+                        if i in ids:
+                            shared[i] += 1
+
+            # Most-overlapping candidates first, until the page is full
+            typos = {}
+            wanted = limit - len(results)
+            for i in heapq.nlargest(FUZZY_CANDIDATES, shared, key=shared.__getitem__):
+                if shared[i] < needed:
+                    break
+                total = 0
+                for word in query_words:
+                    best = min(prefix_distance(word, term) for term in self._entries[i].terms)
+                    if best > max_typos(word):
+                        break
+                    total += best
+                else:
+                    typos[i] = total
+                    if len(typos) >= wanted and total == 0:
+                        break
+            fuzzy = heapq.nsmallest(
+                wanted, typos,
+                key=lambda i: (typos[i], -self._entries[i].usage, self._entries[i].label),
+            )
+            return [self._item(i) for i in results + fuzzy]
@@ -0,0 +1,33 @@
+from backend.app import crud_utils, models
+
+
+def _task_with_duplicates(db):
+    user = models.User(email="u@example.com", hashed_password="x")
+    client = models.Client(name="Acme", assigned_weekday="Monday")
+    a, b = models.Tag(name="a"), models.Tag(name="b")
+    db.add_all([user, client, a, b])
+    db.flush()
+    task = models.Task(title="payroll", client_id=client.id, created_by=user.id, tags=[a, b])
+    db.add(task)
+    db.flush()
+    # Same user twice (assignee + reviewer)
+    db.add_all([
+        models.TaskAssignment(task_id=task.id, user_id=user.id, role="assignee"),
+        models.TaskAssignment(task_id=task.id, user_id=user.id, role="reviewer"),
+    ])
+    db.commit()
+    return task, user
+
+
+def test_assigned_user_filter_returns_each_task_once(db):
+    task, user = _task_with_duplicates(db)
+    rows = crud_utils.tasks.list_task_dicts(db, assigned_user_id=user.id)
+    assert [row["id"] for row in rows] == [task.id]
+
+
+def test_tags_filter_returns_each_task_once(db):
+    task, _ = _task_with_duplicates(db)
+    rows = crud_utils.tasks.list_task_dicts(db, tags="a,b")
+    assert [row["id"] for row in rows] == [task.id]
+    exported = list(crud_utils.tasks.export_task_rows(db, tags="a,b", sort_by="id", sort_dir="asc"))
+    assert len(exported) == 1
@@ -0,0 +1,19 @@
+from backend.app import models
+
+
+def test_deleted_task_ids_are_not_reused(db):
+    user = models.User(email="u@example.com", hashed_password="x")
+    client = models.Client(name="Acme", assigned_weekday="Monday")
+    db.add_all([user, client])
+    db.flush()
+    first = models.Task(title="old", client_id=client.id, created_by=user.id)
+    db.add(first)
+    db.commit()
+    old_id = first.id
+    db.delete(first)
+    db.commit()
+
+    second = models.Task(title="new", client_id=client.id, created_by=user.id)
+    db.add(second)
+    db.commit()
+    assert second.id > old_id
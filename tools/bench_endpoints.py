@@ -0,0 +1,254 @@
+"""Endpoint benchmarks against generated data, in-process through the ASGI app.
+
+For each size a fresh SQLite database is filled by tools/generate_data.py
+(in a child process, since the engine is bound at import time), then every
+scenario below is driven through Starlette's TestClient. Reported per
+scenario: p50/p95/p99 latency and SQL statements per request (from the
+/metrics engine hooks). Results are written to bench_results/ as
+<commit>.json so runs on different commits can be compared.
+
+Usage (from the project root):
+    python tools/bench_endpoints.py                        # 10k tasks
+    python tools/bench_endpoints.py --sizes 10000 100000 1000000
+    python tools/bench_endpoints.py --only tasks.list.client tasks.create
+    python tools/bench_endpoints.py --compare 3cf5d45      # diff against a saved run
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+RESULTS_DIR = os.path.join(ROOT, "bench_results")
+
+# Whole-table endpoints get slow in proportion to the data; past this size
+# they are skipped unless --full-list-limit says otherwise.
+FULL_LIST_LIMIT = 100000
+
+
+# ---------------------------------------------------
+# SCENARIOS (run inside the child process)
+# ---------------------------------------------------
+
+def _scenarios(ids, rng, size, full_list_limit):
+    """name -> (iterations, callable(client) -> response)."""
+    big = size > full_list_limit
+    whole = 0 if big else max(3, min(30, 100000 // max(size, 1)))
+
+    def pick_task():
+        return rng.randint(ids["min_task"], ids["max_task"])
+
+    def new_task():
+        return {
+            "title": f"Bench task {rng.randint(0, 10 ** 9)}",
+            "client_id": rng.choice(ids["clients"]),
+            "assigned_users": [rng.choice(ids["users"])],
+            "subtasks": [{"title": "Step 1"}, {"title": "Step 2"}],
+            "tags": ["monthly"],
+            "due_date": "2030-01-15T17:00:00",
+            "billable": True,
+            "estimated_hours": 1.5,
+        }
+
+    return {
+        "auth.login": (10, lambda c: c.post("/auth/login", data=ids["login"])),
+        "tasks.get": (200, lambda c: c.get(f"/tasks/{pick_task()}", headers=ids["headers"])),
+        "tasks.list.client": (50, lambda c: c.get(
+            f"/tasks/?client_id={rng.choice(ids['big_clients'])}", headers=ids["headers"])),
+        "tasks.list.assignee": (50, lambda c: c.get(
+            f"/tasks/?assigned_user_id={rng.choice(ids['users'])}&statuses=new,in_progress",
+            headers=ids["headers"])),
+        "tasks.list.search": (20, lambda c: c.get(
+            f"/tasks/?search=Payroll&client_id={rng.choice(ids['big_clients'])}", headers=ids["headers"])),
+        "tasks.list.all": (whole, lambda c: c.get("/tasks/", headers=ids["headers"])),
+        "tasks.kanban": (whole, lambda c: c.get("/tasks/kanban", headers=ids["headers"])),
+        "tasks.inbox": (100, lambda c: c.get("/tasks/inbox", headers=ids["headers"])),
+        "tasks.create": (100, lambda c: c.post("/tasks/", json=new_task(), headers=ids["headers"])),
+        "tasks.update": (100, lambda c: c.patch(
+            f"/tasks/{pick_task()}", json={"status": rng.choice(["new", "in_progress", "review", "completed"])},
+            headers=ids["headers"])),
+        "tasks.subtask.add": (100, lambda c: c.post(
+            f"/tasks/{pick_task()}/subtasks", json={"title": "Bench step"}, headers=ids["headers"])),
+    }
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def run_size(size, seed, only, full_list_limit):
+    """Child-process entry point: generate, warm up, measure, return a dict."""
+    from fastapi.testclient import TestClient
+    from sqlalchemy import func
+
+    from backend.app import models
+    from backend.app.database import Base, SessionLocal, engine
+    from backend.app.main import app
+    from backend.app.startup import ADMIN_EMAIL, ADMIN_PASSWORD, seed_data
+    from backend.app.utils import metrics
+    from tools import generate_data
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        generate_data.generate(db, size, seed=seed)
+        generate_data.rebuild_derived(db)
+        generate_seconds = time.perf_counter() - started
+
+        ids = {
+            "users": [u for (u,) in db.query(models.User.id).filter(models.User.email.like("%@generated.example"))],
+            "clients": [c for (c,) in db.query(models.Client.id)],
+            "big_clients": [c for (c,) in (
+                db.query(models.Task.client_id).group_by(models.Task.client_id)
+                .order_by(func.count().desc()).limit(10)
+            )],
+            "min_task": db.query(func.min(models.Task.id)).scalar(),
+            "max_task": db.query(func.max(models.Task.id)).scalar(),
+        }
+    finally:
+        db.close()
+
+    # Seed the admin without the startup event, so background jobs (sweeps,
+    # broker poller) don't run concurrently with the measurements.
+    seed_data()
+    client = TestClient(app)
+    ids["login"] = {"username": ADMIN_EMAIL, "password": ADMIN_PASSWORD}
+    token = client.post("/auth/login", data=ids["login"]).json()["access_token"]
+    ids["headers"] = {"Authorization": f"Bearer {token}"}
+
+    rng = random.Random(seed)
+    results = {}
+    for name, (iterations, call) in _scenarios(ids, rng, size, full_list_limit).items():
+        if only and name not in only:
+            continue
+        if iterations == 0:
+            results[name] = {"skipped": f"whole-table endpoint above {full_list_limit} tasks"}
+            continue
+
+        call(client)  # warm-up (imports, statement cache)
+        latencies, queries, errors = [], [], 0
+        for _ in range(iterations):
+            before = metrics.DB_QUERIES.total()
+            started = time.perf_counter()
+            response = call(client)
+            latencies.append(time.perf_counter() - started)
+            queries.append(metrics.DB_QUERIES.total() - before)
+            if response.status_code >= 400:
+                errors += 1
+
+        latencies.sort()
+        results[name] = {
+            "n": iterations,
+            "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+            "queries": round(sum(queries) / len(queries), 1),
+            "errors": errors,
+        }
+    return {"generate_seconds": round(generate_seconds, 1), "scenarios": results}
+
+
+# ---------------------------------------------------
+# DRIVER
+# ---------------------------------------------------
+
+def _git(*args):
+    try:
+        return subprocess.check_output(["git", *args], cwd=ROOT, stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _run_child(size, args):
+    with tempfile.TemporaryDirectory(prefix="yb-bench-") as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}", LOG_LEVEL="WARNING")
+        env.setdefault("SECRET_KEY", "benchmark-secret")
+        command = [sys.executable, os.path.abspath(__file__), "--child", str(size), "--seed", str(args.seed),
+                   "--full-list-limit", str(args.full_list_limit)]
+        if args.only:
+            command += ["--only", *args.only]
+        output = subprocess.run(command, env=env, check=True, stdout=subprocess.PIPE).stdout
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def _load(ref):
+    if os.path.exists(ref):
+        path = ref
+    else:
+        path = os.path.join(RESULTS_DIR, f"{_git('rev-parse', '--short', ref) or ref}.json")
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def _print(report, baseline=None):
+    for size, data in report["sizes"].items():
+        print(f"\n{int(size):,} tasks (generated in {data['generate_seconds']}s)")
+        print(f"  {'scenario':<22}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}{'vs base p50':>13}")
+        base = ((baseline or {}).get("sizes", {}).get(size) or {}).get("scenarios", {})
+        for name, row in data["scenarios"].items():
+            if "skipped" in row:
+                print(f"  {name:<22}{'skipped: ' + row['skipped']}")
+                continue
+            delta = ""
+            if name in base and "p50_ms" in base[name] and base[name]["p50_ms"]:
+                delta = f"{(row['p50_ms'] / base[name]['p50_ms'] - 1) * 100:+.0f}%"
+            errors = f"  ({row['errors']} errors)" if row["errors"] else ""
+            print(f"  {name:<22}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}"
+                  f"{row['queries']:>9}{delta:>13}{errors}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--only", nargs="+", help="scenario names to run")
+    parser.add_argument("--full-list-limit", type=int, default=FULL_LIST_LIMIT)
+    parser.add_argument("--compare", help="commit or results file to compare against")
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child is not None:
+        print(json.dumps(run_size(args.child, args.seed, args.only, args.full_list_limit)))
+        return
+
+    commit = _git("rev-parse", "--short", "HEAD") or "unknown"
+    dirty = bool(_git("status", "--porcelain", "--untracked-files=no"))
+    report = {
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "sizes": {},
+    }
+    for size in args.sizes:
+        print(f"Running {size:,} tasks...", file=sys.stderr)
+        report["sizes"][str(size)] = _run_child(size, args)
+
+    baseline = _load(args.compare) if args.compare else None
+    _print(report, baseline)
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{commit}{'-dirty' if dirty else ''}.json")
+        with open(path, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nSaved {os.path.relpath(path, ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
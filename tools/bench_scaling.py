@@ -0,0 +1,188 @@
+"""Read-throughput scaling across worker counts.
+
+Generates one SQLite database (tools/generate_data.py), then for each
+worker count starts the production launcher (python -m backend.app.serve)
+against it and drives read endpoints over real HTTP from several client
+processes for a fixed time. Prints requests/s, p50/p99 and the speed-up
+relative to one worker; with enough cores and a read-only mix the
+throughput should grow roughly linearly with the worker count.
+
+Usage (from the project root):
+    python tools/bench_scaling.py                          # 1, 2, 4 workers
+    python tools/bench_scaling.py --workers 1 2 4 8 --tasks 100000 --duration 20
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _request(conn, method, path, body=None, headers=None):
+    conn.request(method, path, body=body, headers=headers or {})
+    response = conn.getresponse()
+    data = response.read()
+    return response.status, data
+
+
+def _wait_ready(port, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            status, _ = _request(conn, "GET", "/healthz")
+            conn.close()
+            if status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.3)
+    raise RuntimeError(f"server on port {port} did not become ready")
+
+
+def _login(port):
+    from backend.app.startup import ADMIN_EMAIL, ADMIN_PASSWORD
+
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    body = urllib.parse.urlencode({"username": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+    status, data = _request(conn, "POST", "/auth/login", body,
+                            {"Content-Type": "application/x-www-form-urlencoded"})
+    conn.close()
+    if status != 200:
+        raise RuntimeError(f"login failed: {status} {data[:200]!r}")
+    return json.loads(data)["access_token"]
+
+
+# ---------------------------------------------------
+# LOAD GENERATOR (client processes x keep-alive threads)
+# ---------------------------------------------------
+
+def _client_process(port, token, paths, duration, threads, seed, queue):
+    headers = {"Authorization": f"Bearer {token}"}
+    stop_at = time.perf_counter() + duration
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+
+    def worker(n):
+        rng = random.Random(seed * 1000 + n)
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        local, failed = [], 0
+        while time.perf_counter() < stop_at:
+            started = time.perf_counter()
+            try:
+                status, _ = _request(conn, "GET", rng.choice(paths), headers=headers)
+                if status >= 400:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                continue
+            local.append(time.perf_counter() - started)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    queue.put((latencies, errors[0]))
+
+
+def _drive(port, token, paths, duration, clients, threads):
+    queue = multiprocessing.Queue()
+    procs = [
+        multiprocessing.Process(target=_client_process, args=(port, token, paths, duration, threads, i, queue))
+        for i in range(clients)
+    ]
+    for p in procs:
+        p.start()
+    latencies, errors = [], 0
+    for _ in procs:
+        part, failed = queue.get()
+        latencies.extend(part)
+        errors += failed
+    for p in procs:
+        p.join()
+    latencies.sort()
+    return latencies, errors
+
+
+def _pct(values, pct):
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else float("nan")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=None, help="load processes (default: 2 x max workers)")
+    parser.add_argument("--threads", type=int, default=8, help="connections per load process")
+    args = parser.parse_args(argv)
+    clients = args.clients or 2 * max(args.workers)
+
+    sys.path.append(ROOT)
+    with tempfile.TemporaryDirectory(prefix="yb-scale-") as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'scale.db')}", LOG_LEVEL="WARNING")
+        env.setdefault("SECRET_KEY", "benchmark-secret")
+        subprocess.run([sys.executable, os.path.join(ROOT, "tools", "generate_data.py"), "--tasks", str(args.tasks)],
+                       env=env, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+
+        # Read mix: single task, a client's list, a filtered list, the inbox
+        paths = [f"/tasks/{random.randint(1, args.tasks)}" for _ in range(200)]
+        paths += [f"/tasks/?client_id={random.randint(1, 20)}" for _ in range(50)]
+        paths += ["/tasks/?statuses=review&client_id=1", "/tasks/inbox", "/dashboard/summary"] * 20
+
+        print(f"{args.tasks:,} tasks, {clients} load processes x {args.threads} connections, "
+              f"{args.duration:.0f}s per run, {os.cpu_count()} cores")
+        print(f"{'workers':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}{'speed-up':>10}")
+        baseline = None
+        for workers in args.workers:
+            port = _free_port()
+            server = subprocess.Popen(
+                [sys.executable, "-m", "backend.app.serve", "--workers", str(workers),
+                 "--port", str(port), "--host", "127.0.0.1"],
+                env=env, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            try:
+                _wait_ready(port)
+                os.environ.update(env)
+                token = _login(port)
+                _drive(port, token, paths, min(2.0, args.duration), clients, args.threads)  # warm-up
+                latencies, errors = _drive(port, token, paths, args.duration, clients, args.threads)
+            finally:
+                server.send_signal(signal.SIGTERM)
+                try:
+                    server.wait(timeout=60)
+                except subprocess.TimeoutExpired:
+                    server.kill()
+
+            rps = len(latencies) / args.duration
+            baseline = baseline or rps
+            print(f"{workers:>8}{rps:>10.0f}{_pct(latencies, 50) * 1000:>10.1f}"
+                  f"{_pct(latencies, 99) * 1000:>10.1f}{errors:>8}{rps / baseline:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
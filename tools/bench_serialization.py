@@ -0,0 +1,160 @@
+"""Compare the default ORM/pydantic response path with the fast row path.
+
+Builds a throwaway SQLite database per size, then times, for the same
+filtered task list:
+  orm   ORM objects -> TaskOut.from_orm -> jsonable_encoder -> json.dumps
+        (what FastAPI does for response_model=List[TaskOut])
+  fast  task_rows.task_dicts -> fastjson.dumps
+
+Usage (from the project root):
+    python tools/bench_serialization.py                 # 100, 1000, 10000 tasks
+    python tools/bench_serialization.py 500 5000 -r 3   # custom sizes / repeats
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+_tmpdir = tempfile.mkdtemp(prefix="yb-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'bench.db')}"
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from backend.app import models  # noqa: E402
+from backend.app.database import Base, SessionLocal, engine  # noqa: E402
+from backend.app.crud_utils import tasks as task_crud  # noqa: E402
+from backend.app.schemas.tasks import TaskOut  # noqa: E402
+from backend.app.utils import fastjson  # noqa: E402
+
+STATUSES = ("new", "in_progress", "review", "completed")
+
+
+def seed(db, count: int, rng: random.Random):
+    db.query(models.TaskTag).delete()
+    db.query(models.TaskAssignment).delete()
+    db.query(models.Subtask).delete()
+    db.query(models.Task).delete()
+    db.commit()
+
+    if not db.query(models.User).first():
+        db.add_all([
+            models.User(email=f"bench{i}@example.com", hashed_password="x", is_active=True)
+            for i in range(10)
+        ])
+    if not db.query(models.Client).first():
+        db.add_all([models.Client(name=f"Client {i}", assigned_weekday="Monday") for i in range(20)])
+    if not db.query(models.Tag).first():
+        db.add_all([models.Tag(name=f"tag-{i}") for i in range(15)])
+    db.commit()
+
+    user_ids = [u.id for u in db.query(models.User.id)]
+    client_ids = [c.id for c in db.query(models.Client.id)]
+    tag_ids = [t.id for t in db.query(models.Tag.id)]
+    now = datetime.utcnow()
+
+    tasks = [
+        {
+            "title": f"Task {i}",
+            "description": "Reconcile statements and post adjusting entries. " * rng.randint(0, 4),
+            "client_id": rng.choice(client_ids),
+            "due_date": now + timedelta(days=rng.randint(-30, 60)) if rng.random() < 0.8 else None,
+            "billable": rng.random() < 0.5,
+            "estimated_hours": round(rng.uniform(0.5, 8), 1) if rng.random() < 0.6 else None,
+            "status": rng.choice(STATUSES),
+            "created_by": rng.choice(user_ids),
+            "created_at": now,
+            "updated_at": now,
+            "version": 1,
+        }
+        for i in range(count)
+    ]
+    db.bulk_insert_mappings(models.Task, tasks)
+    task_ids = [t.id for t in db.query(models.Task.id)]
+
+    subtasks, assignments, task_tags = [], [], []
+    for task_id in task_ids:
+        for j in range(rng.randint(0, 3)):
+            subtasks.append({"task_id": task_id, "title": f"Step {j}", "completed": rng.random() < 0.3,
+                             "created_at": now, "updated_at": now})
+        for user_id in rng.sample(user_ids, rng.randint(0, 2)):
+            assignments.append({"task_id": task_id, "user_id": user_id, "role": "assignee"})
+        for tag_id in rng.sample(tag_ids, rng.randint(0, 2)):
+            task_tags.append({"task_id": task_id, "tag_id": tag_id})
+    db.bulk_insert_mappings(models.Subtask, subtasks)
+    db.bulk_insert_mappings(models.TaskAssignment, assignments)
+    db.bulk_insert_mappings(models.TaskTag, task_tags)
+    db.commit()
+
+
+def orm_path(db) -> bytes:
+    tasks = (
+        task_crud._filtered_query(db)
+        .options(selectinload(models.Task.subtasks), selectinload(models.Task.assignments),
+                 selectinload(models.Task.tags))
+        .all()
+    )
+    payload = jsonable_encoder([TaskOut.from_orm(t) for t in tasks])
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def orm_lazy_path(db) -> bytes:
+    # The list endpoint as it was: relationships lazy-loaded per task
+    tasks = task_crud.list_tasks(db)
+    payload = jsonable_encoder([TaskOut.from_orm(t) for t in tasks])
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(db) -> bytes:
+    return fastjson.dumps(task_crud.list_task_dicts(db))
+
+
+def timed(fn, repeats: int) -> float:
+    best = None
+    for _ in range(repeats):
+        db = SessionLocal()
+        try:
+            started = time.perf_counter()
+            fn(db)
+            elapsed = time.perf_counter() - started
+        finally:
+            db.close()
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sizes", nargs="*", type=int, default=[100, 1000, 10000])
+    parser.add_argument("-r", "--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    Base.metadata.create_all(bind=engine)
+    print(f"encoder: {'orjson' if fastjson.orjson else 'json (install orjson for the full speed-up)'}")
+    print(f"{'tasks':>7}  {'orm lazy':>10}  {'orm eager':>10}  {'fast':>10}  {'speed-up':>8}")
+
+    for size in args.sizes:
+        db = SessionLocal()
+        try:
+            seed(db, size, random.Random(args.seed))
+            # Same payload both ways, or the comparison means nothing
+            assert json.loads(orm_path(db)) == json.loads(fast_path(db))
+        finally:
+            db.close()
+
+        lazy = timed(orm_lazy_path, args.repeats) if size <= 1000 else None
+        eager = timed(orm_path, args.repeats)
+        fast = timed(fast_path, args.repeats)
+        lazy_text = f"{lazy * 1000:8.1f}ms" if lazy is not None else f"{'-':>10}"
+        print(f"{size:>7}  {lazy_text}  {eager * 1000:8.1f}ms  {fast * 1000:8.1f}ms  {eager / fast:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
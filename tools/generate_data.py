@@ -0,0 +1,264 @@
+"""Fill a database with realistic, reproducible synthetic data.
+
+Same --seed, same rows: ids are assigned here rather than by the database,
+so children can be written with plain executemany INSERTs in large
+batches. Works against whatever DATABASE_URL points at (SQLite or
+Postgres). The derived tables (planner, priority, rollups) are rebuilt at
+the end.
+
+Shape of the data:
+  - client sizes follow a Zipf-like curve (a few big clients, a long tail)
+  - each client is handled by 1-2 users, who get most of its tasks
+  - status mix ~30% new / 25% in progress / 10% review / 35% completed
+  - due dates cluster around today (-60..+90 days), ~15% have none
+  - 0-5 subtasks per task, 0-3 tags from a skewed tag vocabulary
+
+Usage (from the project root):
+    python tools/generate_data.py --tasks 100000
+    DATABASE_URL=sqlite:////tmp/big.db python tools/generate_data.py --tasks 1000000 --reset
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import func, insert  # noqa: E402
+
+from backend.app import models  # noqa: E402
+from backend.app.database import Base, SessionLocal, engine  # noqa: E402
+from backend.app.crud_utils.tasks import referenced_blobs  # noqa: E402
+from backend.app.utils import blobstore  # noqa: E402
+from backend.app.utils.security import hash_password  # noqa: E402
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+STATUSES = ["new", "in_progress", "review", "completed"]
+STATUS_WEIGHTS = [30, 25, 10, 35]
+TASK_KINDS = [
+    "Monthly bookkeeping", "Bank reconciliation", "Payroll run", "Sales tax filing",
+    "Quarterly estimates", "Year-end close", "Accounts payable review", "Invoice follow-up",
+    "1099 preparation", "Financial statements", "Expense categorisation", "Client onboarding",
+]
+SUBTASK_KINDS = [
+    "Request statements", "Import transactions", "Categorise", "Reconcile",
+    "Review with client", "File return", "Send summary",
+]
+TAG_NAMES = [
+    "urgent", "monthly", "quarterly", "annual", "payroll", "tax", "review", "waiting-on-client",
+    "new-client", "cleanup", "catch-up", "advisory", "sales-tax", "1099", "audit", "billing",
+]
+
+GENERATED_PASSWORD = "benchmark-password"
+BATCH_SIZE = 5000
+
+
+def _zipf_weights(n: int, s: float = 1.1):
+    return [1.0 / (rank ** s) for rank in range(1, n + 1)]
+
+
+def _next_id(db, model) -> int:
+    return (db.query(func.max(model.id)).scalar() or 0) + 1
+
+
+def _insert(db, model, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.execute(insert(model.__table__), rows[start:start + BATCH_SIZE])
+
+
+def reset(db):
+    """Delete everything the generator writes (and what is derived from it)."""
+    for model in (
+        models.Attachment,   # keyed by task id, which restarts from _next_id
+        models.SavedViewMember,
+        models.BillingRollup,
+        models.TimeEntry,
+        models.ArchivedTaskTag,
+        models.ArchivedTaskAssignment,
+        models.ArchivedTask,
+        models.TaskReachability,
+        models.TaskDependency,
+        models.TaskTag,
+        models.Subtask,
+        models.TaskAssignment,
+        models.ChangeLogEntry,
+        models.DashboardRollup,
+        models.PlannerEntry,
+        models.Task,
+        models.ClientAssignment,
+        models.Tag,
+        models.Client,
+    ):
+        db.query(model).delete(synchronize_session=False)
+    generated = db.query(models.User.id).filter(models.User.email.like("%@generated.example"))
+    db.query(models.SavedView).filter(models.SavedView.user_id.in_(generated)).delete(synchronize_session=False)
+    db.query(models.DigestDelivery).filter(models.DigestDelivery.user_id.in_(generated)).delete(synchronize_session=False)
+    db.query(models.User).filter(models.User.email.like("%@generated.example")).delete(synchronize_session=False)
+    db.commit()
+    # Their blobs are now unreferenced; don't wait for the app's GC grace period
+    blobstore.collect_garbage(referenced_blobs(db), grace_seconds=0)
+
+
+def generate(db, tasks: int, clients: int = None, users: int = None, seed: int = 1, now: datetime = None):
+    """Insert the requested volume and return a dict of row counts."""
+    rng = random.Random(seed)
+    now = now or datetime.utcnow().replace(microsecond=0)
+    clients = clients or max(10, tasks // 50)
+    users = users or max(5, min(500, tasks // 2000))
+
+    # ---- users ----
+    role = db.query(models.Role).filter(models.Role.name == "Staff").first()
+    if not role:
+        role = models.Role(name="Staff")
+        db.add(role)
+        db.flush()
+    password = hash_password(GENERATED_PASSWORD)  # one bcrypt round, shared
+    first_user = _next_id(db, models.User)
+    user_rows = [
+        {
+            "id": first_user + i,
+            "email": f"user{first_user + i}@generated.example",
+            "full_name": f"Staff Member {first_user + i}",
+            "hashed_password": password,
+            "is_active": rng.random() > 0.05,
+            "is_admin": False,
+            "role_id": role.id,
+        }
+        for i in range(users)
+    ]
+    _insert(db, models.User, user_rows)
+    user_ids = [u["id"] for u in user_rows]
+
+    # ---- clients and who handles them ----
+    first_client = _next_id(db, models.Client)
+    client_ids = list(range(first_client, first_client + clients))
+    _insert(db, models.Client, [
+        {"id": cid, "name": f"Client {cid:06d}", "assigned_weekday": rng.choice(WEEKDAYS)}
+        for cid in client_ids
+    ])
+    handlers = {cid: rng.sample(user_ids, min(len(user_ids), rng.choice((1, 1, 2)))) for cid in client_ids}
+    _insert(db, models.ClientAssignment, [
+        {"user_id": uid, "client_id": cid} for cid, uids in handlers.items() for uid in uids
+    ])
+
+    # ---- tags ----
+    existing_tags = {name for (name,) in db.query(models.Tag.name)}
+    _insert(db, models.Tag, [{"name": name} for name in TAG_NAMES if name not in existing_tags])
+    tag_ids = [tid for (tid,) in db.query(models.Tag.id).filter(models.Tag.name.in_(TAG_NAMES)).order_by(models.Tag.id)]
+    tag_weights = _zipf_weights(len(tag_ids))
+    db.commit()
+
+    # ---- tasks and children, in batches ----
+    client_weights = _zipf_weights(len(client_ids))
+    task_id = _next_id(db, models.Task)
+    subtask_id = _next_id(db, models.Subtask)
+    assignment_id = _next_id(db, models.TaskAssignment)
+    counts = {"users": users, "clients": clients, "tasks": 0, "subtasks": 0, "assignments": 0, "task_tags": 0}
+
+    remaining = tasks
+    while remaining > 0:
+        batch = min(BATCH_SIZE, remaining)
+        remaining -= batch
+        task_rows, subtask_rows, assignment_rows, tag_rows = [], [], [], []
+
+        for client_id in rng.choices(client_ids, weights=client_weights, k=batch):
+            status = rng.choices(STATUSES, weights=STATUS_WEIGHTS)[0]
+            created_at = now - timedelta(days=rng.randint(0, 365), minutes=rng.randint(0, 1439))
+            due_date = None
+            if rng.random() > 0.15:
+                due_date = (now + timedelta(days=rng.randint(-60, 90))).replace(hour=17, minute=0, second=0)
+            completed_at = None
+            if status == "completed":
+                completed_at = min(now, created_at + timedelta(days=rng.randint(0, 45)))
+            task_rows.append({
+                "id": task_id,
+                "client_id": client_id,
+                "title": f"{rng.choice(TASK_KINDS)} #{task_id}",
+                "description": None if rng.random() < 0.3 else
+                "Generated task. " * rng.randint(1, 12),
+                "status": status,
+                "due_date": due_date,
+                "billable": rng.random() < 0.6,
+                "estimated_hours": round(rng.lognormvariate(0.5, 0.7), 1) if rng.random() < 0.7 else None,
+                "created_by": rng.choice(user_ids),
+                "created_at": created_at,
+                "updated_at": completed_at or created_at,
+                "completed_at": completed_at,
+                "version": 1,
+            })
+
+            for n in range(min(5, int(rng.expovariate(0.6)))):
+                subtask_rows.append({
+                    "id": subtask_id,
+                    "task_id": task_id,
+                    "title": SUBTASK_KINDS[n % len(SUBTASK_KINDS)],
+                    "completed": status == "completed" or rng.random() < 0.3,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                })
+                subtask_id += 1
+
+            if rng.random() > 0.1:
+                pool = handlers[client_id] if rng.random() < 0.85 else user_ids
+                for uid in rng.sample(pool, min(len(pool), 1 if rng.random() < 0.8 else 2)):
+                    assignment_rows.append({"id": assignment_id, "task_id": task_id, "user_id": uid, "role": "assignee"})
+                    assignment_id += 1
+
+            for tid in set(rng.choices(tag_ids, weights=tag_weights, k=rng.choice((0, 0, 1, 1, 2, 3)))):
+                tag_rows.append({"task_id": task_id, "tag_id": tid})
+
+            task_id += 1
+
+        _insert(db, models.Task, task_rows)
+        _insert(db, models.Subtask, subtask_rows)
+        _insert(db, models.TaskAssignment, assignment_rows)
+        _insert(db, models.TaskTag, tag_rows)
+        db.commit()
+
+        counts["tasks"] += len(task_rows)
+        counts["subtasks"] += len(subtask_rows)
+        counts["assignments"] += len(assignment_rows)
+        counts["task_tags"] += len(tag_rows)
+
+    return counts
+
+
+def rebuild_derived(db):
+    from tools.rebuild_derived import REBUILDERS
+
+    for name, rebuild in REBUILDERS.items():
+        rebuild(db)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--clients", type=int, default=None, help="default: tasks / 50")
+    parser.add_argument("--users", type=int, default=None, help="default: tasks / 2000, 5..500")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--reset", action="store_true", help="delete existing clients/tasks/tags first")
+    parser.add_argument("--skip-derived", action="store_true", help="don't rebuild the derived tables (tools/rebuild_derived.py)")
+    args = parser.parse_args(argv)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if args.reset:
+            reset(db)
+        started = time.perf_counter()
+        counts = generate(db, args.tasks, clients=args.clients, users=args.users, seed=args.seed)
+        print("Inserted " + ", ".join(f"{v} {k}" for k, v in counts.items())
+              + f" in {time.perf_counter() - started:.1f}s")
+        if not args.skip_derived:
+            started = time.perf_counter()
+            rebuild_derived(db)
+            print(f"Rebuilt derived tables in {time.perf_counter() - started:.1f}s")
+        print(f"Generated users log in with password '{GENERATED_PASSWORD}'")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Rebuild the precomputed tables from the live data.
+
+Usage (from the project root):
+    python tools/rebuild_derived.py            # everything
+    python tools/rebuild_derived.py planner    # just one
+"""
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.app.database import SessionLocal
+from backend.app.crud_utils import billing, dependencies, planner, priority, rollups, views
+
+REBUILDERS = {
+    "planner": planner.rebuild_planner,
+    "priority": priority.rebuild_scores,
+    "rollups": rollups.rebuild_rollups,
+    "billing": billing.rebuild_billing,
+    "dependencies": dependencies.rebuild_closure,
+    "views": views.rebuild_views,
+}
+
+
+def main(names):
+    names = names or list(REBUILDERS)
+    db = SessionLocal()
+    try:
+        for name in names:
+            if name not in REBUILDERS:
+                print(f"Unknown table set '{name}'. Choose from: {', '.join(REBUILDERS)}")
+                sys.exit(1)
+            print(f"Rebuilding {name}...")
+            result = REBUILDERS[name](db)
+            print(f"  done ({result} rows)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,52 @@
+"""Send the daily digests now (the daily_digest job does this on its own
+once DIGEST_HOUR_UTC has passed).
+
+Usage (from the project root):
+    python tools/send_digests.py                      # today, MAIL_SENDER
+    python tools/send_digests.py --maildir /tmp/mail  # into a local Maildir
+    python tools/send_digests.py --date 2026-10-19 --preview
+
+The first run for a day sends everyone's digest; reruns only retry the
+sends that failed, so it is safe to rerun.
+"""
+import argparse
+import os
+import sys
+from datetime import date, datetime
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.app.database import SessionLocal
+from backend.app.crud_utils import digest
+from backend.app.utils import mailer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--date", type=date.fromisoformat, help="digest day (default: today, UTC)")
+    parser.add_argument("--maildir", help="deliver into this Maildir instead of MAIL_SENDER")
+    parser.add_argument("--preview", action="store_true", help="print the digests instead of sending")
+    parser.add_argument("--workers", type=int, default=digest.DIGEST_WORKERS)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.preview:
+            day = args.date or datetime.utcnow().date()
+            for item in digest.collect(db, day, datetime.utcnow()):
+                subject, text, _ = digest.render(item, day)
+                print(f"To: {item['email']}\nSubject: {subject}\n\n{text}")
+            return
+        sender = mailer.MaildirSender(args.maildir) if args.maildir else mailer.get_sender()
+        if sender is None:
+            print("MAIL_SENDER is off; set it or pass --maildir")
+            sys.exit(1)
+        result = digest.send_digests(db, day=args.date, sender=sender, workers=args.workers)
+        kind = "retry" if result["retry"] else "run"
+        print(f"{result['day']} {kind}: {result['users']} users, {result['sent']} sent, {result['failed']} failed")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()